@@ -4,11 +4,13 @@ from __future__ import annotations
 
 import hashlib
 import json
+import math
 import os
 from pathlib import Path
 import re
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from typing import Any, Dict, List, Optional, Tuple
 
@@ -18,6 +20,19 @@ EBUR128_I_RE = re.compile(r"\bI:\s*(-?\d+(?:\.\d+)?)\s*LUFS")
 EBUR128_LRA_RE = re.compile(r"\bLRA:\s*(-?\d+(?:\.\d+)?)\s*LU\b")
 EBUR128_TP_RE = re.compile(r"\bPeak:\s*(-?\d+(?:\.\d+)?)\s*dBFS")
 
+# Analysers run by collect_preflight, in one ffmpeg pass; keys match the report's "analysis".
+ANALYSIS_FILTERS = {
+    "astats": "astats=metadata=1:reset=1",
+    "volumedetect": "volumedetect",
+    "ebur128": "ebur128=peak=true",
+}
+# ffmpeg log lines start with "[<context> @ 0x...]"; graph filters are named "Parsed_<filter>_<n>".
+LOG_PREFIX_RE = re.compile(r"^\[([^\]\s]+) @ (?:0x)?[0-9a-fA-F]+\]")
+PARSED_FILTER_RE = re.compile(r"^Parsed_(\w+)_\d+$")
+# ROI runs seek the input to a whole second at least this many seconds before the ROI and
+# cut to the ROI with atrim, so decoders that need preroll (MP3, AAC, Opus) are warm by then.
+ROI_MARGIN_SECONDS = 1
+
 
 def parse_float(value: str) -> Optional[float]:
     match = FLOAT_RE.search(value)
@@ -79,6 +94,7 @@ def run_ffprobe(ffprobe: str, input_path: Path) -> Dict[str, Any]:
             "error",
             "-show_format",
             "-show_streams",
+            "-show_program_version",
             "-print_format",
             "json",
             str(input_path),
@@ -87,13 +103,38 @@ def run_ffprobe(ffprobe: str, input_path: Path) -> Dict[str, Any]:
     return json.loads(stdout)
 
 
+def roi_seek(roi: Dict[str, float]) -> int:
+    return max(0, math.floor(roi["start"]) - ROI_MARGIN_SECONDS)
+
+
+def roi_input_args(roi: Optional[Dict[str, float]]) -> List[str]:
+    """Input options that make ffmpeg seek in the demuxer and read only the ROI plus margins.
+
+    Output-side -ss/-t would decode everything before the ROI, and ffmpeg trims output
+    after the filters, so the analysers would also measure audio from before the ROI.
+    """
+    if not roi:
+        return []
+    seek = roi_seek(roi)
+    return ["-ss", str(seek), "-t", str(roi["end"] - seek + ROI_MARGIN_SECONDS)]
+
+
+def roi_filters(roi: Optional[Dict[str, float]]) -> List[str]:
+    """Filters that cut the audio read with roi_input_args to exactly the ROI."""
+    if not roi:
+        return []
+    # The seek point is a whole second, so it falls on a sample boundary at any rate and
+    # the cut lands on the same sample as an output-side -ss would.
+    start = roi["start"] - roi_seek(roi)
+    return [f"atrim=start={start:.6f}:duration={roi['duration']:.6f}", "asetpts=PTS-STARTPTS"]
+
+
 def run_ffmpeg_astats(
     ffmpeg: str, input_path: Path, roi: Optional[Dict[str, float]]
 ) -> Dict[str, Any]:
-    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", "-i", str(input_path)]
-    if roi:
-        cmd += ["-ss", str(roi["start"]), "-t", str(roi["duration"])]
-    cmd += ["-af", "astats=metadata=1:reset=1", "-f", "null", "-"]
+    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", *roi_input_args(roi)]
+    cmd += ["-i", str(input_path), "-af", ",".join([*roi_filters(roi), "astats=metadata=1:reset=1"])]
+    cmd += ["-f", "null", "-"]
     _, stderr = run_cmd(cmd)
     return parse_astats(stderr)
 
@@ -101,10 +142,9 @@ def run_ffmpeg_astats(
 def run_ffmpeg_volumedetect(
     ffmpeg: str, input_path: Path, roi: Optional[Dict[str, float]]
 ) -> Dict[str, Any]:
-    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", "-i", str(input_path)]
-    if roi:
-        cmd += ["-ss", str(roi["start"]), "-t", str(roi["duration"])]
-    cmd += ["-af", "volumedetect", "-f", "null", "-"]
+    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", *roi_input_args(roi)]
+    cmd += ["-i", str(input_path), "-af", ",".join([*roi_filters(roi), "volumedetect"])]
+    cmd += ["-f", "null", "-"]
     _, stderr = run_cmd(cmd)
     return parse_volumedetect(stderr)
 
@@ -112,14 +152,80 @@ def run_ffmpeg_volumedetect(
 def run_ffmpeg_ebur128(
     ffmpeg: str, input_path: Path, roi: Optional[Dict[str, float]]
 ) -> Dict[str, Any]:
-    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", "-i", str(input_path)]
-    if roi:
-        cmd += ["-ss", str(roi["start"]), "-t", str(roi["duration"])]
-    cmd += ["-af", "ebur128=peak=true", "-f", "null", "-"]
+    cmd = [ffmpeg, "-hide_banner", "-nostats", "-v", "info", *roi_input_args(roi)]
+    cmd += ["-i", str(input_path), "-af", ",".join([*roi_filters(roi), "ebur128=peak=true"])]
+    cmd += ["-f", "null", "-"]
     _, stderr = run_cmd(cmd)
     return parse_ebur128(stderr)
 
 
+def run_ffmpeg_analysis(
+    ffmpeg: str, input_path: Path, roi: Optional[Dict[str, float]], stream: int
+) -> Tuple[Dict[str, Dict[str, Any]], str]:
+    """Run every ANALYSIS_FILTERS analyser over a single decode of input stream `stream`.
+
+    Pass default_audio_stream() of the input to analyse the stream a plain -af run would.
+    Returns the parsed results keyed by filter name, in the same shapes as the
+    run_ffmpeg_* helpers, and ffmpeg's stderr, which starts with its version banner.
+    """
+    count = len(ANALYSIS_FILTERS)
+    outputs = "".join(f"[s{i}]" for i in range(count))
+    graph = [f"[0:{stream}]" + ",".join([*roi_filters(roi), f"asplit={count}{outputs}"])]
+    # A per-branch aresample keeps format negotiation separate for each analyser, so
+    # each one sees the samples it saw when it ran alone (astats at the source format,
+    # ebur128 resampled to 48 kHz doubles); it is a plain copy where no conversion is due.
+    for i, spec in enumerate(ANALYSIS_FILTERS.values()):
+        graph.append(f"[s{i}]aresample,{spec}[a{i}]")
+    cmd = [ffmpeg, "-nostats", "-v", "info", *roi_input_args(roi), "-i", str(input_path)]
+    cmd += ["-filter_complex", ";".join(graph)]
+    for i in range(count):
+        cmd += ["-map", f"[a{i}]"]
+    cmd += ["-f", "null", "-"]
+    _, stderr = run_cmd(cmd)
+    logs = split_filter_logs(stderr)
+    results = {
+        "astats": parse_astats(logs["astats"]),
+        "volumedetect": parse_volumedetect(logs["volumedetect"]),
+        "ebur128": parse_ebur128(logs["ebur128"]),
+    }
+    return results, stderr
+
+
+def split_filter_logs(stderr: str) -> Dict[str, str]:
+    """Split one ffmpeg run's stderr into the log of each ANALYSIS_FILTERS filter.
+
+    A multi-line message (the ebur128 summary) is prefixed on its first line only, so
+    blank and indented unprefixed lines belong to the last prefixed one. The banner and
+    lines from ffmpeg itself ("Input #0", "Stream mapping:") or other filters are dropped.
+    """
+    logs: Dict[str, List[str]] = {name: [] for name in ANALYSIS_FILTERS}
+    current: Optional[List[str]] = None
+    for line in stderr.splitlines():
+        match = LOG_PREFIX_RE.match(line)
+        if match:
+            parsed = PARSED_FILTER_RE.match(match.group(1))
+            current = logs.get(parsed.group(1)) if parsed else None
+        elif line[:1] not in ("", " ", "\t"):
+            current = None
+        if current is not None:
+            current.append(line)
+    return {name: "\n".join(lines) for name, lines in logs.items()}
+
+
+def banner_version(stderr: str) -> Optional[str]:
+    """The version line ffmpeg prints first without -hide_banner, as `ffmpeg -version` prints it."""
+    first = stderr.lstrip().split("\n", 1)[0].strip()
+    return first if first.startswith("ffmpeg version ") else None
+
+
+def probe_version(ffprobe_data: Dict[str, Any]) -> Optional[str]:
+    """Rebuild the `ffprobe -version` line from -show_program_version output."""
+    program = ffprobe_data.get("program_version") or {}
+    if not program.get("version"):
+        return None
+    return f"ffprobe version {program['version']} {program.get('copyright', '')}".strip()
+
+
 def parse_astats(stderr: str) -> Dict[str, Any]:
     lines = [line for line in stderr.splitlines() if "astats" in line.lower()]
     overall_raw: Dict[str, str] = {}
@@ -204,6 +310,22 @@ def extract_audio_stream(ffprobe_data: Dict[str, Any]) -> Optional[Dict[str, Any
     return None
 
 
+def default_audio_stream(ffprobe_data: Dict[str, Any]) -> Optional[int]:
+    """Index of the audio stream ffmpeg analyses when no stream is mapped explicitly.
+
+    ffmpeg picks a stream flagged default over any other, then the one with the most
+    channels, then the first; that need not be the first audio stream.
+    """
+    streams = [stream for stream in ffprobe_data.get("streams", []) if stream.get("codec_type") == "audio"]
+    if not streams:
+        return None
+    best = max(
+        streams,
+        key=lambda stream: (bool(stream.get("disposition", {}).get("default")), stream.get("channels") or 0),
+    )
+    return best["index"]
+
+
 def derive_metrics(
     astats: Dict[str, Any], volumedetect: Dict[str, Any], ebur128: Dict[str, Any]
 ) -> Dict[str, Any]:
@@ -262,17 +384,28 @@ def collect_preflight(
     if not input_path.exists():
         raise FileNotFoundError(f"Input not found: {input_path}")
 
-    ffprobe_data = run_ffprobe(ffprobe, input_path)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        # Hashing reads the file while ffmpeg decodes it; the probe is needed first to
+        # pick the stream to analyse.
+        digest = pool.submit(sha256_file, input_path)
+        ffprobe_data = run_ffprobe(ffprobe, input_path)
+        stream = default_audio_stream(ffprobe_data)
+        if stream is None:
+            raise RuntimeError(f"No audio stream found in {input_path}")
+        analysis, ffmpeg_log = run_ffmpeg_analysis(ffmpeg, input_path, roi, stream)
+        sha256 = digest.result()
+    ffprobe_version = probe_version(ffprobe_data)
+    ffprobe_data.pop("program_version", None)
     audio_stream = extract_audio_stream(ffprobe_data)
-    astats = run_ffmpeg_astats(ffmpeg, input_path, roi)
-    volumedetect = run_ffmpeg_volumedetect(ffmpeg, input_path, roi)
-    ebur128 = run_ffmpeg_ebur128(ffmpeg, input_path, roi)
+    astats = analysis["astats"]
+    volumedetect = analysis["volumedetect"]
+    ebur128 = analysis["ebur128"]
 
     report = {
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "input": {
             "path": str(input_path),
-            "sha256": sha256_file(input_path),
+            "sha256": sha256,
             "file_size_bytes": input_path.stat().st_size,
         },
         "roi": roi,
@@ -285,8 +418,8 @@ def collect_preflight(
         },
         "derived": derive_metrics(astats, volumedetect, ebur128),
         "tool_versions": {
-            "ffmpeg": tool_version(ffmpeg),
-            "ffprobe": tool_version(ffprobe),
+            "ffmpeg": banner_version(ffmpeg_log) or tool_version(ffmpeg),
+            "ffprobe": ffprobe_version or tool_version(ffprobe),
         },
     }
     return report
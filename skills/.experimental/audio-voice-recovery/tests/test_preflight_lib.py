@@ -0,0 +1,247 @@
+#!/usr/bin/env python3
+"""Checks for the single-pass ffmpeg analysis and input-side ROI seeking in preflight_lib."""
+
+from __future__ import annotations
+
+import math
+import shutil
+import struct
+import sys
+import tempfile
+import unittest
+import wave
+from pathlib import Path
+
+sys.dont_write_bytecode = True
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import preflight_lib  # noqa: E402
+
+FFMPEG = shutil.which("ffmpeg")
+RATE = 48000
+# 375 Hz is exactly 128 samples per period at 48 kHz, so the ROIs below hold whole periods
+# and level metrics do not depend on where a window starts.
+FREQUENCY = 375
+PARSERS = {
+    "astats": preflight_lib.parse_astats,
+    "volumedetect": preflight_lib.parse_volumedetect,
+    "ebur128": preflight_lib.parse_ebur128,
+}
+METRICS = (
+    "peak_level_db",
+    "rms_level_db",
+    "mean_volume_db",
+    "max_volume_db",
+    "integrated_lufs",
+    "loudness_range_lu",
+    "true_peak_dbfs",
+)
+# Trimmed stderr of a single-pass run under ffmpeg 7.0: the filters log at uninit in no
+# fixed order, volumedetect also logs while the graph is probed, and the ebur128 summary
+# is prefixed on its first line only.
+SINGLE_PASS_STDERR = """\
+ffmpeg version 7.0.2-static https://johnvansickle.com/ffmpeg/  Copyright (c) 2000-2024 the FFmpeg developers
+  built with gcc 8 (Debian 8.3.0-6)
+[Parsed_volumedetect_4 @ 0x4194ae80] n_samples: 0
+Input #0, wav, from 'tone.wav':
+  Duration: 00:00:01.00, bitrate: 768 kb/s
+    comment         : I: -99.0 LUFS
+Stream mapping:
+  ebur128:out0 -> Stream #0:2 (pcm_s16le)
+[Parsed_ebur128_6 @ 0x7f7bec0c37c0] Summary:
+
+  Integrated loudness:
+    I:          -9.8 LUFS
+    Threshold: -19.8 LUFS
+
+  Loudness range:
+    LRA:         0.0 LU
+    Threshold:   0.0 LUFS
+    LRA low:     0.0 LUFS
+    LRA high:    0.0 LUFS
+
+  True peak:
+    Peak:       -6.0 dBFS
+[Parsed_volumedetect_4 @ 0x7f7bec02e300] n_samples: 48000
+[Parsed_volumedetect_4 @ 0x7f7bec02e300] mean_volume: -9.0 dB
+[Parsed_volumedetect_4 @ 0x7f7bec02e300] max_volume: -6.0 dB
+[Parsed_astats_2 @ 0x7f7bec018dc0] Channel: 1
+[Parsed_astats_2 @ 0x7f7bec018dc0] Peak level dB: -6.020335
+[Parsed_astats_2 @ 0x7f7bec018dc0] Overall
+[Parsed_astats_2 @ 0x7f7bec018dc0] Peak level dB: -6.020335
+[Parsed_astats_2 @ 0x7f7bec018dc0] RMS level dB: -9.030840
+[Parsed_astats_2 @ 0x7f7bec018dc0] Number of samples: 2944
+[out#0/null @ 0x4193bec0] video:0KiB audio:281KiB subtitle:0KiB other streams:0KiB
+size=N/A time=00:00:01.00 bitrate=N/A speed=68.2x
+"""
+
+
+def write_tone(path: Path, seconds: float, amplitude) -> None:
+    """Write a 16-bit mono sine; `amplitude(t)` gives its level at each second."""
+    frames = bytearray()
+    for n in range(int(seconds * RATE)):
+        t = n / RATE
+        frames += struct.pack("<h", round(32767 * amplitude(t) * math.sin(2 * math.pi * FREQUENCY * t)))
+    with wave.open(str(path), "wb") as handle:
+        handle.setnchannels(1)
+        handle.setsampwidth(2)
+        handle.setframerate(RATE)
+        handle.writeframes(bytes(frames))
+
+
+def output_seek_metrics(path: Path, roi: dict) -> dict:
+    """The derived metrics of the former ROI path: one ffmpeg per filter, -ss/-t after -i."""
+    results = {}
+    for name, spec in preflight_lib.ANALYSIS_FILTERS.items():
+        cmd = [FFMPEG, "-hide_banner", "-nostats", "-v", "info", "-i", str(path)]
+        cmd += ["-ss", str(roi["start"]), "-t", str(roi["duration"]), "-af", spec, "-f", "null", "-"]
+        _, stderr = preflight_lib.run_cmd(cmd)
+        results[name] = PARSERS[name](stderr)
+    return preflight_lib.derive_metrics(results["astats"], results["volumedetect"], results["ebur128"])
+
+
+def single_pass_metrics(path: Path, roi: dict | None, stream: int = 0) -> dict:
+    results, _ = preflight_lib.run_ffmpeg_analysis(FFMPEG, path, roi, stream)
+    return preflight_lib.derive_metrics(results["astats"], results["volumedetect"], results["ebur128"])
+
+
+def separate_run_metrics(path: Path, roi: dict | None) -> dict:
+    return preflight_lib.derive_metrics(
+        preflight_lib.run_ffmpeg_astats(FFMPEG, path, roi),
+        preflight_lib.run_ffmpeg_volumedetect(FFMPEG, path, roi),
+        preflight_lib.run_ffmpeg_ebur128(FFMPEG, path, roi),
+    )
+
+
+def two_stream_probe(first_is_default: bool) -> dict:
+    """ffprobe streams of a mono track ahead of a stereo one, as written by write_two_streams."""
+    return {
+        "streams": [
+            {"index": 0, "codec_type": "audio", "channels": 1, "disposition": {"default": int(first_is_default)}},
+            {"index": 1, "codec_type": "audio", "channels": 2, "disposition": {"default": 0}},
+        ]
+    }
+
+
+class HelperTests(unittest.TestCase):
+    def test_lines_are_split_by_filter_prefix(self) -> None:
+        stderr = "\n".join(
+            [
+                "ffmpeg version 6.1 Copyright (c) 2000-2023 the FFmpeg developers",
+                "    comment         : I: -99.0 LUFS",
+                "[Parsed_astats_2 @ 0x5581] Overall",
+                "[Parsed_astats_2 @ 0x5581] Peak level dB: -6.020600",
+                "[Parsed_volumedetect_3 @ 0x5582] max_volume: -6.0 dB",
+                "[Parsed_ebur128_4 @ 0x5583] Summary:",
+                "",
+                "  Integrated loudness:",
+                "    I:          -9.0 LUFS",
+                "[out#0/null @ 0x5584] video:0kB audio:5168kB",
+            ]
+        )
+        logs = preflight_lib.split_filter_logs(stderr)
+
+        self.assertEqual(preflight_lib.parse_astats(logs["astats"])["overall_numeric"], {"Peak level dB": -6.0206})
+        self.assertEqual(preflight_lib.parse_volumedetect(logs["volumedetect"])["max_volume_db"], -6.0)
+        self.assertEqual(preflight_lib.parse_ebur128(logs["ebur128"])["integrated_lufs"], -9.0)
+        self.assertNotIn("video:0kB", logs["ebur128"])
+        self.assertEqual(
+            preflight_lib.banner_version(stderr), "ffmpeg version 6.1 Copyright (c) 2000-2023 the FFmpeg developers"
+        )
+
+    def test_single_pass_stderr_is_demultiplexed(self) -> None:
+        logs = preflight_lib.split_filter_logs(SINGLE_PASS_STDERR)
+        astats = preflight_lib.parse_astats(logs["astats"])
+        volumedetect = preflight_lib.parse_volumedetect(logs["volumedetect"])
+        ebur128 = preflight_lib.parse_ebur128(logs["ebur128"])
+
+        self.assertEqual(
+            astats["overall_numeric"],
+            {"Peak level dB": -6.020335, "RMS level dB": -9.03084, "Number of samples": 2944.0},
+        )
+        self.assertEqual((volumedetect["mean_volume_db"], volumedetect["max_volume_db"]), (-9.0, -6.0))
+        self.assertEqual(
+            (ebur128["integrated_lufs"], ebur128["loudness_range_lu"], ebur128["true_peak_dbfs"]), (-9.8, 0.0, -6.0)
+        )
+        self.assertEqual(len(volumedetect["raw"]), 4)
+        for name, log in logs.items():
+            self.assertNotIn("Input #0", log, name)
+            self.assertNotIn("Duration:", log, name)
+            self.assertNotIn("-99.0", log, name)
+
+    def test_default_audio_stream_follows_ffmpeg_stream_selection(self) -> None:
+        self.assertEqual(preflight_lib.default_audio_stream(two_stream_probe(False)), 1)
+        self.assertEqual(preflight_lib.default_audio_stream(two_stream_probe(True)), 0)
+        video_first = {"streams": [{"index": 0, "codec_type": "video"}, {"index": 1, "codec_type": "audio", "channels": 2}]}
+        self.assertEqual(preflight_lib.default_audio_stream(video_first), 1)
+        self.assertIsNone(preflight_lib.default_audio_stream({"streams": [{"index": 0, "codec_type": "video"}]}))
+
+    def test_roi_seeks_to_a_whole_second_before_the_roi(self) -> None:
+        roi = preflight_lib.parse_roi("12.7,20")
+        self.assertEqual(preflight_lib.roi_input_args(roi), ["-ss", "11", "-t", "10.0"])
+        self.assertEqual(preflight_lib.roi_filters(roi)[0], "atrim=start=1.700000:duration=7.300000")
+        self.assertEqual(preflight_lib.roi_input_args(preflight_lib.parse_roi("0.5,3"))[:2], ["-ss", "0"])
+        self.assertEqual(preflight_lib.roi_input_args(None), [])
+
+
+@unittest.skipUnless(FFMPEG, "ffmpeg is not on PATH")
+class FfmpegAnalysisTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.tones = [self.root / "tone.wav", self.root / "tone.flac"]
+        write_tone(self.tones[0], 10, lambda t: 0.5)
+        preflight_lib.run_cmd([FFMPEG, "-v", "error", "-i", str(self.tones[0]), str(self.tones[1])])
+
+    def test_single_pass_matches_separate_runs(self) -> None:
+        roi = preflight_lib.parse_roi("4,8")
+        for path in self.tones:
+            for region in (None, roi):
+                with self.subTest(path=path.name, roi=region):
+                    self.assertEqual(single_pass_metrics(path, region), separate_run_metrics(path, region))
+
+    def test_single_pass_analyses_the_stream_a_plain_run_picks(self) -> None:
+        # A loud mono track ahead of a quiet stereo one: ffmpeg maps the stereo track
+        # unless the mono one is flagged default.
+        roi = preflight_lib.parse_roi("4,8")
+        for first_is_default in (False, True):
+            path = self.root / f"two-streams-{int(first_is_default)}.mka"
+            cmd = [FFMPEG, "-v", "error", "-i", str(self.tones[0])]
+            cmd += ["-filter_complex", "[0:a]volume=0.1,pan=stereo|c0=c0|c1=c0[quiet]", "-map", "0:a", "-map", "[quiet]"]
+            cmd += ["-c:a", "pcm_s16le", "-disposition:a:0", "default" if first_is_default else "0"]
+            cmd += ["-disposition:a:1", "0", str(path)]
+            preflight_lib.run_cmd(cmd)
+            stream = preflight_lib.default_audio_stream(two_stream_probe(first_is_default))
+            self.assertEqual(stream, 0 if first_is_default else 1)
+            for region in (None, roi):
+                with self.subTest(first_is_default=first_is_default, roi=region):
+                    self.assertEqual(single_pass_metrics(path, region, stream), separate_run_metrics(path, region))
+
+    def test_input_seek_matches_output_seek_on_tones(self) -> None:
+        # Output seeking fed the analysers everything from 0 s, so ROIs stay longer than
+        # ebur128's 3 s short-term window; "1,5" also covers a seek clamped to 0.
+        for path in self.tones:
+            for spec in ("4,8", "1,5"):
+                roi = preflight_lib.parse_roi(spec)
+                with self.subTest(path=path.name, roi=spec):
+                    expected = output_seek_metrics(path, roi)
+                    actual = single_pass_metrics(path, roi)
+                    for metric in METRICS:
+                        self.assertIsNotNone(expected[metric], metric)
+                        self.assertAlmostEqual(actual[metric], expected[metric], delta=0.1, msg=metric)
+
+    def test_roi_excludes_audio_before_it(self) -> None:
+        path = self.root / "loud-then-quiet.wav"
+        write_tone(path, 10, lambda t: 0.8 if t < 5 else 0.1)
+
+        metrics = single_pass_metrics(path, preflight_lib.parse_roi("6,9"))
+
+        self.assertAlmostEqual(metrics["max_volume_db"], 20 * math.log10(0.1), delta=0.2)
+        self.assertAlmostEqual(metrics["peak_level_db"], 20 * math.log10(0.1), delta=0.2)
+
+
+if __name__ == "__main__":
+    unittest.main()
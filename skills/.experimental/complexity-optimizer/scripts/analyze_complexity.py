@@ -5,17 +5,41 @@ from __future__ import annotations
 
 import argparse
 import ast
+import contextlib
+import functools
+import hashlib
+import heapq
 import json
+import mmap
 import os
+import pstats
 import re
 import subprocess
 import sys
-from dataclasses import asdict, dataclass
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
 from pathlib import Path
-from typing import Iterable
+from typing import Any, Iterable, Iterator
 
 
+CACHE_DIRNAME = ".complexity-cache"
+# Bump when the cache file layout changes. Rule changes need no bump: entries are also keyed
+# by a hash of this script, so editing any pattern or visitor invalidates them.
+CACHE_VERSION = 3
+
+# Files above MAX_FILE_BYTES are skipped unscanned (bundles, vendored amalgamations), and files whose
+# first SNIFF_BYTES contain a NUL byte or a line longer than MAX_LINE_BYTES are skipped as binary or
+# minified: their regex findings are noise. Files of MMAP_MIN_BYTES or more are memory-mapped, so a
+# skipped file costs one page of I/O and a scanned one is hashed and decoded without a bytes copy.
+MAX_FILE_BYTES = 2 * 1024 * 1024
+MAX_LINE_BYTES = 2000
+SNIFF_BYTES = 64 * 1024
+MMAP_MIN_BYTES = 256 * 1024
+
 DEFAULT_EXCLUDES = {
+    CACHE_DIRNAME,
     ".git",
     ".hg",
     ".svn",
@@ -61,27 +85,111 @@ TEXT_EXTENSIONS = {
     ".scala",
 }
 
-# Iteration constructs only — single-call predicate methods (find, findIndex, some, every, reduce)
-# are O(n) one-pass operations, not loops in the complexity sense.
-LOOP_RE = re.compile(r"\b(for|while|forEach|map|filter)\b")
-MEMBERSHIP_RE = re.compile(
-    r"(\.includes\s*\(|\.indexOf\s*\(|\bin_array\s*\(|\bcontains\s*\()"
-)
-SORT_RE = re.compile(r"(\.sort\s*\(|\bsorted\s*\(|\bsort\s*\()")
-# Distinctive I/O / ORM method names only. Dropped `query|execute|select|where` —
-# they collide with Redux selectors (selectFoo), React Testing Library (`screen.findBy`),
-# and SQL-builder DSLs used outside loops.
-QUERY_IN_LOOP_RE = re.compile(
-    r"\b(fetch\s*\(|axios\.|request\s*\(|findMany\s*\(|findOne\s*\(|findUnique\s*\(|prisma\.|knex\.|\.exec\s*\()"
-)
-# Require a lowercase letter in the second position so SCREAMING_SNAKE constants
-# (MAX_RETRIES, API_URL) do not trigger render-path detection.
-RENDER_HINT_RE = re.compile(
-    r"\b(function\s+[A-Z][a-z][A-Za-z0-9_]*|const\s+[A-Z][a-z][A-Za-z0-9_]*\s*=|export\s+default\s+function\s+[A-Z][a-z])"
+# Every per-line rule of scan_text in one alternation, so each line is scanned once. Each branch
+# starts with a literal character, which lets the regex engine skip ahead to candidate positions;
+# a leading `\b` or a named group would disable that, so line_rules() checks word boundaries and
+# names the rule from the matched text. Matches cannot overlap, so no branch consumes text that
+# another one starts with (client names stop before their dot, `.map(` stays whole).
+LINE_RE = re.compile(
+    # Iteration constructs only — single-call predicate methods (find, findIndex, some, every, reduce)
+    # are O(n) one-pass operations, not loops in the complexity sense.
+    r"for(?:Each)?\b|while\b|map\b|filter\b"
+    # Collection method calls: `.filter(`/`.map(` are also loops and `.sort(` is also a sort; written
+    # without a gap before the paren, these four are render-path transforms.
+    r"|\.(?:filter|map|sort|reduce|includes|indexOf|exec)\s*\("
+    r"|in_array\s*\(|contains\s*\(|sorted\s*\(|sort\s*\("
+    # Distinctive I/O / ORM method names only. Dropped `query|execute|select|where` —
+    # they collide with Redux selectors (selectFoo), React Testing Library (`screen.findBy`),
+    # and SQL-builder DSLs used outside loops.
+    r"|fetch\s*\(|axios(?=\.)|request\s*\(|findMany\s*\(|findOne\s*\(|findUnique\s*\(|prisma(?=\.)|knex(?=\.)"
+    # Likely UI component. Require a lowercase letter in the second position so
+    # SCREAMING_SNAKE constants (MAX_RETRIES, API_URL) do not trigger render-path detection.
+    # (`export default function Foo` is matched by its `function Foo`.)
+    r"|function\s+[A-Z][a-z]|const\s+[A-Z][a-z][A-Za-z0-9_]*\s*="
 )
+# Rules named by the leading word of a LINE_RE match, and by the method of a `.name(` match.
+WORD_RULES = {
+    "for": "loop",
+    "forEach": "loop",
+    "while": "loop",
+    "map": "loop",
+    "filter": "loop",
+    "in_array": "membership",
+    "contains": "membership",
+    "sorted": "sort",
+    "sort": "sort",
+    "fetch": "query",
+    "axios": "query",
+    "request": "query",
+    "findMany": "query",
+    "findOne": "query",
+    "findUnique": "query",
+    "prisma": "query",
+    "knex": "query",
+    "function": "render",
+    "const": "render",
+}
+METHOD_RULES = {
+    "filter": "loop",
+    "map": "loop",
+    "sort": "sort",
+    "reduce": None,
+    "includes": "membership",
+    "indexOf": "membership",
+    "exec": "query",
+}
+RENDER_TRANSFORMS = {"filter", "map", "sort", "reduce"}
+# Function, class, or binding declaration starting a (stripped) line: ends the enclosing loops.
 FN_BOUNDARY_RE = re.compile(
-    r"^\s*(export\s+)?(async\s+)?(function|const|let|var|class|def|public|private|protected|fn)\b|=>\s*\{?\s*$"
+    r"(?:export\s+)?(?:async\s+)?(?:function|const|let|var|class|def|public|private|protected|fn)\b"
 )
+COMPONENT_SUFFIXES = {".jsx", ".tsx", ".js", ".ts"}
+# Lines after a component declaration that stay in its render path, and how many of those
+# are always kept before a closing brace can end it early.
+COMPONENT_SPAN = 120
+COMPONENT_MIN_LINES = 10
+
+# --hot-paths: Python functions that serve requests, jobs, or CLI entry start with ENTRY_HEAT.
+# Heat flows along call edges, losing CALL_DECAY per call and gaining LOOP_BOOST per enclosing
+# loop at the call site (up to two), so a helper called in a handler's loop outranks setup code.
+# A call in a loop of a cold function still gives the callee LOOP_HEAT to start from. Mutually
+# recursive functions share one heat, so recursion inside a loop does not compound.
+ENTRY_DECORATORS = {
+    "route",
+    "get",
+    "post",
+    "put",
+    "patch",
+    "delete",
+    "websocket",
+    "api_view",
+    "task",
+    "shared_task",
+    "receiver",
+    "command",
+}
+ENTRY_NAME_RE = re.compile(r"main|handle|handler|dispatch|__call__|do_[A-Z]+|handle_\w+|\w+_handler|on_\w+")
+ENTRY_HEAT = 1.0
+LOOP_HEAT = 0.5
+CALL_DECAY = 0.7
+LOOP_BOOST = 2.0
+HEAT_CAP = 4.0
+# A bare name defined in more places than this (run, get, save) is too ambiguous to resolve.
+MAX_CALL_TARGETS = 8
+SEVERITY_WEIGHT = {"high": 3, "medium": 2, "info": 0}
+
+# Bump when the --write-baseline file layout or the fingerprint recipe changes.
+BASELINE_VERSION = 1
+
+# --stats phases in pipeline order. All but "walk" are timed per file, inside the workers with --jobs.
+STATS_PHASES = ("walk", "read", "sniff", "cache", "decode", "parse", "python-rules", "text-rules", "digests")
+
+# --profile: Python findings whose enclosing function used less than this share of the profiled
+# time are hidden as cold. Collapsed stacks are "frame;frame;... COUNT" lines, with py-spy's
+# "name (path:line)" frames; other frames (process and thread labels) are ignored.
+PROFILE_THRESHOLD = 0.01
+COLLAPSED_LINE_RE = re.compile(r"(.*\S)\s+(\d+)")
+COLLAPSED_FRAME_RE = re.compile(r"(.+?) \(([^()]+?)(?::(\d+))?\)")
 
 
 @dataclass
@@ -94,13 +202,158 @@ class Finding:
     suggestion: str
 
 
+@dataclass
+class FunctionNode:
+    """A Python function in the --hot-paths call graph."""
+
+    path: str
+    qualname: str
+    line: int
+    end_line: int
+    entry: bool
+    # Each call in the body as "name", "self.name", or ".name" (see call_target), with the loop depth at the call site.
+    calls: list[tuple[str, int]] = field(default_factory=list)
+
+
+@dataclass
+class ScanStats:
+    """--stats counters for one file, or merged for a whole scan."""
+
+    # Seconds per phase; with --jobs these add up across worker processes.
+    seconds: Counter[str] = field(default_factory=Counter)
+    bytes: int = 0
+    lines: int = 0
+    # Lines on which each fused line rule (see line_rules) matched.
+    rule_hits: Counter[str] = field(default_factory=Counter)
+    findings: Counter[str] = field(default_factory=Counter)
+    last: float = field(default_factory=time.perf_counter)
+
+    def lap(self, phase: str) -> None:
+        """Charge the time since the previous lap to `phase`."""
+        now = time.perf_counter()
+        self.seconds[phase] += now - self.last
+        self.last = now
+
+    def merge(self, other: ScanStats) -> None:
+        self.seconds.update(other.seconds)
+        self.bytes += other.bytes
+        self.lines += other.lines
+        self.rule_hits.update(other.rule_hits)
+        self.findings.update(other.findings)
+
+
+@dataclass
+class FileScan:
+    """Outcome of scanning one file; workers return these so the parent can merge them in input order."""
+
+    findings: list[Finding] = field(default_factory=list)
+    functions: list[FunctionNode] = field(default_factory=list)
+    # One finding_digest per finding, in the same order; empty unless a baseline was asked for.
+    digests: list[str] = field(default_factory=list)
+    read: bool = True
+    failed: bool = False
+    warning: str | None = None
+    # Cache key of the file's contents, and whether the findings came from the cache.
+    key: str | None = None
+    cached: bool = False
+    # Why the file was not scanned: "too-large", "binary", "minified", or "missing".
+    skipped: str | None = None
+    stats: ScanStats | None = None
+
+
+@dataclass(frozen=True)
+class ReadLimits:
+    max_bytes: int = MAX_FILE_BYTES
+    max_line: int = MAX_LINE_BYTES
+
+
+@dataclass
+class Profile:
+    """Measured cost of profiled Python functions, as cumulative seconds (pstats) or inclusive samples (collapsed)."""
+
+    kind: str
+    total: float
+    # (filename, line, function name, cost) by file basename. The line is the function's first
+    # line for pstats, and the executing line for py-spy's default collapsed output.
+    frames: dict[str, list[tuple[str, int, str, float]]] = field(default_factory=dict)
+
+    def add(self, filename: str, line: int, name: str, cost: float) -> None:
+        filename = filename.replace("\\", "/")
+        self.frames.setdefault(filename.rpartition("/")[2], []).append((filename, line, name, cost))
+
+    def shares(self, path: str, functions: list[FunctionNode]) -> tuple[list[float], float]:
+        """Share of the total spent in each of a file's functions, and at its module level."""
+        shares = [0.0] * len(functions)
+        module = 0.0
+        if not self.total:
+            return shares, module
+        for filename, line, name, cost in self.frames.get(path.rpartition("/")[2], []):
+            if filename != path and not filename.endswith("/" + path):
+                continue
+            if name == "<module>":
+                module += cost
+                continue
+            name = name.rpartition(".")[2]
+            named = [fn for fn in functions if fn.qualname.rpartition(".")[2] == name]
+            index = innermost(named, line)
+            if index is None:
+                # pstats reports a decorated function at its first decorator, above the def.
+                below = [fn for fn in named if fn.line >= line]
+                index = named.index(min(below, key=lambda fn: fn.line)) if below else None
+            if index is not None:
+                shares[functions.index(named[index])] += cost
+        # Collapsed stacks sample each executing line separately, so recursion can count a stack twice.
+        return [min(1.0, share / self.total) for share in shares], min(1.0, module / self.total)
+
+
 def iter_files(root: Path, excludes: set[str]) -> Iterable[Path]:
-    for dirpath, dirnames, filenames in os.walk(root):
-        dirnames[:] = [d for d in dirnames if d not in excludes]
-        for filename in filenames:
-            path = Path(dirpath) / filename
-            if path.suffix in TEXT_EXTENSIONS:
-                yield path
+    """Walk `root` top-down in os.walk order, checking suffixes before building any Path."""
+    stack = [str(root)]
+    while stack:
+        directory = stack.pop()
+        subdirs: list[str] = []
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+                    if is_dir:
+                        # Like os.walk(followlinks=False): symlinked directories are neither files nor walked.
+                        if entry.name not in excludes and not entry.is_symlink():
+                            subdirs.append(entry.path)
+                    elif os.path.splitext(entry.name)[1] in TEXT_EXTENSIONS:
+                        yield Path(entry.path)
+        except OSError:
+            continue
+        stack.extend(reversed(subdirs))
+
+
+def git_files(root: Path, excludes: set[str], untracked: bool = False) -> list[Path] | None:
+    """Supported files under `root` from the git index in one `git ls-files` call. None if git cannot list them.
+
+    With `untracked`, files that are untracked but not ignored are included too. Directories named
+    in `excludes` are still skipped, so tracked vendor/ or dist/ trees behave as in a walk.
+    """
+    command = ["git", "-C", str(root), "ls-files", "-z", "--cached"]
+    if untracked:
+        command += ["--others", "--exclude-standard"]
+    try:
+        result = subprocess.run(command, capture_output=True, check=False)
+    except FileNotFoundError:
+        return None
+    if result.returncode != 0:
+        return None
+    paths: list[Path] = []
+    # Unmerged files are listed once per stage, hence dict.fromkeys.
+    for name in dict.fromkeys(os.fsdecode(result.stdout).split("\0")):
+        if os.path.splitext(name)[1] not in TEXT_EXTENSIONS:
+            continue
+        if not excludes.isdisjoint(name.split("/")[:-1]):
+            continue
+        paths.append(root / name)
+    return paths
 
 
 def git_changed_files(root: Path, base: str) -> list[Path] | None:
@@ -130,16 +383,30 @@ def git_changed_files(root: Path, base: str) -> list[Path] | None:
     return paths
 
 
-def read_text(path: Path) -> str | None:
+@contextlib.contextmanager
+def open_source(path: Path, size: int) -> Iterator[bytes | mmap.mmap]:
+    """Yield the file's contents: bytes for small files, a read-only mapping for large ones."""
+    if size < MMAP_MIN_BYTES:
+        yield path.read_bytes()
+        return
+    with open(path, "rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        yield mapped
+
+
+def sniff(sample: bytes, max_line: int) -> str | None:
+    """Return why a file starting with `sample` should not be scanned, or None to scan it."""
+    if b"\0" in sample:
+        return "binary"
+    if max_line and len(sample) > max_line and max(map(len, sample.split(b"\n"))) > max_line:
+        return "minified"
+    return None
+
+
+def decode(data: bytes | mmap.mmap) -> str:
     try:
-        return path.read_text(encoding="utf-8")
+        return str(data, "utf-8")
     except UnicodeDecodeError:
-        try:
-            return path.read_text(encoding="latin-1")
-        except Exception:
-            return None
-    except Exception:
-        return None
+        return str(data, "latin-1")
 
 
 def rel(path: Path, root: Path) -> str:
@@ -155,12 +422,55 @@ class PythonVisitor(ast.NodeVisitor):
         self.root = root
         self.loop_depth = 0
         self.findings: list[Finding] = []
+        self.functions: list[FunctionNode] = []
+        self.scope: list[str] = []
+        self.function: FunctionNode | None = None
+        # Loop depth where the current function starts, so call sites record depth within it.
+        self.function_loops = 0
 
     def add(self, node: ast.AST, severity: str, kind: str, message: str, suggestion: str) -> None:
         self.findings.append(
             Finding(rel(self.path, self.root), getattr(node, "lineno", 1), severity, kind, message, suggestion)
         )
 
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:
+        self.scope.append(node.name)
+        self.generic_visit(node)
+        self.scope.pop()
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:
+        self._visit_function(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:
+        self._visit_function(node)
+
+    def _visit_function(self, node: ast.FunctionDef | ast.AsyncFunctionDef) -> None:
+        # Same shape as __qualname__: "Class.method", "outer.<locals>.inner".
+        function = FunctionNode(
+            rel(self.path, self.root),
+            ".".join([*self.scope, node.name]),
+            node.lineno,
+            node.end_lineno or node.lineno,
+            is_entry_point(node),
+        )
+        self.functions.append(function)
+        # Decorators, defaults, and annotations run where the function is defined; only the body belongs to it.
+        for name, value in ast.iter_fields(node):
+            if name != "body":
+                self._visit_field(value)
+                continue
+            outer = self.function, self.function_loops
+            self.function, self.function_loops = function, self.loop_depth
+            self.scope.extend([node.name, "<locals>"])
+            self._visit_field(value)
+            del self.scope[-2:]
+            self.function, self.function_loops = outer
+
+    def _visit_field(self, value: Any) -> None:
+        for item in value if isinstance(value, list) else [value]:
+            if isinstance(item, ast.AST):
+                self.visit(item)
+
     def visit_For(self, node: ast.For) -> None:
         self._visit_loop(node)
 
@@ -193,6 +503,8 @@ class PythonVisitor(ast.NodeVisitor):
 
     def visit_Call(self, node: ast.Call) -> None:
         name = call_name(node.func)
+        if self.function is not None and name:
+            self.function.calls.append((call_target(node.func), self.loop_depth - self.function_loops))
         if self.loop_depth and name in {"sorted", "sort"}:
             self.add(
                 node,
@@ -240,10 +552,31 @@ def call_name(func: ast.AST) -> str:
     return ""
 
 
-def scan_python(path: Path, root: Path, text: str) -> list[Finding]:
+def call_target(func: ast.AST) -> str:
+    """How a call names its target for --hot-paths: "name", "self.name" (self or cls), or ".name" (any other object)."""
+    if isinstance(func, ast.Attribute):
+        if isinstance(func.value, ast.Name) and func.value.id in {"self", "cls"}:
+            return f"self.{func.attr}"
+        return f".{func.attr}"
+    return call_name(func)
+
+
+def is_entry_point(node: ast.FunctionDef | ast.AsyncFunctionDef) -> bool:
+    """Whether outside code calls this function: a route, task, or signal handler, or a main/handle function."""
+    for decorator in node.decorator_list:
+        if call_name(decorator.func if isinstance(decorator, ast.Call) else decorator) in ENTRY_DECORATORS:
+            return True
+    return ENTRY_NAME_RE.fullmatch(node.name) is not None
+
+
+def scan_python(
+    path: Path, root: Path, text: str, stats: ScanStats | None = None
+) -> tuple[list[Finding], list[FunctionNode]]:
     try:
         tree = ast.parse(text)
     except SyntaxError as exc:
+        if stats is not None:
+            stats.lap("parse")
         return [
             Finding(
                 rel(path, root),
@@ -253,30 +586,86 @@ def scan_python(path: Path, root: Path, text: str) -> list[Finding]:
                 "Python file could not be parsed; falling back to textual scanning only.",
                 "Inspect manually if this file is on a hot path.",
             )
-        ] + scan_text(path, root, text)
+        ] + scan_text(path, root, text, stats), []
+    if stats is not None:
+        stats.lap("parse")
     visitor = PythonVisitor(path, root)
     visitor.visit(tree)
-    return visitor.findings
+    if stats is not None:
+        stats.lap("python-rules")
+    return visitor.findings, visitor.functions
+
 
+def is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
 
-def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
+
+def line_rules(stripped: str) -> set[str]:
+    """Names of the scan_text rules that match `stripped`, found in a single scan of the line."""
+    rules: set[str] = set()
+    for match in LINE_RE.finditer(stripped):
+        token = match.group()
+        start = match.start()
+        word_before = start > 0 and is_word_char(stripped[start - 1])
+        if token[0] == ".":
+            name = token[1:-1]
+            method = name.rstrip()
+            rule = METHOD_RULES[method]
+            if rule == "query" and not word_before:
+                # `.exec(` only counts as a call on something (`db.exec(`).
+                continue
+            if rule is not None:
+                rules.add(rule)
+            if method in RENDER_TRANSFORMS and name == method:
+                rules.add("transform")
+        elif not word_before:
+            rules.add(WORD_RULES[token.partition("(")[0].split()[0]])
+    if FN_BOUNDARY_RE.match(stripped):
+        rules.add("fn")
+    return rules
+
+
+def scan_text(path: Path, root: Path, text: str, stats: ScanStats | None = None) -> list[Finding]:
     findings: list[Finding] = []
-    lines = text.splitlines()
     loop_stack: list[tuple[int, int]] = []
-    function_component_ranges = component_ranges(lines) if path.suffix in {".jsx", ".tsx", ".js", ".ts"} else set()
+    components = path.suffix in COMPONENT_SUFFIXES
+    # Render-path tracking: a component declaration opens a window of COMPONENT_SPAN lines that
+    # ends early once its braces balance.
+    in_component = False
+    active_until = 0
+    brace_balance = 0
 
-    for idx, line in enumerate(lines, start=1):
+    for idx, line in enumerate(text.splitlines(), start=1):
         stripped = line.strip()
-        if not stripped or stripped.startswith(("//", "#", "*")):
+        skipped = not stripped or stripped.startswith(("//", "#", "*"))
+        rules = line_rules(stripped) if stripped and (components or not skipped) else set()
+        if stats is not None and rules:
+            stats.rule_hits.update(rules)
+
+        in_render_path = False
+        if components:
+            if "render" in rules:
+                in_component = True
+                active_until = idx + COMPONENT_SPAN
+                brace_balance = 0
+            if in_component:
+                in_render_path = True
+                brace_balance += line.count("{") - line.count("}")
+                if idx > active_until or (
+                    idx > active_until - COMPONENT_SPAN + COMPONENT_MIN_LINES and brace_balance <= 0 and "}" in line
+                ):
+                    in_component = False
+        if skipped:
             continue
+
         indent = len(line) - len(line.lstrip(" "))
         # Reset stack when re-entering top-level scope or crossing a function boundary —
         # otherwise predicate calls in function A leak into nested-loop reports in function B.
-        if indent == 0 or FN_BOUNDARY_RE.match(line):
+        if indent == 0 or "fn" in rules:
             loop_stack = []
         loop_stack = [(level, lno) for level, lno in loop_stack if level < indent]
 
-        if LOOP_RE.search(stripped):
+        if "loop" in rules:
             if loop_stack:
                 findings.append(
                     Finding(
@@ -290,7 +679,7 @@ def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
                 )
             loop_stack.append((indent, idx))
 
-        if loop_stack and MEMBERSHIP_RE.search(stripped):
+        if loop_stack and "membership" in rules:
             findings.append(
                 Finding(
                     rel(path, root),
@@ -302,7 +691,7 @@ def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
                 )
             )
 
-        if loop_stack and SORT_RE.search(stripped):
+        if loop_stack and "sort" in rules:
             findings.append(
                 Finding(
                     rel(path, root),
@@ -314,7 +703,7 @@ def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
                 )
             )
 
-        if loop_stack and QUERY_IN_LOOP_RE.search(stripped):
+        if loop_stack and "query" in rules:
             findings.append(
                 Finding(
                     rel(path, root),
@@ -326,7 +715,7 @@ def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
                 )
             )
 
-        if idx in function_component_ranges and any(token in stripped for token in [".filter(", ".map(", ".sort(", ".reduce("]):
+        if in_render_path and "transform" in rules:
             findings.append(
                 Finding(
                     rel(path, root),
@@ -338,26 +727,403 @@ def scan_text(path: Path, root: Path, text: str) -> list[Finding]:
                 )
             )
 
+    if stats is not None:
+        stats.lap("text-rules")
     return findings
 
 
-def component_ranges(lines: list[str]) -> set[int]:
-    active_until = 0
-    interesting: set[int] = set()
-    brace_balance = 0
-    in_component = False
+def rules_fingerprint() -> str:
+    """Hash of this script, so cached findings never outlive a change to the rules that produced them."""
+    return hashlib.sha256(Path(__file__).read_bytes()).hexdigest()
+
+
+def cache_key(path: Path, data: bytes) -> str:
+    # The suffix picks the scanner (AST vs regex, component detection), so it is part of the key.
+    return f"{path.suffix}:{hashlib.sha256(data).hexdigest()}"
+
+
+def load_cache(cache_dir: Path) -> dict[str, list[list[Any]]]:
+    """Return the cached findings by content key, or nothing if the cache is missing, corrupt, or stale."""
+    try:
+        data = json.loads((cache_dir / "findings.json").read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != CACHE_VERSION or data.get("rules") != rules_fingerprint():
+        return {}
+    entries = data.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def save_cache(cache_dir: Path, entries: dict[str, list[list[Any]]]) -> None:
+    cache_dir.mkdir(parents=True, exist_ok=True)
+    ignore = cache_dir / ".gitignore"
+    if not ignore.exists():
+        ignore.write_text("*\n", encoding="utf-8")
+    payload = {"version": CACHE_VERSION, "rules": rules_fingerprint(), "entries": entries}
+    tmp = cache_dir / f"findings.json.{os.getpid()}.tmp"
+    tmp.write_text(json.dumps(payload, separators=(",", ":")), encoding="utf-8")
+    os.replace(tmp, cache_dir / "findings.json")
+
+
+def cache_entry(scan: FileScan) -> list[list[Any]]:
+    # Paths are left out so identical files anywhere in the tree share one entry.
+    return [
+        [[f.line, f.severity, f.kind, f.message, f.suggestion] for f in scan.findings],
+        [[fn.qualname, fn.line, fn.end_line, fn.entry, fn.calls] for fn in scan.functions],
+        scan.digests,
+    ]
+
+
+def finding_digests(findings: list[Finding], functions: list[FunctionNode], text: str) -> list[str]:
+    """Path-free part of each finding's baseline fingerprint: its kind, enclosing Python function, and line text.
+
+    Whitespace is collapsed so reindenting a line keeps its digest; line numbers are left out
+    so edits above a finding do not make it look new.
+    """
+    if not findings:
+        return []
+    lines = text.splitlines()
+    digests = []
+    for finding in findings:
+        content = " ".join(lines[finding.line - 1].split()) if finding.line <= len(lines) else ""
+        index = innermost(functions, finding.line)
+        function = functions[index].qualname if index is not None else ""
+        digests.append(hashlib.sha1(f"{finding.kind}\0{function}\0{content}".encode()).hexdigest()[:16])
+    return digests
+
+
+def scan_file(
+    path: Path,
+    root: Path,
+    cache: dict[str, list[list[Any]]] | None = None,
+    limits: ReadLimits = ReadLimits(),
+    digests: bool = False,
+    stats: bool = False,
+) -> FileScan:
+    file_stats = ScanStats() if stats else None
+    scan = _scan_file(path, root, cache, limits, digests, file_stats)
+    scan.stats = file_stats
+    return scan
+
+
+def _scan_file(
+    path: Path,
+    root: Path,
+    cache: dict[str, list[list[Any]]] | None,
+    limits: ReadLimits,
+    digests: bool,
+    stats: ScanStats | None,
+) -> FileScan:
+    try:
+        size = path.stat().st_size
+    except FileNotFoundError:  # listed by git but deleted from the worktree, or removed mid-scan
+        return FileScan(read=False, skipped="missing")
+    except OSError:
+        return FileScan(read=False, failed=True)
+    try:
+        if limits.max_bytes and size > limits.max_bytes:
+            return FileScan(read=False, skipped="too-large")
+        with open_source(path, size) as data:
+            if stats is not None:
+                stats.lap("read")
+                stats.bytes += size
+            reason = sniff(data[:SNIFF_BYTES], limits.max_line)
+            if stats is not None:
+                stats.lap("sniff")
+            if reason:
+                return FileScan(read=False, skipped=reason)
+            key = None
+            if cache is not None:
+                key = cache_key(path, data)
+                entry = cache.get(key)
+                if stats is not None:
+                    stats.lap("cache")
+                # Entries written without --baseline/--write-baseline have no digests; rescan for them.
+                if entry is not None and (not digests or len(entry[2]) == len(entry[0])):
+                    name = rel(path, root)
+                    rows, functions, cached_digests = entry
+                    return FileScan(
+                        [Finding(name, *row) for row in rows],
+                        [
+                            FunctionNode(name, qualname, line, end_line, entry_point, [tuple(call) for call in calls])
+                            for qualname, line, end_line, entry_point, calls in functions
+                        ],
+                        cached_digests,
+                        key=key,
+                        cached=True,
+                    )
+            text = decode(data)
+            if stats is not None:
+                stats.lap("decode")
+                stats.lines += text.count("\n") + (not text.endswith("\n"))
+    except (OSError, ValueError):  # unreadable, or changed size while being mapped
+        return FileScan(read=False, failed=True)
+    try:
+        if path.suffix == ".py":
+            findings, functions = scan_python(path, root, text, stats)
+        else:
+            findings, functions = scan_text(path, root, text, stats), []
+        if not digests:
+            return FileScan(findings, functions, key=key)
+        scan = FileScan(findings, functions, finding_digests(findings, functions, text), key=key)
+        if stats is not None:
+            stats.lap("digests")
+        return scan
+    except Exception as exc:  # keep scanning other files
+        return FileScan(failed=True, warning=f"scan failed for {rel(path, root)}: {exc.__class__.__name__}: {exc}")
+
+
+# Set in each worker process by the pool initializer, so the cache is pickled once per worker
+# rather than once per chunk of files.
+_worker_cache: dict[str, list[list[Any]]] | None = None
+
+
+def _init_worker(cache: dict[str, list[list[Any]]] | None) -> None:
+    global _worker_cache
+    _worker_cache = cache
+
+
+def _scan_file_in_worker(path: Path, root: Path, limits: ReadLimits, digests: bool, stats: bool) -> FileScan:
+    return scan_file(path, root, _worker_cache, limits, digests, stats)
+
+
+def scan_files(
+    paths: Iterable[Path],
+    root: Path,
+    jobs: int,
+    cache: dict[str, list[list[Any]]] | None = None,
+    limits: ReadLimits = ReadLimits(),
+    digests: bool = False,
+    stats: bool = False,
+) -> Iterable[FileScan]:
+    """Yield one FileScan per path, in the order of `paths`, fanning out to `jobs` worker processes."""
+    if jobs <= 1:
+        for path in paths:
+            yield scan_file(path, root, cache, limits, digests, stats)
+        return
+    paths = list(paths)
+    # A few chunks per worker keeps IPC overhead low while still balancing uneven file sizes.
+    chunksize = max(1, len(paths) // (jobs * 4))
+    pool = ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker, initargs=(cache,))
+    try:
+        scan = functools.partial(_scan_file_in_worker, root=root, limits=limits, digests=digests, stats=stats)
+        yield from pool.map(scan, paths, chunksize=chunksize)
+    finally:
+        # When the caller stops early (--format ndjson with --max-findings), drop the queued chunks.
+        pool.shutdown(cancel_futures=True)
+
+
+@dataclass
+class ScanTotals:
+    files_scanned: int = 0
+    files_failed: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    files_skipped: Counter[str] = field(default_factory=Counter)
+    baseline_known: int = 0
+    profile_cold: int = 0
+
+
+def iter_findings(
+    scans: Iterable[FileScan],
+    totals: ScanTotals,
+    used: dict[str, list[list[Any]]] | None = None,
+    functions: list[FunctionNode] | None = None,
+    baseline: Counter[str] | None = None,
+    fingerprints: list[str] | None = None,
+    stats: ScanStats | None = None,
+) -> Iterator[Finding]:
+    """Yield each file's deduplicated findings as its scan arrives, counting files in `totals`.
+
+    Cache entries for every file seen are recorded in `used`, Python functions are collected
+    into `functions`, every finding's fingerprint into `fingerprints`, and per-file counters
+    into `stats`, when those are given.
+    Findings whose fingerprint is still in `baseline` are counted as known and not yielded;
+    each baseline entry hides one finding, so a copy of a known hotspot is reported as new.
+    """
+    for scan in scans:
+        if scan.warning:
+            print(f"warn: {scan.warning}", file=sys.stderr)
+        totals.files_scanned += scan.read
+        totals.files_failed += scan.failed
+        if scan.skipped:
+            totals.files_skipped[scan.skipped] += 1
+        if scan.key is not None and used is not None:
+            totals.cache_hits += scan.cached
+            totals.cache_misses += not scan.cached
+            used[scan.key] = cache_entry(scan)
+        if functions is not None:
+            functions.extend(scan.functions)
+        # Duplicate keys include the path, so they can only come from the same file.
+        findings = dedupe(scan.findings)
+        if stats is not None:
+            if scan.stats is not None:
+                stats.merge(scan.stats)
+            stats.findings.update(finding.kind for finding in findings)
+        if baseline is None and fingerprints is None:
+            yield from findings
+            continue
+        digests = {(f.line, f.kind): digest for f, digest in zip(scan.findings, scan.digests)}
+        for finding in findings:
+            fingerprint = baseline_fingerprint(finding.path, digests[finding.line, finding.kind])
+            if fingerprints is not None:
+                fingerprints.append(fingerprint)
+            if baseline is not None and baseline[fingerprint] > 0:
+                baseline[fingerprint] -= 1
+                totals.baseline_known += 1
+                continue
+            yield finding
+
+
+def baseline_fingerprint(path: str, digest: str) -> str:
+    return hashlib.sha1(f"{path}\0{digest}".encode()).hexdigest()[:16]
 
-    for idx, line in enumerate(lines, start=1):
-        if RENDER_HINT_RE.search(line):
-            in_component = True
-            active_until = idx + 120
-            brace_balance = 0
-        if in_component:
-            interesting.add(idx)
-            brace_balance += line.count("{") - line.count("}")
-            if idx > active_until or (idx > active_until - 110 and brace_balance <= 0 and "}" in line):
-                in_component = False
-    return interesting
+
+def load_baseline(path: Path) -> Counter[str]:
+    """Fingerprint counts from a --write-baseline file. Raises ValueError if it is not one."""
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except OSError as exc:
+        raise ValueError(f"cannot read baseline {path}: {exc.strerror}") from exc
+    except ValueError as exc:
+        raise ValueError(f"baseline {path} is not valid JSON: {exc}") from exc
+    if (
+        not isinstance(data, dict)
+        or data.get("version") != BASELINE_VERSION
+        or not isinstance(data.get("fingerprints"), list)
+    ):
+        raise ValueError(f"baseline {path} was not written by this version of --write-baseline; regenerate it")
+    return Counter(data["fingerprints"])
+
+
+def write_baseline(path: Path, fingerprints: list[str]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    # Sorted, one per line, so a baseline checked into the repo diffs cleanly.
+    payload = {"version": BASELINE_VERSION, "fingerprints": sorted(fingerprints)}
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def load_profile(path: Path) -> Profile:
+    """Read a cProfile .pstats dump or collapsed stack text. Raises ValueError if it is neither."""
+    try:
+        data = path.read_bytes()
+    except OSError as exc:
+        raise ValueError(f"cannot read profile {path}: {exc.strerror}") from exc
+    try:
+        lines = [line for line in data.decode("utf-8").splitlines() if line.strip()]
+    except UnicodeDecodeError:
+        lines = []
+    matches = [COLLAPSED_LINE_RE.fullmatch(line) for line in lines]
+    if lines and all(matches):
+        profile = Profile("collapsed", 0)
+        samples: Counter[tuple[str, int, str]] = Counter()
+        for match in matches:
+            stack, count = match.groups()
+            profile.total += int(count)
+            frames = set()
+            for frame in stack.split(";"):
+                match = COLLAPSED_FRAME_RE.fullmatch(frame)
+                if match:
+                    frames.add((match[2], int(match[3] or 0), match[1]))
+            # Each frame's samples are inclusive: every stack it appears on counts once.
+            for frame in frames:
+                samples[frame] += int(count)
+        for (filename, line, name), count in samples.items():
+            profile.add(filename, line, name, count)
+        return profile
+    try:
+        stats = pstats.Stats(str(path))
+    except (ValueError, EOFError, TypeError) as exc:
+        raise ValueError(f"profile {path} is neither a cProfile .pstats file nor collapsed stacks") from exc
+    profile = Profile("pstats", stats.total_tt)
+    for (filename, line, name), (_, _, _, cumulative, _) in stats.stats.items():
+        profile.add(filename, line, name, cumulative)
+    return profile
+
+
+def measure_scans(
+    scans: Iterable[FileScan],
+    profile: Profile,
+    threshold: float,
+    measured: dict[tuple[str, int, str], tuple[float, str]],
+) -> Iterator[FileScan]:
+    """Pass scans through, recording the time share and function of each Python finding at or above `threshold`."""
+    for scan in scans:
+        python = [finding for finding in scan.findings if finding.path.endswith(".py")]
+        if python:
+            path = python[0].path
+            shares, module = profile.shares(path, scan.functions)
+            for finding in python:
+                index = innermost(scan.functions, finding.line)
+                if index is None:
+                    share, function = module, f"{path}:<module>"
+                else:
+                    share, function = shares[index], f"{path}:{scan.functions[index].qualname}"
+                if share >= threshold:
+                    measured[finding.path, finding.line, finding.kind] = (share, function)
+        yield scan
+
+
+def drop_cold(
+    findings: Iterable[Finding], measured: dict[tuple[str, int, str], tuple[float, str]], totals: ScanTotals
+) -> Iterator[Finding]:
+    """Skip Python findings that measure_scans found below the threshold; other languages are not profiled."""
+    for finding in findings:
+        if finding.path.endswith(".py") and (finding.path, finding.line, finding.kind) not in measured:
+            totals.profile_cold += 1
+            continue
+        yield finding
+
+
+def timed(items: Iterable[Path], stats: ScanStats, phase: str) -> Iterator[Path]:
+    """Yield from `items`, charging the time spent producing each one (a lazy directory walk) to `phase`."""
+    iterator = iter(items)
+    while True:
+        stats.last = time.perf_counter()
+        try:
+            item = next(iterator)
+        except StopIteration:
+            stats.lap(phase)
+            return
+        stats.lap(phase)
+        yield item
+
+
+def stats_summary(stats: ScanStats, files: int, wall: float) -> dict[str, Any]:
+    return {
+        "wall_seconds": round(wall, 4),
+        "phase_seconds": {phase: round(stats.seconds[phase], 4) for phase in STATS_PHASES if phase in stats.seconds},
+        "files": files,
+        "bytes": stats.bytes,
+        "lines": stats.lines,
+        "rule_hits": dict(sorted(stats.rule_hits.items())),
+        "findings_by_kind": dict(stats.findings.most_common()),
+    }
+
+
+def render_stats(summary: dict[str, Any]) -> str:
+    phases = summary["phase_seconds"]
+    total = sum(phases.values()) or 1.0
+    lines = [f"{'phase':<14} {'seconds':>9} {'share':>7}"]
+    lines.extend(f"{phase:<14} {seconds:>9.3f} {seconds / total:>7.1%}" for phase, seconds in phases.items())
+    wall = summary["wall_seconds"]
+    lines.append(f"{'wall':<14} {wall:>9.3f}")
+    lines.append("")
+    rate = f", {summary['lines'] / wall:,.0f} lines/s" if wall else ""
+    lines.append(
+        f"{summary['files']:,} files, {summary['bytes'] / 2**20:,.1f} MiB read, {summary['lines']:,} lines decoded{rate}"
+    )
+    if summary["rule_hits"]:
+        lines.append("")
+        lines.append(f"{'line rule':<14} {'hits':>9}")
+        lines.extend(f"{rule:<14} {hits:>9,}" for rule, hits in summary["rule_hits"].items())
+    if summary["findings_by_kind"]:
+        lines.append("")
+        lines.append(f"{'finding kind':<28} {'count':>9}")
+        lines.extend(f"{kind:<28} {count:>9,}" for kind, count in summary["findings_by_kind"].items())
+    return "\n".join(lines)
 
 
 def dedupe(findings: list[Finding]) -> list[Finding]:
@@ -376,29 +1142,183 @@ def severity_rank(finding: Finding) -> tuple[int, str, int]:
     return (order.get(finding.severity, 3), finding.path, finding.line)
 
 
-def render_markdown(findings: list[Finding]) -> str:
+def call_edges(functions: list[FunctionNode]) -> list[list[tuple[int, int]]]:
+    """Resolve each function's calls by name to (callee index, loop depth) pairs.
+
+    name() prefers a function or nested function in the same file, then a top-level function
+    elsewhere; self.name() prefers a method in the same file, then any method; obj.name() may be
+    any method or another file's top-level function. Names with too many candidates are dropped.
+    """
+    local: dict[tuple[str, str, bool], list[int]] = {}
+    anywhere: dict[tuple[str, bool], list[int]] = {}
+    for index, function in enumerate(functions):
+        parent, _, name = function.qualname.rpartition(".")
+        method = bool(parent) and not parent.endswith("<locals>")
+        local.setdefault((function.path, name, method), []).append(index)
+        if method or not parent:
+            anywhere.setdefault((name, method), []).append(index)
+
+    def targets(caller: FunctionNode, target: str) -> list[int]:
+        receiver, _, name = target.rpartition(".")
+        if not target.count("."):
+            candidates = local.get((caller.path, name, False)) or anywhere.get((name, False), [])
+        elif receiver == "self":
+            candidates = local.get((caller.path, name, True)) or anywhere.get((name, True), [])
+        else:
+            functions_elsewhere = [i for i in anywhere.get((name, False), []) if functions[i].path != caller.path]
+            candidates = anywhere.get((name, True), []) + functions_elsewhere
+        return candidates if len(candidates) <= MAX_CALL_TARGETS else []
+
+    return [
+        [(callee, depth) for target, depth in function.calls for callee in targets(function, target)]
+        for function in functions
+    ]
+
+
+def strongly_connected(successors: list[list[int]]) -> list[list[int]]:
+    """Tarjan's algorithm without recursion. Components come out callees first."""
+    order: list[int | None] = [None] * len(successors)
+    low = [0] * len(successors)
+    on_stack = [False] * len(successors)
+    stack: list[int] = []
+    components: list[list[int]] = []
+    counter = 0
+    for start in range(len(successors)):
+        if order[start] is not None:
+            continue
+        work = [(start, 0)]
+        while work:
+            node, resume = work.pop()
+            if resume == 0:
+                order[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            for position in range(resume, len(successors[node])):
+                successor = successors[node][position]
+                if order[successor] is None:
+                    work.extend([(node, position + 1), (successor, 0)])
+                    break
+                if on_stack[successor]:
+                    low[node] = min(low[node], order[successor])
+            else:
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+    return components
+
+
+def function_heat(functions: list[FunctionNode]) -> list[float]:
+    """Heat of each function: how strongly it is reached from entry points and loops (0 = cold)."""
+    edges = call_edges(functions)
+    components = strongly_connected([[callee for callee, _ in calls] for calls in edges])
+    component_of = [0] * len(functions)
+    for number, component in enumerate(components):
+        for member in component:
+            component_of[member] = number
+
+    def carried(heat: float, depth: int) -> float:
+        base = max(heat, LOOP_HEAT if depth else 0.0)
+        return min(HEAT_CAP, base * CALL_DECAY * LOOP_BOOST ** min(depth, 2))
+
+    heat = [ENTRY_HEAT if any(functions[m].entry for m in component) else 0.0 for component in components]
+    # Callers first, so each component's heat is final before it flows on to its callees.
+    for number in reversed(range(len(components))):
+        members = components[number]
+        for member in members:
+            for callee, depth in edges[member]:
+                if component_of[callee] == number and depth:
+                    heat[number] = max(heat[number], carried(0.0, depth))
+        for member in members:
+            for callee, depth in edges[member]:
+                target = component_of[callee]
+                if target != number:
+                    heat[target] = max(heat[target], carried(heat[number], depth))
+    return [heat[component_of[index]] for index in range(len(functions))]
+
+
+def innermost(functions: list[FunctionNode], line: int) -> int | None:
+    """Index of the innermost function whose span contains `line`: the latest-starting one."""
+    best = None
+    for index, function in enumerate(functions):
+        if function.line <= line <= function.end_line and (best is None or function.line > functions[best].line):
+            best = index
+    return best
+
+
+def rank_hot_paths(
+    findings: list[Finding], functions: list[FunctionNode], limit: int
+) -> list[tuple[Finding, float, str | None]]:
+    """The `limit` findings that matter most once severity is weighted by the heat of the enclosing function.
+
+    Findings outside any Python function (other languages, module level) have heat 0.
+    """
+    heat = function_heat(functions)
+    by_path: dict[str, tuple[list[FunctionNode], list[float]]] = {}
+    for function, value in zip(functions, heat):
+        in_file, heats = by_path.setdefault(function.path, ([], []))
+        in_file.append(function)
+        heats.append(value)
+
+    ranked = []
+    for finding in findings:
+        in_file, heats = by_path.get(finding.path, ([], []))
+        index = innermost(in_file, finding.line)
+        if index is None:
+            ranked.append((finding, 0.0, None))
+        else:
+            ranked.append((finding, round(heats[index], 2), f"{finding.path}:{in_file[index].qualname}"))
+    return heapq.nsmallest(
+        limit,
+        ranked,
+        key=lambda item: (-SEVERITY_WEIGHT.get(item[0].severity, 0) * (1 + item[1]), *severity_rank(item[0])),
+    )
+
+
+def render_markdown(findings: list[Finding], notes: list[str] | None = None) -> str:
     if not findings:
         return "No obvious complexity hotspots found by heuristic scanning.\n"
     lines = ["# Complexity Hotspots", ""]
-    for finding in findings:
+    for index, finding in enumerate(findings):
         lines.extend(
             [
                 f"## {finding.severity.upper()} {finding.kind}",
                 f"- Location: `{finding.path}:{finding.line}`",
                 f"- Finding: {finding.message}",
                 f"- Suggestion: {finding.suggestion}",
-                "",
             ]
         )
+        if notes is not None:
+            lines.append(f"- {notes[index]}")
+        lines.append("")
     return "\n".join(lines)
 
 
 def main() -> int:
     parser = argparse.ArgumentParser(description="Scan a repository for likely complexity hotspots.")
     parser.add_argument("root", nargs="?", default=".", help="Repository or directory to scan.")
-    parser.add_argument("--format", choices=["markdown", "json"], default="markdown")
+    parser.add_argument(
+        "--format",
+        choices=["markdown", "json", "ndjson"],
+        default="markdown",
+        help="ndjson streams one finding per line in scan order, then a summary line, and stops after --max-findings.",
+    )
     parser.add_argument("--exclude", action="append", default=[], help="Additional directory name to exclude.")
-    parser.add_argument("--max-findings", type=int, default=80)
+    parser.add_argument(
+        "--max-findings",
+        type=int,
+        default=80,
+        help="Report at most N findings: the N most severe for markdown/json, the first N found for ndjson (default: 80).",
+    )
     parser.add_argument(
         "--changed-only",
         action="store_true",
@@ -409,7 +1329,80 @@ def main() -> int:
         default="HEAD~1",
         help="Git ref to diff against when --changed-only is set (default: HEAD~1).",
     )
+    parser.add_argument(
+        "--git-files",
+        action="store_true",
+        help="List files from the git index (honours .gitignore) instead of walking the tree. Falls back to a walk outside git.",
+    )
+    parser.add_argument(
+        "--include-untracked",
+        action="store_true",
+        help="With --git-files, also scan untracked files that are not ignored. Implies --git-files.",
+    )
+    parser.add_argument(
+        "--hot-paths",
+        action="store_true",
+        help="Rank findings by severity weighted by how hot the enclosing Python function is in the repo's call graph.",
+    )
+    parser.add_argument(
+        "--profile",
+        metavar="FILE",
+        help="cProfile .pstats dump or collapsed stacks (py-spy). Ranks Python findings by their function's measured time.",
+    )
+    parser.add_argument(
+        "--profile-threshold",
+        type=float,
+        default=PROFILE_THRESHOLD,
+        metavar="SHARE",
+        help=f"With --profile, hide Python findings whose function took less than this share (default: {PROFILE_THRESHOLD}).",
+    )
+    parser.add_argument(
+        "--baseline",
+        metavar="FILE",
+        help="Report only findings absent from this --write-baseline file. Matching ignores line numbers.",
+    )
+    parser.add_argument(
+        "--write-baseline",
+        metavar="FILE",
+        help="Write the fingerprints of every finding in this scan (before --baseline and --max-findings) to FILE.",
+    )
+    parser.add_argument(
+        "--stats",
+        action="store_true",
+        help="Time each scan phase and count bytes, lines, line-rule hits, and findings per kind. "
+        "Printed as a table on stderr and added to the JSON/NDJSON summary.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Scan files in N worker processes (0 = one per CPU). Output is identical to a serial scan (default: 1).",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Reuse findings for unchanged files from {CACHE_DIRNAME}/ under root (keyed by content hash and scanner rules).",
+    )
+    parser.add_argument("--cache-dir", help=f"Cache directory to use instead of <root>/{CACHE_DIRNAME}. Implies --cache.")
+    parser.add_argument(
+        "--prune-cache",
+        action="store_true",
+        help="Drop cache entries not used by this scan (deleted or changed files). Implies --cache.",
+    )
+    parser.add_argument(
+        "--max-file-bytes",
+        type=int,
+        default=MAX_FILE_BYTES,
+        help=f"Skip files larger than this many bytes; 0 = no limit (default: {MAX_FILE_BYTES}).",
+    )
+    parser.add_argument(
+        "--max-line-bytes",
+        type=int,
+        default=MAX_LINE_BYTES,
+        help=f"Skip files as minified when a line near the start is longer than this; 0 = never (default: {MAX_LINE_BYTES}).",
+    )
     args = parser.parse_args()
+    started = time.perf_counter()
 
     root = Path(args.root).resolve()
     if not root.exists():
@@ -422,8 +1415,49 @@ def main() -> int:
         )
         return 2
 
+    if args.max_findings < 0:
+        print(f"error: --max-findings must be 0 or more (got {args.max_findings})", file=sys.stderr)
+        return 2
+    for flag, value in (("--max-file-bytes", args.max_file_bytes), ("--max-line-bytes", args.max_line_bytes)):
+        if value < 0:
+            print(f"error: {flag} must be 0 or more (got {value})", file=sys.stderr)
+            return 2
+    if args.jobs < 0:
+        print(f"error: --jobs must be 0 or a positive number (got {args.jobs})", file=sys.stderr)
+        return 2
+    jobs = args.jobs or os.cpu_count() or 1
+    if args.hot_paths and args.format == "ndjson":
+        print(
+            "error: --hot-paths needs the whole call graph before ranking; use --format json or markdown",
+            file=sys.stderr,
+        )
+        return 2
+
+    profile: Profile | None = None
+    if args.profile:
+        if args.hot_paths:
+            print("error: --profile and --hot-paths both rank findings; pick one", file=sys.stderr)
+            return 2
+        if not 0 <= args.profile_threshold <= 1:
+            print(f"error: --profile-threshold must be between 0 and 1 (got {args.profile_threshold})", file=sys.stderr)
+            return 2
+        try:
+            profile = load_profile(Path(args.profile))
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+
+    baseline: Counter[str] | None = None
+    if args.baseline:
+        try:
+            baseline = load_baseline(Path(args.baseline))
+        except ValueError as exc:
+            print(f"error: {exc}", file=sys.stderr)
+            return 2
+
     excludes = DEFAULT_EXCLUDES | set(args.exclude)
 
+    stats = ScanStats() if args.stats else None
     if args.changed_only:
         scoped = git_changed_files(root, args.base)
         if scoped is None:
@@ -436,56 +1470,199 @@ def main() -> int:
             return 0
         file_iter: Iterable[Path] = scoped
     else:
-        file_iter = iter_files(root, excludes)
+        listed = git_files(root, excludes, args.include_untracked) if args.git_files or args.include_untracked else None
+        if listed is None and (args.git_files or args.include_untracked):
+            print(f"warn: git ls-files failed under {root}; walking the directory instead", file=sys.stderr)
+        file_iter = iter_files(root, excludes) if listed is None else listed
+    if stats is not None:
+        # git lists files up front; the walk runs lazily as the scan pulls paths.
+        stats.lap("walk")
+        file_iter = timed(file_iter, stats, "walk")
 
-    findings: list[Finding] = []
-    files_scanned = 0
-    files_failed = 0
+    cache_dir: Path | None = None
+    cache: dict[str, list[list[Any]]] | None = None
+    if args.cache or args.cache_dir or args.prune_cache:
+        cache_dir = Path(args.cache_dir).resolve() if args.cache_dir else root / CACHE_DIRNAME
+        cache = load_cache(cache_dir)
+    used: dict[str, list[list[Any]]] = {}
+    totals = ScanTotals()
+    limits = ReadLimits(args.max_file_bytes, args.max_line_bytes)
+    functions: list[FunctionNode] | None = [] if args.hot_paths else None
+    fingerprints: list[str] | None = [] if args.write_baseline else None
+    scans = scan_files(
+        file_iter,
+        root,
+        jobs,
+        cache,
+        limits,
+        digests=baseline is not None or fingerprints is not None,
+        stats=stats is not None,
+    )
+    # Time share and function of every Python finding at or above --profile-threshold.
+    measured: dict[tuple[str, int, str], tuple[float, str]] = {}
+    if profile is not None:
+        scans = measure_scans(scans, profile, args.profile_threshold, measured)
+    found = iter_findings(scans, totals, used if cache is not None else None, functions, baseline, fingerprints, stats)
+    if profile is not None:
+        found = drop_cold(found, measured, totals)
+
+    def profile_fields(finding: Finding) -> dict[str, Any]:
+        share, function = measured.get((finding.path, finding.line, finding.kind), (None, None))
+        return {"time_share": None if share is None else round(share, 4), "function": function}
 
+    findings: list[Finding] = []
+    # Extra JSON fields per reported finding from --hot-paths or --profile.
+    extras: list[dict[str, Any]] | None = None
+    emitted = 0
+    truncated = False
     try:
-        for path in file_iter:
-            text = read_text(path)
-            if text is None:
-                files_failed += 1
-                continue
-            files_scanned += 1
-            try:
-                if path.suffix == ".py":
-                    findings.extend(scan_python(path, root, text))
-                else:
-                    findings.extend(scan_text(path, root, text))
-            except Exception as exc:  # keep scanning other files
-                files_failed += 1
-                print(
-                    f"warn: scan failed for {rel(path, root)}: {exc.__class__.__name__}: {exc}",
-                    file=sys.stderr,
-                )
+        with contextlib.closing(found):
+            if args.format == "ndjson":
+                for finding in found:
+                    if emitted == args.max_findings:
+                        truncated = True
+                        # The baseline needs every finding, and --prune-cache every file's entry,
+                        # so keep scanning without printing.
+                        if fingerprints is None and not args.prune_cache:
+                            break
+                        continue
+                    item = asdict(finding)
+                    if profile is not None:
+                        item.update(profile_fields(finding))
+                    print(json.dumps(item), flush=True)
+                    emitted += 1
+            elif functions is not None:
+                # Heat is only known once every file is in the graph, so Python findings are held until
+                # then. Other findings are always cold, so only the most severe --max-findings are kept.
+                python_findings: list[Finding] = []
+
+                def others() -> Iterator[Finding]:
+                    for finding in found:
+                        if finding.path.endswith(".py"):
+                            python_findings.append(finding)
+                        else:
+                            yield finding
+
+                candidates = heapq.nsmallest(args.max_findings, others(), key=severity_rank)
+                ranked = rank_hot_paths(python_findings + candidates, functions, args.max_findings)
+                findings = [finding for finding, _, _ in ranked]
+                extras = [{"heat": heat, "function": function} for _, heat, function in ranked]
+            elif profile is not None:
+                # Measured findings first, by time share; unprofiled (non-Python) ones after, by severity.
+                def measured_rank(finding: Finding) -> tuple[Any, ...]:
+                    share = measured.get((finding.path, finding.line, finding.kind), (None, None))[0]
+                    return (share is None, -(share or 0.0), *severity_rank(finding))
+
+                findings = heapq.nsmallest(args.max_findings, found, key=measured_rank)
+                extras = [profile_fields(finding) for finding in findings]
+            else:
+                # Same result as sorting every finding and slicing, holding only --max-findings of them.
+                findings = heapq.nsmallest(args.max_findings, found, key=severity_rank)
     except KeyboardInterrupt:
         print("interrupted", file=sys.stderr)
         return 130
+    files_scanned = totals.files_scanned
+    files_failed = totals.files_failed
 
+    files_skipped = dict(sorted(totals.files_skipped.items()))
+    skipped_note = ", ".join(f"{count} {reason}" for reason, count in files_skipped.items())
     if files_scanned == 0:
         print(
-            f"error: scanned 0 files under {root}. Check the path, supported extensions, or --exclude flags.",
+            f"error: scanned 0 files under {root}"
+            + (f" (skipped: {skipped_note}; see --max-file-bytes/--max-line-bytes)" if skipped_note else "")
+            + ". Check the path, supported extensions, or --exclude flags.",
             file=sys.stderr,
         )
         return 3
 
-    findings = sorted(dedupe(findings), key=severity_rank)[: args.max_findings]
-    if args.format == "json":
-        print(
-            json.dumps(
-                {
-                    "files_scanned": files_scanned,
-                    "files_failed": files_failed,
-                    "findings": [asdict(f) for f in findings],
-                },
-                indent=2,
-            )
-        )
+    if fingerprints is not None:
+        try:
+            write_baseline(Path(args.write_baseline), fingerprints)
+        except OSError as exc:
+            print(f"error: could not write baseline {args.write_baseline}: {exc}", file=sys.stderr)
+            return 2
+
+    cache_stats: dict[str, int] | None = None
+    if cache_dir is not None and cache is not None:
+        entries = used if args.prune_cache else {**cache, **used}
+        cache_stats = {
+            "hits": totals.cache_hits,
+            "misses": totals.cache_misses,
+            "pruned": len(cache.keys() - entries.keys()),
+            "entries": len(entries),
+        }
+        try:
+            save_cache(cache_dir, entries)
+        except OSError as exc:
+            print(f"warn: could not write cache {cache_dir}: {exc}", file=sys.stderr)
+
+    summary: dict[str, Any] = {
+        "files_scanned": files_scanned,
+        "files_failed": files_failed,
+        "files_skipped": files_skipped,
+    }
+    if cache_stats is not None:
+        summary["cache"] = cache_stats
+    if baseline is not None:
+        summary["baseline"] = {"known": totals.baseline_known, "unmatched": sum(baseline.values())}
+    if functions is not None:
+        summary["hot_paths"] = {"functions": len(functions), "entry_points": sum(f.entry for f in functions)}
+    if stats is not None:
+        summary["stats"] = stats_summary(stats, files_scanned, time.perf_counter() - started)
+        print(render_stats(summary["stats"]), file=sys.stderr)
+    if profile is not None:
+        summary["profile"] = {
+            "format": profile.kind,
+            "total": round(profile.total, 6),
+            "threshold": args.profile_threshold,
+            "cold": totals.profile_cold,
+        }
+    if args.format == "ndjson":
+        print(json.dumps({"summary": {**summary, "findings": emitted, "truncated": truncated}}))
+    elif args.format == "json":
+        items = [asdict(f) for f in findings]
+        for item, extra in zip(items, extras or []):
+            item.update(extra)
+        print(json.dumps({**summary, "findings": items}, indent=2))
     else:
-        print(render_markdown(findings))
+        notes = None
+        if functions is not None and extras is not None:
+            notes = [
+                f"Heat: {extra['heat']:.2f}"
+                + (f" in `{extra['function']}`" if extra["function"] else " (outside any Python function)")
+                for extra in extras
+            ]
+        elif profile is not None and extras is not None:
+            notes = [
+                f"Measured: {extra['time_share']:.1%} of profiled time in `{extra['function']}`"
+                if extra["function"]
+                else "Measured: not profiled"
+                for extra in extras
+            ]
+        print(render_markdown(findings, notes))
         print(f"\n_Scanned {files_scanned} files ({files_failed} skipped due to read/parse errors)._")
+        if skipped_note:
+            print(f"_Not scanned: {skipped_note} (see --max-file-bytes/--max-line-bytes)._")
+        if baseline is not None:
+            print(
+                f"_Baseline: {summary['baseline']['known']} known findings hidden, "
+                f"{summary['baseline']['unmatched']} baseline entries unmatched ({args.baseline})._"
+            )
+        if profile is not None:
+            print(
+                f"_Profile: {totals.profile_cold} Python findings under {args.profile_threshold:.1%} "
+                f"of profiled time hidden ({args.profile})._"
+            )
+        if functions is not None:
+            print(
+                f"_Hot paths: {summary['hot_paths']['functions']} Python functions, "
+                f"{summary['hot_paths']['entry_points']} entry points._"
+            )
+        if cache_stats is not None:
+            print(
+                f"_Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses, "
+                f"{cache_stats['pruned']} pruned ({cache_dir})._"
+            )
     return 0
 
 
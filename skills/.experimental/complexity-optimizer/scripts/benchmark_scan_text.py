@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""Throughput benchmark for the line scanner in analyze_complexity.py.
+
+Generates three synthetic JS/TS inputs and reports lines/sec and MiB/sec for
+`scan_text` on each:
+
+- `minified`  — a bundle of a few very long lines, the worst case for per-line regex work
+- `generated` — a long machine-generated TS file (client stubs, one short statement per line)
+- `component` — hand-written-looking TSX components with loops, fetches, and render transforms
+
+Run with: python3 scripts/benchmark_scan_text.py [--scale 1.0] [--repeat 5] [--json]
+Compare two revisions by running it on each and comparing the lines/sec columns.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+HERE = Path(__file__).resolve().parent
+sys.path.insert(0, str(HERE))
+
+from analyze_complexity import scan_text  # noqa: E402
+
+
+def component_source(count: int, rng: random.Random) -> str:
+    blocks = []
+    for i in range(count):
+        blocks.append(
+            f"""// Renders the rows for panel {i}.
+export function Panel{i}({{ rows, ids, onSelect }}) {{
+  const selected = rows.find(r => r.id === ids[0]);
+  const visible = rows.filter(r => r.visible).sort((a, b) => a.rank - b.rank);
+  for (const row of rows) {{
+    if (ids.includes(row.id)) {{
+      onSelect(row);
+    }}
+  }}
+  return (
+    <ul>
+      {{visible.map(r => <li key={{r.id}}>{{r.label}}</li>)}}
+    </ul>
+  );
+}}
+
+export async function loadPanel{i}(ids) {{
+  const out = [];
+  for (const id of ids) {{
+    out.push(await fetch(`/api/panel/{rng.randint(0, 999)}/${{id}}`));
+  }}
+  return out;
+}}
+"""
+        )
+    return "\n".join(blocks)
+
+
+def generated_source(count: int, rng: random.Random) -> str:
+    lines = ["/* eslint-disable */", "// Code generated by protoc-gen-ts. DO NOT EDIT."]
+    for i in range(count):
+        lines.extend(
+            [
+                f"export class Message{i} {{",
+                f"  static readonly typeName = \"pkg.v1.Message{i}\";",
+                f"  field{rng.randint(0, 99)}: string = \"\";",
+                "  static fromJson(json: Record<string, unknown>) {",
+                f"    const m = new Message{i}();",
+                "    for (const key of Object.keys(json)) {",
+                "      if (Message0.fields.indexOf(key) >= 0) m[key] = json[key];",
+                "    }",
+                "    return m;",
+                "  }",
+                "}",
+            ]
+        )
+    return "\n".join(lines)
+
+
+def minified_source(count: int, rng: random.Random) -> str:
+    statements = [
+        "for(var a=0;a<n.length;a++){if(t.indexOf(n[a])>=0)r.push(n[a])}",
+        "e.map(function(x){return x.filter(Boolean).sort()})",
+        "function q(e){return fetch(e).then(function(r){return r.json()})}",
+        "var o=e.reduce(function(a,b){return a+b},0)",
+        "while(i--)s[i]=s[i]|0",
+        "const Z=function(t){return t&&t.__esModule?t:{default:t}}",
+    ]
+    # Bundlers emit a handful of lines a few hundred KiB long.
+    per_line = 4000
+    lines = []
+    for _ in range(max(1, count // per_line)):
+        lines.append(";".join(rng.choice(statements) for _ in range(per_line)))
+    return "\n".join(lines)
+
+
+FIXTURES = {
+    "minified": ("bundle.min.js", minified_source, 24000),
+    "generated": ("messages_pb.ts", generated_source, 6000),
+    "component": ("Panels.tsx", component_source, 2000),
+}
+
+
+def measure(name: str, text: str, repeat: int) -> dict:
+    path = HERE / name
+    lines = text.count("\n") + 1
+    size = len(text.encode("utf-8"))
+    timings = []
+    findings = 0
+    for _ in range(repeat):
+        started = time.perf_counter()
+        findings = len(scan_text(path, HERE, text))
+        timings.append(time.perf_counter() - started)
+    seconds = statistics.median(timings)
+    return {
+        "lines": lines,
+        "bytes": size,
+        "findings": findings,
+        "median_seconds": round(seconds, 4),
+        "lines_per_second": round(lines / seconds),
+        "mib_per_second": round(size / seconds / 2**20, 2),
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Measure scan_text throughput on generated JS/TS inputs.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiply every fixture's size (default: 1.0).")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per fixture; the median is reported.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", action="store_true", help="Emit results as JSON.")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    results = {}
+    for label, (name, build, count) in FIXTURES.items():
+        text = build(max(1, int(count * args.scale)), rng)
+        results[label] = measure(name, text, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'fixture':<10} {'lines':>8} {'MiB':>7} {'findings':>9} {'seconds':>8} {'lines/s':>10} {'MiB/s':>7}")
+    for label, r in results.items():
+        print(
+            f"{label:<10} {r['lines']:>8} {r['bytes'] / 2**20:>7.2f} {r['findings']:>9} "
+            f"{r['median_seconds']:>8.3f} {r['lines_per_second']:>10} {r['mib_per_second']:>7.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Write a small Python app with a hot and a cold hotspot, then profile it both ways --profile reads.
+
+Creates, under OUTDIR:
+
+- `app/`              — a request handler with a nested loop that dominates the run time, and
+                        a settings loader with a nested loop that runs once over five keys
+- `profile.pstats`    — a cProfile dump of the run
+- `profile.collapsed` — py-spy style collapsed stacks ("name (path:line);... COUNT") from a
+                        sampling thread, so no profiler needs to be installed
+
+Run with: python3 scripts/make_profile_fixture.py OUTDIR [--rounds 100]
+Then:     python3 scripts/analyze_complexity.py OUTDIR --profile OUTDIR/profile.pstats
+"""
+
+from __future__ import annotations
+
+import argparse
+import cProfile
+import importlib
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+from textwrap import dedent
+
+SOURCES = {
+    "app/__init__.py": "",
+    "app/settings.py": """
+        def load_settings(keys):
+            table = {}
+            for key in keys:
+                for other in keys:
+                    table[key, other] = key == other
+            return table
+        """,
+    "app/handlers.py": """
+        def handle_request(rows, wanted):
+            matched = []
+            for row in rows:
+                for want in wanted:
+                    if row == want:
+                        matched.append(row)
+            return matched
+
+
+        def count_known(rows, wanted):
+            hits = 0
+            for row in rows:
+                if row in wanted:
+                    hits += 1
+            return hits
+        """,
+    "app/main.py": """
+        from app.handlers import count_known, handle_request
+        from app.settings import load_settings
+
+
+        def main(rounds):
+            load_settings(range(5))
+            rows = list(range(300))
+            wanted = list(range(200))
+            for _ in range(rounds):
+                handle_request(rows, wanted)
+                count_known(rows, wanted)
+        """,
+}
+SAMPLE_INTERVAL = 0.001
+
+
+def write_app(outdir: Path) -> None:
+    for name, source in SOURCES.items():
+        path = outdir / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(dedent(source).lstrip("\n"))
+
+
+def sample_stacks(target: threading.Thread, stop: threading.Event, stacks: Counter[str]) -> None:
+    """Record the target thread's stack, root first, every SAMPLE_INTERVAL, the way py-spy does."""
+    header = f'process {os.getpid()}:"python"'
+    while not stop.is_set():
+        frame = sys._current_frames().get(target.ident)
+        frames = []
+        while frame is not None:
+            # f_lineno can be None between instructions; the function's first line still identifies it.
+            line = frame.f_lineno or frame.f_code.co_firstlineno
+            frames.append(f"{frame.f_code.co_name} ({frame.f_code.co_filename}:{line})")
+            frame = frame.f_back
+        if frames:
+            stacks[";".join([header, *reversed(frames)])] += 1
+        time.sleep(SAMPLE_INTERVAL)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Write a profiled fixture app for analyze_complexity.py --profile.")
+    parser.add_argument("outdir", type=Path)
+    parser.add_argument("--rounds", type=int, default=100, help="Handler calls per profiled run (default: 100).")
+    args = parser.parse_args()
+
+    outdir = args.outdir.resolve()
+    write_app(outdir)
+    sys.path.insert(0, str(outdir))
+    app = importlib.import_module("app.main")
+
+    profiler = cProfile.Profile()
+    profiler.runcall(app.main, args.rounds)
+    profiler.dump_stats(outdir / "profile.pstats")
+
+    stacks: Counter[str] = Counter()
+    stop = threading.Event()
+    sampler = threading.Thread(target=sample_stacks, args=(threading.current_thread(), stop, stacks), daemon=True)
+    # The busy app thread holds the GIL; a short switch interval lets the sampler run on schedule.
+    switch_interval = sys.getswitchinterval()
+    sys.setswitchinterval(SAMPLE_INTERVAL / 10)
+    sampler.start()
+    try:
+        app.main(args.rounds)
+    finally:
+        stop.set()
+        sampler.join()
+        sys.setswitchinterval(switch_interval)
+    collapsed = outdir / "profile.collapsed"
+    collapsed.write_text("".join(f"{stack} {count}\n" for stack, count in sorted(stacks.items())))
+    print(f"wrote {outdir / 'app'}, {outdir / 'profile.pstats'}, {collapsed} ({sum(stacks.values())} samples)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -249,6 +249,29 @@ def _():
         assert isinstance(data["findings"], list)
 
 
+@case("oversized, binary, and minified files are skipped and counted by reason")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        loop = "for (const a of xs) {\n  for (const b of ys) {\n    ys.includes(a);\n  }\n}\n"
+        write(root, "app.ts", loop)
+        write(root, "big.ts", loop * 5000)
+        (root / "blob.js").write_bytes(b"for (;;) {}\n\0\x01\x02" + b"x" * 100)
+        write(root, "bundle.min.js", ";".join(["for(var a=0;a<n;a++){for(var b=0;b<n;b++){t.indexOf(b)}}"] * 200))
+        code, out, err = run([str(root), "--format", "json", "--max-file-bytes", "100000"])
+        assert code == 0, err
+        data = json.loads(out)
+        assert data["files_scanned"] == 1, data
+        assert data["files_skipped"] == {"binary": 1, "minified": 1, "too-large": 1}, data["files_skipped"]
+        assert {f["path"] for f in data["findings"]} == {"app.ts"}, data["findings"]
+        # big.ts is past the mmap threshold; with the limits off it is scanned like any other file.
+        limits_off = ["--max-file-bytes", "0", "--max-line-bytes", "0", "--max-findings", "100000"]
+        code, out, _ = run([str(root), "--format", "json", *limits_off])
+        data = json.loads(out)
+        assert data["files_scanned"] == 3 and data["files_skipped"] == {"binary": 1}, data
+        assert sum(f["path"] == "big.ts" for f in data["findings"]) == 10000, "mapped file scanned incompletely"
+
+
 @case("--changed-only requires a git repo, fails gracefully without one")
 def _():
     with tempfile.TemporaryDirectory() as tmp:
@@ -297,6 +320,392 @@ def _():
         assert all("touched" in p for p in paths), f"untouched file leaked: {paths}"
 
 
+@case("--git-files lists from the index; --include-untracked adds unignored files")
+def _():
+    if shutil.which("git") is None:
+        return  # skip
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        subprocess.run(["git", "init", "-q"], cwd=root, check=True)
+        nested = """
+            def f(items):
+                for a in items:
+                    for b in items:
+                        pass
+            """
+        write(root, ".gitignore", "build/\n")
+        write(root, "tracked.py", nested)
+        write(root, "gone.py", nested)
+        write(root, "vendor/lib.py", nested)
+        subprocess.run(["git", "-C", str(root), "add", "."], check=True)
+        (root / "gone.py").unlink()
+        write(root, "untracked.py", nested)
+        write(root, "build/out.py", nested)
+
+        code, out, _ = run([str(root), "--git-files", "--format", "json"])
+        assert code == 0, f"expected exit 0, got {code}"
+        data = json.loads(out)
+        assert {f["path"] for f in data["findings"]} == {"tracked.py"}, data["findings"]
+        assert data["files_scanned"] == 1 and data["files_skipped"] == {"missing": 1}, data
+
+        code, out, _ = run([str(root), "--include-untracked", "--format", "json"])
+        assert code == 0, f"expected exit 0, got {code}"
+        paths = {f["path"] for f in json.loads(out)["findings"]}
+        assert paths == {"tracked.py", "untracked.py"}, paths
+
+
+@case("--git-files outside a git repo warns and walks the tree")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        write(Path(tmp), "a.py", "x = 1\n")
+        code, out, err = run([str(tmp), "--git-files", "--format", "json"])
+        assert code == 0, f"expected exit 0, got {code}"
+        assert "walking the directory" in err, f"missing fallback warning, got: {err!r}"
+        assert json.loads(out)["files_scanned"] == 1
+
+
+@case("chained client calls and word boundaries survive the single-pass line scan")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root, "sync.ts", """
+            export async function sync(rows) {
+              for (const r of rows) {
+                await prisma.sort(r.ids);
+                await axios.map(r.urls);
+                resort(r); transform(r); perform(r);
+              }
+            }
+            """)
+        code, out, _ = run([str(root), "--format", "json"])
+        assert code == 0
+        found = sorted((f["line"], f["kind"]) for f in findings_of(out))
+        assert found == [
+            (3, "io-or-query-in-loop"),
+            (3, "sort-in-loop"),
+            (4, "io-or-query-in-loop"),
+            (4, "nested-or-callback-loop"),
+        ], f"unexpected findings: {found}"
+
+
+@case("--format ndjson streams findings then a summary, stopping at --max-findings")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(4):
+            write(root, f"m{i}.py", """
+                def pairs(items):
+                    for a in items:
+                        for b in items:
+                            yield a, b
+                """)
+        code, out, _ = run([str(root), "--format", "ndjson"])
+        assert code == 0
+        records = [json.loads(line) for line in out.splitlines()]
+        assert [r.get("kind") for r in records[:-1]] == ["nested-loop"] * 4, records
+        assert records[-1]["summary"] == {
+            "files_scanned": 4,
+            "files_failed": 0,
+            "files_skipped": {},
+            "findings": 4,
+            "truncated": False,
+        }
+        code, out, _ = run([str(root), "--format", "ndjson", "--max-findings", "2"])
+        assert code == 0
+        records = [json.loads(line) for line in out.splitlines()]
+        assert len(records) == 3, records
+        assert records[-1]["summary"]["truncated"] is True
+        assert records[-1]["summary"]["files_scanned"] == 3, "scan should stop once the next finding is past the cap"
+
+
+@case("--max-findings keeps the most severe findings, not the first found")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root, "a.py", """
+            def has(items, wanted):
+                for item in items:
+                    if item in wanted:
+                        return True
+            """)
+        write(root, "b.py", """
+            def pairs(items):
+                for a in items:
+                    for b in items:
+                        yield a, b
+            """)
+        code, out, _ = run([str(root), "--format", "json", "--max-findings", "1"])
+        assert code == 0
+        assert [(f["path"], f["kind"]) for f in findings_of(out)] == [("b.py", "nested-loop")], out
+        code, _, err = run([str(root), "--max-findings", "-1"])
+        assert code == 2 and "--max-findings" in err, (code, err)
+
+
+@case("--hot-paths ranks findings reached from handlers above setup code")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root, "app/setup.py", """
+            def load_fixtures(rows):
+                for a in rows:
+                    for b in rows:
+                        pass
+            """)
+        write(root, "app/views.py", """
+            from app.util import match
+
+            @app.get("/items")
+            def list_items(items, wanted):
+                for item in items:
+                    match(item, wanted)
+            """)
+        write(root, "app/util.py", """
+            def match(item, wanted):
+                for w in wanted:
+                    if item in wanted:
+                        return w
+            """)
+        write(root, "app/ui.ts", """
+            for (const a of xs) {
+              for (const b of ys) {}
+            }
+            """)
+        code, out, _ = run([str(root), "--format", "json"])
+        assert code == 0
+        assert [f["path"] for f in json.loads(out)["findings"]][0] == "app/setup.py"
+
+        code, out, _ = run([str(root), "--format", "json", "--hot-paths"])
+        assert code == 0, f"expected exit 0, got {code}"
+        data = json.loads(out)
+        assert data["hot_paths"] == {"functions": 3, "entry_points": 1}, data["hot_paths"]
+        top = data["findings"][0]
+        assert (top["path"], top["kind"], top["function"]) == ("app/util.py", "membership-in-loop", "app/util.py:match"), top
+        assert top["heat"] == 1.4, top
+        by_path = {f["path"]: f for f in data["findings"]}
+        assert by_path["app/setup.py"]["heat"] == 0.0 and by_path["app/ui.ts"]["function"] is None, by_path
+        for _ in range(2):
+            cached = json.loads(run([str(root), "--format", "json", "--hot-paths", "--cache"])[1])
+        assert cached["cache"]["hits"] == 4 and cached["findings"] == data["findings"], "call graph lost in the cache"
+
+        code, _, err = run([str(root), "--format", "ndjson", "--hot-paths"])
+        assert code == 2 and "--hot-paths" in err, (code, err)
+
+
+@case("--baseline reports only new findings, even after lines shift")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp) / "repo"
+        baseline = Path(tmp) / "baseline.json"
+        write(root, "a.py", """
+            def pairs(items):
+                for a in items:
+                    for b in items:
+                        pass
+            """)
+        write(root, "b.ts", """
+            for (const a of xs) {
+              for (const b of ys) {}
+            }
+            """)
+        code, out, _ = run([str(root), "--format", "json", "--write-baseline", str(baseline), "--max-findings", "1"])
+        assert code == 0 and len(json.loads(out)["findings"]) == 1
+        assert len(json.loads(baseline.read_text())["fingerprints"]) == 2, "baseline must hold every finding"
+
+        write(root, "a.py", """
+            import itertools
+
+
+            def pairs(items):
+                for a in items:
+                        for b in items:
+                            pass
+
+
+            def triples(items):
+                for a in items:
+                    for b in items:
+                        pass
+            """)
+        code, out, _ = run([str(root), "--format", "json", "--baseline", str(baseline)])
+        assert code == 0, f"expected exit 0, got {code}"
+        data = json.loads(out)
+        assert [(f["path"], f["line"]) for f in data["findings"]] == [("a.py", 12)], data["findings"]
+        assert data["baseline"] == {"known": 2, "unmatched": 0}, data["baseline"]
+
+        baseline.write_text("[]")
+        code, _, err = run([str(root), "--baseline", str(baseline)])
+        assert code == 2 and "regenerate" in err, (code, err)
+
+
+@case("--profile ranks by measured time and hides cold findings, for pstats and collapsed stacks")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        subprocess.run(
+            [sys.executable, str(HERE / "make_profile_fixture.py"), str(root)], check=True, capture_output=True
+        )
+        for name in ("profile.pstats", "profile.collapsed"):
+            code, out, err = run([str(root), "--format", "json", "--profile", str(root / name)])
+            assert code == 0, f"{name}: expected exit 0, got {code}: {err}"
+            data = json.loads(out)
+            top = data["findings"][0]
+            assert (top["path"], top["kind"], top["function"]) == (
+                "app/handlers.py",
+                "nested-loop",
+                "app/handlers.py:handle_request",
+            ), (name, top)
+            assert top["time_share"] > 0.3, (name, top)
+            assert "app/settings.py" not in {f["path"] for f in data["findings"]}, (name, data["findings"])
+            assert data["profile"]["cold"] >= 1, (name, data["profile"])
+
+        write(root, "not-a-profile.txt", "hello\n")
+        code, _, err = run([str(root), "--profile", str(root / "not-a-profile.txt")])
+        assert code == 2 and "neither" in err, (code, err)
+
+
+@case("--stats reports phase timings, volumes, line-rule hits, and findings per kind")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        write(root, "a.py", """
+            def pairs(items):
+                for a in items:
+                    for b in items:
+                        yield a, b
+            """)
+        write(root, "b.ts", """
+            for (const a of xs) {
+              ys.includes(a);
+            }
+            """)
+        code, plain, _ = run([str(root), "--format", "json"])
+        assert code == 0
+        for jobs in ("1", "2"):
+            code, out, err = run([str(root), "--format", "json", "--stats", "--jobs", jobs])
+            assert code == 0, err
+            data = json.loads(out)
+            assert data["findings"] == json.loads(plain)["findings"], "--stats changed the findings"
+            stats = data["stats"]
+            assert {"walk", "read", "decode", "parse", "python-rules", "text-rules"} <= set(stats["phase_seconds"]), stats
+            assert (stats["files"], stats["lines"]) == (2, 7), stats
+            assert stats["rule_hits"]["loop"] == 1 and stats["rule_hits"]["membership"] == 1, stats
+            assert stats["findings_by_kind"]["nested-loop"] == 1, stats
+            assert err.startswith("phase") and "text-rules" in err, err
+        assert "stats" not in json.loads(plain)
+
+
+@case("--jobs N output is byte-identical to the serial scan")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(12):
+            write(root, f"pkg{i % 3}/mod{i}.py", """
+                def pairs(items):
+                    for a in items:
+                        for b in sorted(items):
+                            if a in b:
+                                yield a, b
+                """)
+            write(root, f"web{i % 2}/list{i}.ts", """
+                export function merge(rows, ids) {
+                  for (const r of rows) {
+                    for (const id of ids) {
+                      if (ids.includes(r.id)) fetch(id);
+                    }
+                  }
+                }
+                """)
+        write(root, "broken.py", "def f(:\n")
+        for fmt in ("json", "markdown"):
+            serial = run([str(root), "--format", fmt, "--max-findings", "500"])
+            parallel = run([str(root), "--format", fmt, "--max-findings", "500", "--jobs", "3"])
+            assert serial[0] == 0, f"serial scan failed: {serial}"
+            assert parallel == serial, f"--jobs 3 {fmt} output differs from serial"
+            if fmt == "json":
+                assert json.loads(serial[1])["files_scanned"] == 25
+
+
+@case("--jobs rejects negative counts")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        write(Path(tmp), "x.py", "x = 1\n")
+        code, _, err = run([str(tmp), "--jobs", "-1"])
+        assert code == 2, f"expected exit 2, got {code}"
+        assert "--jobs" in err, f"missing --jobs error, got: {err!r}"
+
+
+@case("--cache serves unchanged files and rescans only modified ones")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        nested = """
+            def pairs(items):
+                for a in items:
+                    for b in items:
+                        yield a, b
+            """
+        write(root, "a.py", nested)
+        write(root, "b.py", "x = 1\n")
+        write(root, "c.ts", """
+            for (const a of xs) {
+              for (const b of ys) {
+                ys.includes(a);
+              }
+            }
+            """)
+        code, uncached, _ = run([str(root), "--format", "json"])
+        assert code == 0
+        first = json.loads(run([str(root), "--format", "json", "--cache"])[1])
+        assert first["cache"]["hits"] == 0 and first["cache"]["misses"] == 3, first["cache"]
+        assert (root / ".complexity-cache" / "findings.json").exists()
+        second = json.loads(run([str(root), "--format", "json", "--cache"])[1])
+        assert second["cache"]["hits"] == 3 and second["cache"]["misses"] == 0, second["cache"]
+        assert second["findings"] == json.loads(uncached)["findings"], "cached findings differ from a fresh scan"
+        write(root, "b.py", nested.replace("pairs", "all_pairs"))
+        third = json.loads(run([str(root), "--format", "json", "--cache"])[1])
+        assert third["cache"]["hits"] == 2 and third["cache"]["misses"] == 1, third["cache"]
+        assert [f["path"] for f in third["findings"]].count("b.py") == 1, third["findings"]
+
+
+@case("--prune-cache drops entries for deleted or changed files")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        cache_dir = Path(tmp) / "elsewhere"
+        write(root, "src/a.py", "x = 1\n")
+        write(root, "src/b.py", "y = 2\n")
+        run([str(root / "src"), "--cache-dir", str(cache_dir)])
+        (root / "src" / "b.py").unlink()
+        code, out, _ = run([str(root / "src"), "--format", "json", "--prune-cache", "--cache-dir", str(cache_dir)])
+        assert code == 0
+        stats = json.loads(out)["cache"]
+        assert stats == {"hits": 1, "misses": 0, "pruned": 1, "entries": 1}, stats
+        assert not (root / "src" / ".complexity-cache").exists(), "--cache-dir should replace the default location"
+
+
+@case("--prune-cache keeps entries for files an ndjson scan stopped before")
+def _():
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for i in range(5):
+            write(root, f"mod{i}.py", f"""
+                def pairs{i}(items):
+                    for a in items:
+                        for b in items:
+                            yield a, b
+                """)
+        run([str(root), "--cache"])
+        code, out, _ = run([str(root), "--format", "ndjson", "--max-findings", "1", "--prune-cache"])
+        assert code == 0
+        lines = out.splitlines()
+        assert len(lines) == 2, lines
+        summary = json.loads(lines[-1])["summary"]
+        assert summary["truncated"] and summary["cache"]["pruned"] == 0, summary
+        assert summary["cache"]["entries"] == 5, summary
+        stats = json.loads(run([str(root), "--format", "json", "--cache"])[1])["cache"]
+        assert stats["hits"] == 5 and stats["misses"] == 0, stats
+
+
 def main() -> int:
     failed = 0
     for c in CASES:
@@ -6,15 +6,23 @@ from __future__ import annotations
 import argparse
 import json
 import os
+import shlex
 import shutil
 import subprocess
 import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from symbol_index import build_index, ensure_index
+
 
 DEFAULT_MODULES = ["SwiftUI", "SwiftUICore"]
 DEFAULT_SDK = "iphonesimulator"
 DEFAULT_TARGET = "arm64-apple-ios-simulator"
+DEFAULT_EXTRACTOR = "xcrun swift-symbolgraph-extract"
+EXTRACTOR_ENV = "CODEX_SYMBOLGRAPH_EXTRACT"
 
 
 def run(args: list[str], *, capture: bool = False) -> subprocess.CompletedProcess[str]:
@@ -39,6 +47,11 @@ def default_cache_root() -> Path:
     return Path.home() / ".cache" / "codex" / "search-ios26-docs"
 
 
+def extractor_command(value: str | None = None) -> list[str]:
+    """Resolve the symbol graph extractor from --extractor, then $CODEX_SYMBOLGRAPH_EXTRACT."""
+    return shlex.split(value or os.environ.get(EXTRACTOR_ENV) or DEFAULT_EXTRACTOR)
+
+
 def cache_dir(root: Path, sdk: Path, target: str, module: str) -> Path:
     return root / sdk.name / target / module
 
@@ -62,22 +75,43 @@ def has_symbol_graphs(out_dir: Path) -> bool:
     return any(out_dir.glob("*.symbols.json"))
 
 
-def build_module(module: str, sdk: Path, target: str, root: Path, force: bool) -> Path:
+def write_manifest(manifest_path: Path, manifest: dict[str, object]) -> None:
+    """Replace the manifest atomically so a concurrent reader never sees a partial file."""
+    handle, tmp_name = tempfile.mkstemp(prefix=".manifest-", suffix=".json", dir=manifest_path.parent)
+    try:
+        with os.fdopen(handle, "w") as tmp:
+            tmp.write(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, manifest_path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def build_module(
+    module: str,
+    sdk: Path,
+    target: str,
+    root: Path,
+    force: bool,
+    extractor: list[str] | None = None,
+) -> Path:
     out_dir = cache_dir(root, sdk, target, module)
     manifest_path = out_dir / "manifest.json"
     if not force and has_symbol_graphs(out_dir) and manifest_matches(manifest_path, sdk, target, module):
-        print(f"[cached] {module}: {out_dir}")
+        ensure_index(out_dir, module)
+        print(f"[cached] {module}: {out_dir}", flush=True)
         return out_dir
 
     if force and out_dir.exists():
         shutil.rmtree(out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    print(f"[build] {module}: {out_dir}")
+    print(f"[build] {module}: {out_dir}", flush=True)
+    started = time.perf_counter()
     run(
         [
-            "xcrun",
-            "swift-symbolgraph-extract",
+            *(extractor or extractor_command()),
             "-module-name",
             module,
             "-target",
@@ -88,26 +122,54 @@ def build_module(module: str, sdk: Path, target: str, root: Path, force: bool) -
             str(out_dir),
         ]
     )
-    manifest_path.write_text(
-        json.dumps(
-            {
-                "module": module,
-                "sdk_path": str(sdk),
-                "sdk_name": sdk.name,
-                "target": target,
-                "files": sorted(p.name for p in out_dir.glob("*.symbols.json")),
-            },
-            indent=2,
-            sort_keys=True,
-        )
-        + "\n"
+    extracted = time.perf_counter()
+    files = sorted(p.name for p in out_dir.glob("*.symbols.json"))
+    write_manifest(
+        manifest_path,
+        {
+            "module": module,
+            "sdk_path": str(sdk),
+            "sdk_name": sdk.name,
+            "target": target,
+            "files": files,
+        },
+    )
+    build_index(out_dir, module)
+    finished = time.perf_counter()
+    print(
+        f"[built] {module}: {len(files)} graphs, extract {extracted - started:.1f}s,"
+        f" index {finished - extracted:.1f}s",
+        flush=True,
     )
     return out_dir
 
 
+def build_modules(
+    modules: list[str],
+    sdk: Path,
+    target: str,
+    root: Path,
+    force: bool,
+    extractor: list[str],
+    jobs: int,
+) -> list[Path]:
+    """Build `modules` with up to `jobs` extractor processes, returning their cache dirs in order.
+
+    Every module is attempted; the first failure in module order is raised afterwards.
+    """
+    if jobs <= 1 or len(modules) <= 1:
+        return [build_module(module, sdk, target, root, force, extractor) for module in modules]
+    # Forked workers flush inherited stdio buffers on exit; empty them first so nothing prints twice.
+    sys.stdout.flush()
+    with ProcessPoolExecutor(max_workers=min(jobs, len(modules))) as pool:
+        futures = [pool.submit(build_module, module, sdk, target, root, force, extractor) for module in modules]
+    return [future.result() for future in futures]
+
+
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description=__doc__)
     parser.add_argument("--sdk", default=DEFAULT_SDK, help=f"xcrun SDK name, default: {DEFAULT_SDK}")
+    parser.add_argument("--sdk-path", default=None, help="Use this SDK directory instead of resolving --sdk through xcrun.")
     parser.add_argument("--target", default=DEFAULT_TARGET, help=f"Swift target triple, default: {DEFAULT_TARGET}")
     parser.add_argument(
         "--module",
@@ -118,25 +180,34 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--cache-dir", default=None, help="Override cache root.")
     parser.add_argument("--force", action="store_true", help="Delete and rebuild selected module caches.")
     parser.add_argument("--list", action="store_true", help="Print resolved SDK/cache details without building.")
+    parser.add_argument("--jobs", type=int, default=1, help="Modules to extract concurrently, default: 1.")
+    parser.add_argument(
+        "--extractor",
+        default=None,
+        help=f"Symbol graph extractor command. Defaults to ${EXTRACTOR_ENV} or `{DEFAULT_EXTRACTOR}`.",
+    )
     return parser.parse_args()
 
 
 def main() -> int:
     args = parse_args()
     modules = args.modules or DEFAULT_MODULES
-    sdk = sdk_path(args.sdk)
+    sdk = Path(args.sdk_path).expanduser() if args.sdk_path else sdk_path(args.sdk)
     root = Path(args.cache_dir).expanduser() if args.cache_dir else default_cache_root()
 
     print(f"sdk={sdk}")
     print(f"target={args.target}")
     print(f"cache_root={root}")
     print(f"modules={','.join(modules)}")
+    extractor = extractor_command(args.extractor)
 
     if args.list:
+        print(f"extractor={shlex.join(extractor)}")
         return 0
 
-    for module in modules:
-        build_module(module, sdk, args.target, root, args.force)
+    started = time.perf_counter()
+    build_modules(modules, sdk, args.target, root, args.force, extractor, args.jobs)
+    print(f"[done] {len(modules)} modules in {time.perf_counter() - started:.1f}s (jobs={max(args.jobs, 1)})")
     return 0
 
 
@@ -5,24 +5,27 @@ from __future__ import annotations
 
 import subprocess
 import sys
-from pathlib import Path
+
+from search_engine import report_command_failure
+from search_symbols import main as search_main
 
 
 def main() -> int:
     if len(sys.argv) == 1:
         print("usage: probe_symbol.py QUERY [search_symbols.py options...]", file=sys.stderr)
         return 2
-    search_script = Path(__file__).with_name("search_symbols.py")
-    cmd = [
-        sys.executable,
-        str(search_script),
+    # Run the search in this process: it forwards to a --serve daemon when one is running.
+    argv = [
         "--verify-interfaces",
         "--no-dedupe",
         "--doc-chars",
         "-1",
         *sys.argv[1:],
     ]
-    return subprocess.call(cmd)
+    try:
+        return search_main(argv)
+    except subprocess.CalledProcessError as exc:
+        return report_command_failure(exc)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""Report iOS SDK symbols added, removed, or changed between two cached SDK versions."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Any
+
+from search_engine import default_cache_root, module_cache, report_command_failure, sdk_path
+from search_symbols import PLATFORM
+from symbol_index import SymbolRecord, graph_files, graph_signature, load_index
+
+
+DIFF_FORMAT = "1"
+STATUSES = ("added", "removed", "changed")
+# Fields compared between the two SDKs; a difference in any of them marks a symbol as changed.
+COMPARED_FIELDS = ("declaration", "availability")
+
+
+def diff_path(root: Path, old: str, new: str, target: str, module: str) -> Path:
+    """Diffs live beside the newer SDK's index, so rebuilding that module cache drops them too."""
+    return module_cache(root, Path(new), target, module) / f"diff-from-{old}.json"
+
+
+def cache_signature(out_dir: Path) -> str:
+    return json.dumps(graph_signature(out_dir))
+
+
+def symbols_by_identifier(symbols: list[SymbolRecord]) -> dict[str, SymbolRecord]:
+    """Key symbols by precise identifier; a symbol repeated in several graphs keeps its first occurrence."""
+    keyed: dict[str, SymbolRecord] = {}
+    for symbol in symbols:
+        if symbol.identifier and symbol.identifier not in keyed:
+            keyed[symbol.identifier] = symbol
+    return keyed
+
+
+def diff_entry(symbol: SymbolRecord) -> dict[str, Any]:
+    return {
+        "identifier": symbol.identifier,
+        "module": symbol.graph_module,
+        "kind": symbol.kind or None,
+        "title": symbol.title or None,
+        "path": symbol.path,
+        "declaration": symbol.declaration,
+        "availability": symbol.availability,
+    }
+
+
+def entry_order(entry: dict[str, Any]) -> tuple[str, str]:
+    return (entry["path"], entry["identifier"])
+
+
+def diff_symbols(old: list[SymbolRecord], new: list[SymbolRecord]) -> dict[str, list[dict[str, Any]]]:
+    old_symbols = symbols_by_identifier(old)
+    new_symbols = symbols_by_identifier(new)
+    added = [diff_entry(symbol) for key, symbol in new_symbols.items() if key not in old_symbols]
+    removed = [diff_entry(symbol) for key, symbol in old_symbols.items() if key not in new_symbols]
+    changed: list[dict[str, Any]] = []
+    for key, symbol in new_symbols.items():
+        previous = old_symbols.get(key)
+        if previous is None:
+            continue
+        fields = [field for field in COMPARED_FIELDS if getattr(previous, field) != getattr(symbol, field)]
+        if fields:
+            entry = diff_entry(symbol)
+            entry["changes"] = fields
+            entry["old"] = {field: getattr(previous, field) for field in COMPARED_FIELDS}
+            changed.append(entry)
+    return {
+        "added": sorted(added, key=entry_order),
+        "removed": sorted(removed, key=entry_order),
+        "changed": sorted(changed, key=entry_order),
+    }
+
+
+def write_diff(path: Path, diff: dict[str, Any]) -> None:
+    handle, tmp_name = tempfile.mkstemp(prefix=".diff-", suffix=".json", dir=path.parent)
+    try:
+        with os.fdopen(handle, "w") as tmp:
+            json.dump(diff, tmp, separators=(",", ":"))
+        os.chmod(tmp_name, 0o644)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
+def read_diff(path: Path, old_signature: str, new_signature: str) -> dict[str, Any] | None:
+    try:
+        diff = json.loads(path.read_text())
+    except (OSError, json.JSONDecodeError):
+        return None
+    if (
+        not isinstance(diff, dict)
+        or diff.get("format") != DIFF_FORMAT
+        or diff.get("oldSignature") != old_signature
+        or diff.get("newSignature") != new_signature
+    ):
+        return None
+    return diff
+
+
+def load_diff(root: Path, old: str, new: str, target: str, module: str, *, rebuild: bool = False) -> dict[str, Any]:
+    """Return the diff of `module` between two cached SDKs, computing it only when either cache changed.
+
+    A current diff is answered from its JSON file alone; neither SDK's graphs or index are opened.
+    """
+    old_dir = module_cache(root, Path(old), target, module)
+    new_dir = module_cache(root, Path(new), target, module)
+    for out_dir in (old_dir, new_dir):
+        if not graph_files(out_dir):
+            raise FileNotFoundError(f"no cached symbol graphs in {out_dir}; run build_cache.py for that SDK first")
+    old_signature = cache_signature(old_dir)
+    new_signature = cache_signature(new_dir)
+    path = diff_path(root, old, new, target, module)
+    if not rebuild:
+        diff = read_diff(path, old_signature, new_signature)
+        if diff is not None:
+            return diff
+    diff = {
+        "format": DIFF_FORMAT,
+        "module": module,
+        "old": old,
+        "new": new,
+        "target": target,
+        "oldSignature": old_signature,
+        "newSignature": new_signature,
+        **diff_symbols(load_index(old_dir, module), load_index(new_dir, module)),
+    }
+    write_diff(path, diff)
+    return diff
+
+
+def entry_matches(entry: dict[str, Any], terms: list[str], kind: str | None) -> bool:
+    if kind and kind.lower() not in (entry["kind"] or "").lower():
+        return False
+    haystack = f"{entry['title'] or ''} {entry['path']}".lower()
+    return all(term in haystack for term in terms)
+
+
+def cached_sdks(root: Path, target: str) -> list[str]:
+    if not root.exists():
+        return []
+    return sorted(path.parent.name for path in root.glob(f"*/{target}") if path.is_dir())
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("query", nargs="*", help="Only report symbols whose title or path contains every term.")
+    parser.add_argument("--old", help="Cached SDK directory name to diff from, for example iPhoneSimulator18.5.sdk.")
+    parser.add_argument("--new", help="Cached SDK directory name to diff to, default: the SDK resolved from --sdk.")
+    parser.add_argument("--sdk", default=PLATFORM.sdk, help=f"xcrun SDK name used when --new is omitted, default: {PLATFORM.sdk}")
+    parser.add_argument("--target", default=PLATFORM.target, help=f"Swift target triple, default: {PLATFORM.target}")
+    parser.add_argument("--module", action="append", dest="modules", help="Module to diff. May be repeated.")
+    parser.add_argument("--cache-dir", default=None, help="Override cache root.")
+    parser.add_argument("--status", action="append", choices=STATUSES, help="Only report these changes. May be repeated.")
+    parser.add_argument("--kind", default=None, help="Case-insensitive kind substring, for example 'Method'.")
+    parser.add_argument("--limit", type=int, default=200, help="Maximum reported symbols; use -1 for all.")
+    parser.add_argument("--rebuild", action="store_true", help="Recompute the diffs even when they are current.")
+    parser.add_argument("--list-sdks", action="store_true", help="List SDKs with caches for --target and exit.")
+    parser.add_argument("--json", action="store_true", help="Emit JSON results.")
+    args = parser.parse_args(argv)
+    if not args.old and not args.list_sdks:
+        parser.error("--old is required unless --list-sdks is used")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    root = Path(args.cache_dir).expanduser() if args.cache_dir else default_cache_root(PLATFORM)
+    if args.list_sdks:
+        for name in cached_sdks(root, args.target):
+            print(name)
+        return 0
+
+    new = args.new or sdk_path(args.sdk).name
+    modules = args.modules or list(PLATFORM.modules)
+    statuses = args.status or list(STATUSES)
+    terms = [term.lower() for term in args.query]
+    counts: dict[str, dict[str, int]] = {}
+    entries: list[dict[str, Any]] = []
+    for module in modules:
+        try:
+            diff = load_diff(root, args.old, new, args.target, module, rebuild=args.rebuild)
+        except FileNotFoundError as exc:
+            print(exc, file=sys.stderr)
+            return 2
+        counts[module] = {status: len(diff[status]) for status in STATUSES}
+        for status in statuses:
+            entries.extend(
+                {"status": status, "rootModule": module, **entry}
+                for entry in diff[status]
+                if entry_matches(entry, terms, args.kind)
+            )
+    matched = len(entries)
+    if args.limit >= 0:
+        entries = entries[: args.limit]
+
+    if args.json:
+        print(
+            json.dumps(
+                {
+                    "old": args.old,
+                    "new": new,
+                    "target": args.target,
+                    "modules": modules,
+                    "counts": counts,
+                    "matches": matched,
+                    "results": entries,
+                },
+                indent=2,
+            )
+        )
+        return 0
+
+    print(f"old: {args.old}")
+    print(f"new: {new}")
+    print(f"target: {args.target}")
+    for module, module_counts in counts.items():
+        print(f"{module}: " + ", ".join(f"{module_counts[status]} {status}" for status in STATUSES))
+    print(f"matches: {matched} raw, {len(entries)} shown")
+    markers = {"added": "+", "removed": "-", "changed": "~"}
+    for entry in entries:
+        print()
+        print(f"{markers[entry['status']]} {entry['module']} {entry['kind']} {entry['title']}")
+        print(f"path: {entry['path']}")
+        if entry["status"] == "changed":
+            for field in entry["changes"]:
+                print(f"old {field}: {entry['old'][field]}")
+                print(f"new {field}: {entry[field]}")
+            continue
+        if entry["availability"]:
+            print(f"availability: {entry['availability']}")
+        if entry["declaration"]:
+            print(f"declaration: {entry['declaration']}")
+    return 0
+
+
+if __name__ == "__main__":
+    try:
+        raise SystemExit(main())
+    except subprocess.CalledProcessError as exc:
+        raise SystemExit(report_command_failure(exc))
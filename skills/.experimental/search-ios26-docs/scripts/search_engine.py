@@ -0,0 +1,966 @@
+#!/usr/bin/env python3
+"""Symbol graph search shared by the iOS and macOS SDK documentation skills.
+
+Each skill's search_symbols.py picks its Platform and calls main(). This file is vendored
+unchanged into both skills; tests/test_search_engine.py fails when the copies drift.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import difflib
+import functools
+import heapq
+import io
+import json
+import os
+import re
+import subprocess
+import sys
+import traceback
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from sdk_inventory import inventory_for, open_inventory
+from search_daemon import DEFAULT_IDLE_TIMEOUT, request as daemon_request, serve, socket_path
+from source_store import load_source
+from symbol_index import SymbolRecord, introduced_versions, load_index, load_similar
+
+
+class Platform(NamedTuple):
+    """SDK defaults and cache location of one platform's symbol graph caches."""
+
+    name: str
+    domain: str
+    major: int
+    sdk: str
+    target: str
+    modules: tuple[str, ...]
+    cache_env: str
+    cache_name: str
+
+    @property
+    def latest_flag(self) -> str:
+        """Name of the option and batch field that keep symbols introduced in `major` or later, e.g. ios26."""
+        return f"{self.name}{self.major}"
+
+
+PLATFORMS = {
+    "ios": Platform(
+        name="ios",
+        domain="iOS",
+        major=26,
+        sdk="iphonesimulator",
+        target="arm64-apple-ios-simulator",
+        modules=("SwiftUI", "SwiftUICore"),
+        cache_env="CODEX_IOS26_DOCS_CACHE",
+        cache_name="search-ios26-docs",
+    ),
+    "macos": Platform(
+        name="macos",
+        domain="macOS",
+        major=26,
+        sdk="macosx",
+        target="arm64-apple-macos",
+        modules=("SwiftUI", "SwiftUICore", "AppKit"),
+        cache_env="CODEX_MACOS26_DOCS_CACHE",
+        cache_name="search-macos26-docs",
+    ),
+}
+# The fuzzy tier scores at most this many title-similar index candidates per module.
+FUZZY_CANDIDATES = 200
+FUZZY_MIN_SIMILARITY = 0.75
+FUZZY_MIN_CHARS = 4
+FUZZY_MAX_CHARS = 64
+
+
+def script_dir() -> Path:
+    return Path(__file__).resolve().parent
+
+
+def run(args: list[str], *, capture: bool = False) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        args,
+        check=True,
+        text=True,
+        stdout=subprocess.PIPE if capture else None,
+        stderr=subprocess.PIPE if capture else None,
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def sdk_path(sdk: str) -> Path:
+    result = run(["xcrun", "--sdk", sdk, "--show-sdk-path"], capture=True)
+    return Path(result.stdout.strip())
+
+
+def default_cache_root(platform: Platform) -> Path:
+    override = os.environ.get(platform.cache_env)
+    if override:
+        return Path(override).expanduser()
+    return Path.home() / ".cache" / "codex" / platform.cache_name
+
+
+def module_cache(root: Path, sdk: Path, target: str, module: str) -> Path:
+    return root / sdk.name / target / module
+
+
+class SearchScope(NamedTuple):
+    """One platform's resolved SDK, target, cache root, and modules for a query."""
+
+    platform: Platform
+    sdk_name: str
+    sdk: Path
+    target: str
+    root: Path
+    modules: list[str]
+
+
+def ordered_unique(values: list[str]) -> list[str]:
+    seen: set[str] = set()
+    ordered: list[str] = []
+    for value in values:
+        if value in seen:
+            continue
+        seen.add(value)
+        ordered.append(value)
+    return ordered
+
+
+def ensure_cache(root: Path, sdk_name: str, sdk: Path, target: str, modules: list[str], force: bool) -> None:
+    missing = [m for m in modules if not any(module_cache(root, sdk, target, m).glob("*.symbols.json"))]
+    if not missing and not force:
+        return
+
+    cmd = [
+        sys.executable,
+        str(script_dir() / "build_cache.py"),
+        "--sdk",
+        sdk_name,
+        "--sdk-path",
+        str(sdk),
+        "--target",
+        target,
+        "--cache-dir",
+        str(root),
+    ]
+    for module in modules:
+        cmd.extend(["--module", module])
+    if force:
+        cmd.append("--force")
+    run(cmd, capture=True)
+
+
+def introduced_at_least(symbol: SymbolRecord, domain: str, major: int) -> bool:
+    for item_domain, introduced in introduced_versions(symbol.introduced):
+        if item_domain != domain.lower():
+            continue
+        return introduced is not None and introduced >= major
+    return False
+
+
+def parse_introduced(value: str) -> tuple[str, int]:
+    if ":" not in value:
+        raise argparse.ArgumentTypeError("use DOMAIN:MAJOR, for example iOS:26 or macOS:26")
+    domain, major = value.split(":", 1)
+    if not domain or not major.isdigit():
+        raise argparse.ArgumentTypeError("use DOMAIN:MAJOR, for example iOS:26 or macOS:26")
+    return domain, int(major)
+
+
+def available_modules(sdk: Path) -> list[str]:
+    return inventory_for(sdk).modules()
+
+
+def matching_modules(sdk: Path, patterns: list[str]) -> list[str]:
+    modules = available_modules(sdk)
+    if not patterns:
+        return modules
+    lowered = [pattern.lower() for pattern in patterns]
+    return [
+        module
+        for module in modules
+        if any(pattern in module.lower() for pattern in lowered)
+    ]
+
+
+def module_source_files(sdk: Path, module: str) -> list[Path]:
+    return [path for path, _ in inventory_for(sdk).sources(module)]
+
+
+def source_kind(path: Path) -> str:
+    if path.suffix == ".swiftinterface":
+        return "swiftinterface"
+    if path.suffix == ".h":
+        return "header"
+    if path.suffix == ".apinotes":
+        return "apinotes"
+    return path.suffix.lstrip(".") or "source"
+
+
+def source_modules(symbol: SymbolRecord) -> list[str]:
+    modules: list[str] = []
+    for value in (symbol.root_module, symbol.graph_module):
+        if not value:
+            continue
+        for part in str(value).split("@"):
+            if part and part not in modules:
+                modules.append(part)
+    return modules
+
+
+def title_base(title: str) -> str:
+    return title.split("(", 1)[0].split("<", 1)[0].strip()
+
+
+@functools.lru_cache(maxsize=4096)
+def title_regex(title: str) -> re.Pattern[str] | None:
+    base = title_base(title)
+    if not base:
+        return None
+    if "(" not in title:
+        return re.compile(rf"\b{re.escape(base)}\b")
+    labels = re.findall(r"([A-Za-z_][A-Za-z0-9_]*)\s*:", title)
+    pieces = [rf"\b{re.escape(base)}\s*\("]
+    for label in labels:
+        pieces.append(rf".*{re.escape(label)}\b[^,)]*:")
+    return re.compile("".join(pieces))
+
+
+def source_patterns(symbol: SymbolRecord) -> list[re.Pattern[str]]:
+    title = symbol.title
+    declaration = symbol.declaration
+    raw_patterns: list[str] = []
+    if title:
+        raw_patterns.append(title)
+        if "(" not in title:
+            raw_patterns.append(title_base(title))
+    if symbol.path_tail:
+        raw_patterns.append(symbol.path_tail)
+    if declaration:
+        raw_patterns.append(declaration)
+
+    patterns: list[re.Pattern[str]] = []
+    if title:
+        regex = title_regex(title)
+        if regex:
+            patterns.append(regex)
+    for raw in ordered_unique([p for p in raw_patterns if p]):
+        if len(raw) > 140:
+            continue
+        patterns.append(literal_regex(raw))
+    return patterns
+
+
+@functools.lru_cache(maxsize=4096)
+def literal_regex(raw: str) -> re.Pattern[str]:
+    return re.compile(re.escape(raw))
+
+
+def find_source_matches(
+    symbol: SymbolRecord,
+    sdk: Path,
+    *,
+    limit: int,
+    context_lines: int,
+) -> list[dict[str, Any]]:
+    patterns = source_patterns(symbol)
+    if not patterns:
+        return []
+    return find_matches_in_modules(patterns, sdk, source_modules(symbol), limit=limit, context_lines=context_lines)
+
+
+def find_matches_in_modules(
+    patterns: list[re.Pattern[str]],
+    sdk: Path,
+    modules: list[str],
+    *,
+    limit: int,
+    context_lines: int,
+) -> list[dict[str, Any]]:
+    matches: list[dict[str, Any]] = []
+    seen: set[tuple[str, int]] = set()
+    for module in modules:
+        for source in module_source_files(sdk, module):
+            store = load_source(source)
+            if not store.lines:
+                continue
+            for index in store.candidate_lines(patterns):
+                line = store.lines[index - 1]
+                if not any(pattern.search(line) for pattern in patterns):
+                    continue
+                key = (str(source), index)
+                if key in seen:
+                    continue
+                seen.add(key)
+                start, context = store.context(index, context_lines)
+                matches.append(
+                    {
+                        "module": module,
+                        "sourceKind": source_kind(source),
+                        "path": str(source),
+                        "line": index,
+                        "text": line.strip(),
+                        "contextStart": start,
+                        "context": context,
+                    }
+                )
+                if len(matches) >= limit:
+                    return matches
+    return matches
+
+
+def query_source_patterns(query: list[str]) -> list[re.Pattern[str]]:
+    phrase = " ".join(query).strip()
+    patterns: list[re.Pattern[str]] = []
+    if phrase:
+        patterns.append(re.compile(re.escape(phrase), re.IGNORECASE))
+    if len(query) > 1:
+        ordered_terms = [re.escape(term) for term in query if term]
+        if ordered_terms:
+            patterns.append(re.compile(r".*".join(ordered_terms), re.IGNORECASE))
+    for term in query:
+        if len(term) >= 4:
+            patterns.append(re.compile(re.escape(term), re.IGNORECASE))
+    return patterns
+
+
+def find_query_source_matches(
+    query: list[str],
+    sdk: Path,
+    modules: list[str],
+    *,
+    limit: int,
+    context_lines: int,
+) -> list[dict[str, Any]]:
+    return find_matches_in_modules(
+        query_source_patterns(query),
+        sdk,
+        modules,
+        limit=limit,
+        context_lines=context_lines,
+    )
+
+
+def source_diagnostics(matches: list[dict[str, Any]], platform_domain: str) -> dict[str, Any]:
+    context = "\n".join(
+        line["text"]
+        for match in matches
+        for line in match.get("context", [])
+    )
+    lower_context = context.lower()
+    platform_unavailable = bool(
+        re.search(rf"@available\(\s*{re.escape(platform_domain)}\s*,\s*unavailable", context, re.IGNORECASE)
+    )
+    unavailable = "unavailable" in lower_context or "api_unavailable" in lower_context
+    deprecated = "deprecated" in lower_context or "api_deprecated" in lower_context
+    renamed = "renamed" in lower_context or "swift_private" in lower_context
+    notes: list[str] = []
+    if not matches:
+        notes.append("No matching swiftinterface, header, or apinotes declaration found for the top source patterns.")
+    if platform_unavailable:
+        notes.append(f"Matched SDK source marks this symbol unavailable on {platform_domain}.")
+    elif matches:
+        notes.append("Matched SDK source declaration text.")
+    return {
+        "found": bool(matches),
+        "sourceKinds": sorted({str(match.get("sourceKind")) for match in matches}),
+        "platformUnavailable": platform_unavailable,
+        "unavailable": unavailable,
+        "deprecated": deprecated,
+        "renamed": renamed,
+        "notes": notes,
+    }
+
+
+def load_symbols(
+    root: Path,
+    sdk: Path,
+    target: str,
+    modules: list[str],
+    terms: list[str] | None = None,
+) -> list[SymbolRecord]:
+    """Load cached symbols; with `terms`, only the index candidates that can score above zero."""
+    loaded: list[SymbolRecord] = []
+    for module in modules:
+        loaded.extend(load_index(module_cache(root, sdk, target, module), module, terms))
+    return loaded
+
+
+def score_symbol(symbol: SymbolRecord, terms: list[str], phrase: str) -> int:
+    haystacks = {
+        "title": symbol.title.lower(),
+        "path": symbol.path.lower(),
+        "declaration": symbol.declaration.lower(),
+        "doc": symbol.doc.lower(),
+    }
+    score = 0
+    lower_phrase = phrase.lower()
+    if haystacks["title"] == lower_phrase:
+        score += 500
+    if lower_phrase in haystacks["path"]:
+        score += 180
+    if lower_phrase in haystacks["title"]:
+        score += 140
+    if lower_phrase in haystacks["declaration"]:
+        score += 70
+    if lower_phrase in haystacks["doc"]:
+        score += 35
+    for term in terms:
+        if term in haystacks["title"]:
+            score += 60
+        if term in haystacks["path"]:
+            score += 45
+        if term in haystacks["declaration"]:
+            score += 25
+        if term in haystacks["doc"]:
+            score += 8
+    return score
+
+
+def fuzzy_key(text: str) -> str:
+    return re.sub(r"[^0-9a-z]", "", title_base(text).lower())[:FUZZY_MAX_CHARS]
+
+
+def fuzzy_similarity(key: str, symbol: SymbolRecord) -> float:
+    """Return how closely the symbol's title or path spells `key`, from 0 to 1.
+
+    Characters the two share in order count mostly against the query's length, so an
+    abbreviation such as "zoomnavtransition" stays close to "ZoomNavigationTransition".
+    """
+    best = 0.0
+    for text in (symbol.title, symbol.path):
+        candidate = fuzzy_key(text)
+        if not candidate:
+            continue
+        blocks = difflib.SequenceMatcher(None, key, candidate, autojunk=False).get_matching_blocks()
+        shared = sum(block.size for block in blocks)
+        best = max(best, 0.75 * shared / len(key) + 0.25 * shared / len(candidate))
+    return best
+
+
+def fuzzy_results(
+    args: argparse.Namespace,
+    scope: SearchScope,
+    introduced_filter: tuple[str, int] | None,
+) -> list[tuple[int, SymbolRecord]]:
+    """Rank symbols whose names are a few typos or elided letters away from the query.
+
+    This is the fallback tier for queries with no exact match. Scores are the similarity
+    as a percentage, and each module contributes at most FUZZY_CANDIDATES candidates.
+    """
+    key = fuzzy_key("".join(args.query))
+    if len(key) < FUZZY_MIN_CHARS:
+        return []
+    results: list[tuple[int, SymbolRecord]] = []
+    for module in scope.modules:
+        out_dir = module_cache(scope.root, scope.sdk, scope.target, module)
+        for symbol in load_similar(out_dir, module, key, FUZZY_CANDIDATES):
+            if not symbol_passes_filters(symbol, args.kind, introduced_filter):
+                continue
+            similarity = fuzzy_similarity(key, symbol)
+            if similarity >= FUZZY_MIN_SIMILARITY:
+                results.append((round(similarity * 100), symbol))
+    return results
+
+
+def symbol_passes_filters(symbol: SymbolRecord, kind: str | None, introduced_filter: tuple[str, int] | None) -> bool:
+    if kind and kind.lower() not in symbol.kind.lower():
+        return False
+    return not introduced_filter or introduced_at_least(symbol, introduced_filter[0], introduced_filter[1])
+
+
+def result_order(item: tuple[int, SymbolRecord]) -> tuple[int, str, str]:
+    return (-item[0], item[1].title, item[1].path)
+
+
+def select_results(
+    results: list[tuple[int, SymbolRecord]],
+    limit: int,
+    *,
+    dedupe: bool,
+) -> list[tuple[int, SymbolRecord]]:
+    """Return the first `limit` results in ranking order, skipping duplicate symbols when `dedupe`.
+
+    heapq.nsmallest keeps ties in input order just like a stable sort, so only a prefix of
+    the ranking is built, doubling it while duplicates leave fewer than `limit` results.
+    """
+    window = max(limit, 1)
+    while True:
+        ranked = heapq.nsmallest(window, results, key=result_order)
+        selected: list[tuple[int, SymbolRecord]] = []
+        seen: set[tuple[str, str, str, str]] = set()
+        for score, symbol in ranked:
+            if dedupe:
+                key = (symbol.title, symbol.declaration, symbol.availability, symbol.doc)
+                if key in seen:
+                    continue
+                seen.add(key)
+            selected.append((score, symbol))
+            if len(selected) >= limit:
+                return selected
+        if len(ranked) < window:
+            return selected
+        window *= 2
+
+
+def compact_result(
+    symbol: SymbolRecord,
+    score: int,
+    doc_chars: int,
+    scope: SearchScope,
+    *,
+    verify_sources: bool,
+    source_limit: int,
+    source_context_lines: int,
+) -> dict[str, Any]:
+    doc = symbol.doc
+    if doc_chars >= 0 and len(doc) > doc_chars:
+        doc = doc[:doc_chars].rstrip() + "..."
+    item = {
+        "score": score,
+        "platform": scope.platform.domain,
+        "module": symbol.graph_module,
+        "rootModule": symbol.root_module,
+        "kind": symbol.kind or None,
+        "title": symbol.title or None,
+        "path": symbol.path,
+        "declaration": symbol.declaration,
+        "availability": symbol.availability,
+        "doc": doc,
+        "identifier": symbol.identifier,
+    }
+    if verify_sources:
+        matches = find_source_matches(symbol, scope.sdk, limit=source_limit, context_lines=source_context_lines)
+        item["sourceMatches"] = matches
+        item["sourceDiagnostics"] = source_diagnostics(matches, scope.platform.domain)
+    return item
+
+
+def parse_args(platform: Platform, argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=f"Search cached {platform.domain} SDK symbol graph documentation.")
+    parser.add_argument("query", nargs="*", help="Search terms.")
+    parser.add_argument("--sdk", default=platform.sdk, help=f"xcrun SDK name, default: {platform.sdk}")
+    parser.add_argument("--sdk-path", default=None, help="Use this SDK directory instead of resolving --sdk through xcrun.")
+    parser.add_argument("--target", default=platform.target, help=f"Swift target triple, default: {platform.target}")
+    parser.add_argument(
+        "--platform",
+        action="append",
+        dest="platforms",
+        choices=sorted(PLATFORMS),
+        help=(
+            f"Platform to search, default: {platform.name}. Repeat to rank several platforms in one pass; "
+            f"--sdk, --sdk-path, and --target apply to {platform.name}, other platforms use their own defaults."
+        ),
+    )
+    parser.add_argument("--module", action="append", dest="modules", help="Module cache to search. May be repeated.")
+    parser.add_argument("--list-modules", action="store_true", help="List importable framework module names from the SDK and exit.")
+    parser.add_argument("--find-module", action="append", dest="module_patterns", help="List SDK modules whose names contain this substring and exit. May be repeated.")
+    parser.add_argument("--cache-dir", default=None, help="Override cache root.")
+    parser.add_argument("--limit", type=int, default=20, help="Maximum results.")
+    parser.add_argument("--kind", default=None, help="Case-insensitive kind substring, for example 'Method'.")
+    parser.add_argument(
+        f"--{platform.latest_flag}",
+        action="store_true",
+        help=f"Only include symbols introduced in {platform.domain} {platform.major} or later.",
+    )
+    parser.add_argument("--introduced", type=parse_introduced, help="Only include symbols introduced in DOMAIN:MAJOR or later.")
+    parser.add_argument(
+        "--verify-interfaces",
+        action="store_true",
+        help="Attach matching swiftinterface/header/apinotes snippets and availability diagnostics to each shown result.",
+    )
+    parser.add_argument("--source-limit", type=int, default=4, help="Maximum source snippets per verified result.")
+    parser.add_argument("--source-context-lines", type=int, default=4, help="Context lines around each source snippet.")
+    parser.add_argument("--force", action="store_true", help="Rebuild selected module caches before searching.")
+    parser.add_argument("--json", action="store_true", help="Emit JSON results.")
+    parser.add_argument("--no-doc", action="store_true", help="Do not print doc snippets.")
+    parser.add_argument("--no-dedupe", action="store_true", help="Keep repeated extension results with identical docs.")
+    parser.add_argument(
+        "--no-fuzzy",
+        action="store_true",
+        help="Do not fall back to typo-tolerant name matches when nothing matches exactly.",
+    )
+    parser.add_argument("--doc-chars", type=int, default=500, help="Maximum doc snippet characters; use -1 for full docs.")
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="Run a daemon that keeps caches warm and answers other invocations over a Unix socket until idle.",
+    )
+    parser.add_argument(
+        "--idle-timeout",
+        type=float,
+        default=DEFAULT_IDLE_TIMEOUT,
+        help=f"Seconds without queries before --serve exits, default: {DEFAULT_IDLE_TIMEOUT:g}.",
+    )
+    parser.add_argument("--no-daemon", action="store_true", help="Search in-process even when a --serve daemon is running.")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        default=None,
+        help="Run NDJSON query specs from FILE ('-' for stdin) and print one JSON line per query.",
+    )
+    args = parser.parse_args(argv)
+    if args.batch and args.query:
+        parser.error("--batch takes its queries from FILE, not the command line")
+    if not args.query and not args.list_modules and not args.module_patterns and not args.serve and not args.batch:
+        parser.error("query is required unless --list-modules, --find-module, --serve, or --batch is used")
+    # The daemon may run from another working directory, so send it absolute paths.
+    if args.cache_dir:
+        args.cache_dir = str(Path(args.cache_dir).expanduser().resolve())
+    if args.sdk_path:
+        args.sdk_path = str(Path(args.sdk_path).expanduser().resolve())
+    return args
+
+
+# Query spec fields accepted by --batch, mapped to the option they override and its JSON type.
+BATCH_FIELDS: dict[str, tuple[str, type | tuple[type, ...]]] = {
+    "kind": ("kind", str),
+    "introduced": ("introduced", str),
+    "limit": ("limit", int),
+    "modules": ("modules", (list, str)),
+    "platforms": ("platforms", (list, str)),
+    "verifyInterfaces": ("verify_interfaces", bool),
+    "sourceLimit": ("source_limit", int),
+    "sourceContextLines": ("source_context_lines", int),
+    "noDoc": ("no_doc", bool),
+    "noDedupe": ("no_dedupe", bool),
+    "noFuzzy": ("no_fuzzy", bool),
+    "docChars": ("doc_chars", int),
+}
+
+
+def batch_query_args(platform: Platform, base: argparse.Namespace, spec: Any) -> argparse.Namespace:
+    """Overlay one --batch query spec on the command-line options; null fields keep the option's value.
+
+    Besides BATCH_FIELDS, a spec may set the platform's latest-release filter (for example `ios26`).
+    """
+    if not isinstance(spec, dict):
+        raise ValueError("query spec must be a JSON object")
+    query = spec.get("query")
+    if isinstance(query, str):
+        query = query.split()
+    if not query or not isinstance(query, list) or not all(isinstance(term, str) for term in query):
+        raise ValueError("query must be a non-empty string or list of strings")
+    fields = {**BATCH_FIELDS, platform.latest_flag: (platform.latest_flag, bool)}
+    args = argparse.Namespace(**vars(base))
+    args.query = query
+    for key, value in spec.items():
+        if key in ("id", "query"):
+            continue
+        if key not in fields:
+            raise ValueError(f"unknown query spec field {key!r}")
+        if value is None:
+            continue
+        option, expected = fields[key]
+        if not isinstance(value, expected) or (expected is int and isinstance(value, bool)):
+            raise ValueError(f"{key} has the wrong type")
+        setattr(args, option, value)
+    if isinstance(args.introduced, str):
+        args.introduced = parse_introduced(args.introduced)
+    if isinstance(args.modules, str):
+        args.modules = [args.modules]
+    if isinstance(args.platforms, str):
+        args.platforms = [args.platforms]
+    for name in args.platforms or []:
+        if name not in PLATFORMS:
+            raise ValueError(f"unknown platform {name!r}; use one of {', '.join(sorted(PLATFORMS))}")
+    return args
+
+
+def cache_root(platform: Platform, args: argparse.Namespace) -> Path:
+    return Path(args.cache_dir) if args.cache_dir else default_cache_root(platform)
+
+
+def daemon_socket(platform: Platform, args: argparse.Namespace) -> Path:
+    return socket_path(cache_root(platform, args), args.sdk, args.target)
+
+
+def search_scopes(platform: Platform, args: argparse.Namespace) -> list[SearchScope]:
+    """Resolve every platform a query searches, `platform` itself first unless --platform says otherwise.
+
+    --sdk, --sdk-path, and --target describe `platform`; any other platform resolves its own
+    SDK through xcrun and uses its own target, default modules, and cache root.
+    """
+    scopes: list[SearchScope] = []
+    for name in ordered_unique(args.platforms or [platform.name]):
+        other = PLATFORMS[name]
+        if other == platform:
+            sdk_name = args.sdk
+            sdk = Path(args.sdk_path) if args.sdk_path else sdk_path(args.sdk)
+            target = args.target
+        else:
+            sdk_name = other.sdk
+            sdk = sdk_path(other.sdk)
+            target = other.target
+        modules = args.modules or list(other.modules)
+        scopes.append(SearchScope(other, sdk_name, sdk, target, cache_root(other, args), modules))
+    return scopes
+
+
+def report_command_failure(exc: subprocess.CalledProcessError) -> int:
+    if exc.stdout:
+        print(exc.stdout, file=sys.stderr)
+    if exc.stderr:
+        print(exc.stderr, file=sys.stderr)
+    print(f"command failed: {' '.join(exc.cmd)}", file=sys.stderr)
+    return exc.returncode
+
+
+def prepare_scopes(scopes: list[SearchScope], force: bool) -> None:
+    for scope in scopes:
+        open_inventory(scope.sdk, scope.root)
+        ensure_cache(scope.root, scope.sdk_name, scope.sdk, scope.target, scope.modules, force)
+
+
+def warm_caches(platform: Platform, args: argparse.Namespace) -> None:
+    """Load the daemon's modules up front so the first client query is already warm."""
+    scopes = search_scopes(platform, args)
+    prepare_scopes(scopes, args.force)
+    for scope in scopes:
+        load_symbols(scope.root, scope.sdk, scope.target, scope.modules)
+        for module in scope.modules:
+            for source in module_source_files(scope.sdk, module):
+                load_source(source)
+
+
+def handle_daemon_request(platform: Platform, message: dict[str, Any]) -> dict[str, Any]:
+    args = argparse.Namespace(**message["args"])
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+    with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+        try:
+            code = run_search(platform, args)
+        except subprocess.CalledProcessError as exc:
+            code = report_command_failure(exc)
+        except Exception:
+            traceback.print_exc()
+            code = 1
+    return {"exitCode": code, "stdout": stdout.getvalue(), "stderr": stderr.getvalue()}
+
+
+def search(platform: Platform, args: argparse.Namespace, scopes: list[SearchScope]) -> tuple[dict[str, Any], int]:
+    """Rank one query over every scope's cached modules in one pass; returns the JSON payload and the raw match count."""
+    introduced_filter = args.introduced
+    if getattr(args, platform.latest_flag):
+        introduced_filter = (platform.domain, platform.major)
+
+    phrase = " ".join(args.query)
+    terms = [term.lower() for term in args.query]
+    results: list[tuple[int, SymbolRecord]] = []
+    # Loaded records are shared by every query on an index, so a record's identity tells which scope it came from.
+    symbol_scopes: dict[int, SearchScope] = {}
+    for scope in scopes:
+        for symbol in load_symbols(scope.root, scope.sdk, scope.target, scope.modules, terms):
+            if not symbol_passes_filters(symbol, args.kind, introduced_filter):
+                continue
+            score = score_symbol(symbol, terms, phrase)
+            if score > 0:
+                results.append((score, symbol))
+                symbol_scopes[id(symbol)] = scope
+    fuzzy = False
+    if not results and not args.no_fuzzy:
+        for scope in scopes:
+            for score, symbol in fuzzy_results(args, scope, introduced_filter):
+                results.append((score, symbol))
+                symbol_scopes[id(symbol)] = scope
+        # Only when the fuzzy tier found something, so the flag means "these results are fuzzy".
+        fuzzy = bool(results)
+
+    selected = select_results(results, args.limit, dedupe=not args.no_dedupe)
+
+    compact = [
+        compact_result(
+            symbol,
+            score,
+            -1 if args.no_doc else args.doc_chars,
+            symbol_scopes[id(symbol)],
+            verify_sources=args.verify_interfaces,
+            source_limit=args.source_limit,
+            source_context_lines=args.source_context_lines,
+        )
+        for score, symbol in selected
+    ]
+    if args.no_doc:
+        for item in compact:
+            item["doc"] = ""
+
+    source_only_matches: list[dict[str, Any]] = []
+    source_only_diagnostics: dict[str, Any] | None = None
+    if args.verify_interfaces:
+        for scope in scopes:
+            source_only_matches.extend(
+                find_query_source_matches(
+                    args.query,
+                    scope.sdk,
+                    scope.modules,
+                    limit=args.source_limit,
+                    context_lines=args.source_context_lines,
+                )
+            )
+        source_only_diagnostics = source_diagnostics(source_only_matches, scopes[0].platform.domain)
+
+    payload = {
+        "sdk": str(scopes[0].sdk),
+        "target": scopes[0].target,
+        "modules": scopes[0].modules,
+        "platforms": [
+            {"platform": scope.platform.domain, "sdk": str(scope.sdk), "target": scope.target, "modules": scope.modules}
+            for scope in scopes
+        ],
+        "fuzzy": fuzzy,
+        "results": compact,
+        "sourceOnlyMatches": source_only_matches,
+        "sourceOnlyDiagnostics": source_only_diagnostics,
+    }
+    return payload, len(results)
+
+
+def run_search(platform: Platform, args: argparse.Namespace) -> int:
+    scopes = search_scopes(platform, args)
+    sdk = scopes[0].sdk
+    for scope in scopes:
+        open_inventory(scope.sdk, scope.root)
+
+    if args.list_modules or args.module_patterns:
+        module_matches = matching_modules(sdk, args.module_patterns or [])
+        if args.json:
+            print(
+                json.dumps(
+                    {
+                        "sdk": str(sdk),
+                        "target": scopes[0].target,
+                        "moduleMatches": module_matches,
+                    },
+                    indent=2,
+                )
+            )
+            return 0
+        print(f"sdk: {sdk.name}")
+        print(f"target: {scopes[0].target}")
+        print(f"module matches: {len(module_matches)}")
+        for module in module_matches:
+            print(module)
+        return 0
+
+    prepare_scopes(scopes, args.force)
+    payload, raw_matches = search(platform, args, scopes)
+    compact = payload["results"]
+    source_only_matches = payload["sourceOnlyMatches"]
+    source_only_diagnostics = payload["sourceOnlyDiagnostics"]
+
+    if args.json:
+        print(json.dumps(payload, indent=2))
+        return 0
+
+    mixed = len(scopes) > 1
+    for scope in scopes:
+        prefix = f"{scope.platform.domain} " if mixed else ""
+        print(f"{prefix}sdk: {scope.sdk.name}")
+        print(f"{prefix}target: {scope.target}")
+        print(f"{prefix}modules: {', '.join(scope.modules)}")
+    print(f"matches: {raw_matches} raw, {len(compact)} shown")
+    if payload["fuzzy"] and compact:
+        print("fuzzy: no exact symbol graph matches; showing similar names")
+    if not compact:
+        print("negative finding: no symbol graph matches for this query in the selected modules")
+    if args.verify_interfaces and source_only_diagnostics:
+        print(
+            "source-only diagnostics: "
+            f"found={source_only_diagnostics.get('found')} "
+            f"kinds={','.join(source_only_diagnostics.get('sourceKinds') or []) or '-'} "
+            f"platformUnavailable={source_only_diagnostics.get('platformUnavailable')} "
+            f"deprecated={source_only_diagnostics.get('deprecated')}"
+        )
+        for note in source_only_diagnostics.get("notes") or []:
+            print(f"source-only note: {note}")
+        for match in source_only_matches:
+            print(f"source-only: {match['sourceKind']} {match['path']}:{match['line']}: {match['text']}")
+    for index, item in enumerate(compact, start=1):
+        print()
+        prefix = f"{item['platform']} " if mixed else ""
+        print(f"[{index}] {prefix}{item['module']} {item['kind']} {item['title']}  score={item['score']}")
+        print(f"path: {item['path']}")
+        if item["availability"]:
+            print(f"availability: {item['availability']}")
+        if item["declaration"]:
+            print(f"declaration: {item['declaration']}")
+        if item["doc"]:
+            print(f"doc: {item['doc']}")
+        if args.verify_interfaces:
+            diagnostics = item.get("sourceDiagnostics") or {}
+            notes = diagnostics.get("notes") or []
+            print(
+                "source diagnostics: "
+                f"found={diagnostics.get('found')} "
+                f"kinds={','.join(diagnostics.get('sourceKinds') or []) or '-'} "
+                f"platformUnavailable={diagnostics.get('platformUnavailable')} "
+                f"deprecated={diagnostics.get('deprecated')}"
+            )
+            for note in notes:
+                print(f"source note: {note}")
+            for match in item.get("sourceMatches") or []:
+                print(f"source: {match['sourceKind']} {match['path']}:{match['line']}: {match['text']}")
+    return 0
+
+
+def run_batch(platform: Platform, args: argparse.Namespace) -> int:
+    """Answer every query spec in args.batch, reusing the loaded indexes and sources between queries.
+
+    Each line of output is the --json payload of one query plus its `id` (the spec's `id`,
+    or its line number) and `rawMatches`. Invalid specs and queries that fail (a missing
+    SDK, a failed cache build) produce an `error` line instead, and later specs still run.
+    """
+    failures = 0
+    with contextlib.ExitStack() as stack:
+        handle = sys.stdin if args.batch == "-" else stack.enter_context(open(args.batch))
+        for line_number, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            spec: Any = None
+            try:
+                spec = json.loads(line)
+                query_args = batch_query_args(platform, args, spec)
+            except (ValueError, argparse.ArgumentTypeError) as exc:
+                failures += 1
+                query_id = spec.get("id", line_number) if isinstance(spec, dict) else line_number
+                print(json.dumps({"id": query_id, "error": str(exc)}), flush=True)
+                continue
+            query_id = spec.get("id", line_number)
+            try:
+                scopes = search_scopes(platform, query_args)
+                prepare_scopes(scopes, args.force)
+                # --force rebuilds the caches once, not once per query.
+                args.force = False
+                payload, raw_matches = search(platform, query_args, scopes)
+                line_payload = {"id": query_id, "query": query_args.query, "rawMatches": raw_matches}
+                print(json.dumps({**line_payload, **payload}), flush=True)
+            except subprocess.CalledProcessError as exc:
+                failures += 1
+                report_command_failure(exc)
+                print(json.dumps({"id": query_id, "error": f"command failed: {' '.join(exc.cmd)}"}), flush=True)
+            except Exception as exc:
+                failures += 1
+                print(json.dumps({"id": query_id, "error": f"{exc.__class__.__name__}: {exc}"}), flush=True)
+    return 1 if failures else 0
+
+
+def main(platform: Platform, argv: list[str] | None = None) -> int:
+    args = parse_args(platform, argv)
+    if args.batch:
+        return run_batch(platform, args)
+    if args.serve:
+        warm_caches(platform, args)
+        return serve(
+            daemon_socket(platform, args),
+            functools.partial(handle_daemon_request, platform),
+            idle_timeout=args.idle_timeout,
+        )
+    if not args.no_daemon:
+        reply = daemon_request(daemon_socket(platform, args), {"args": vars(args)})
+        if reply is not None:
+            sys.stdout.write(reply.get("stdout", ""))
+            sys.stderr.write(reply.get("stderr", ""))
+            return int(reply.get("exitCode", 1))
+    return run_search(platform, args)
@@ -0,0 +1,590 @@
+#!/usr/bin/env python3
+"""Compact on-disk index of cached symbol graphs, one SQLite file per module."""
+
+from __future__ import annotations
+
+import functools
+import heapq
+import json
+import os
+import re
+import sqlite3
+import tempfile
+import zlib
+from array import array
+from collections import Counter
+from itertools import accumulate
+from json.decoder import scanstring
+from pathlib import Path
+from sys import intern
+from typing import IO, Any, Iterable, Iterator
+
+
+INDEX_NAME = "index.sqlite"
+INDEX_FORMAT = "3"
+# Columns with trigram postings, in field-id order. These are the haystacks score_symbol() reads.
+POSTING_FIELDS = ("title", "path", "declaration", "doc")
+GRAM = 3
+SQLITE_MAX_PARAMS = 900
+TITLE_FIELD = POSTING_FIELDS.index("title")
+READ_CHUNK = 1 << 20
+
+WHITESPACE_RE = re.compile(r"[ \t\n\r]*")
+STRUCTURE_RE = re.compile(r'[\[\]{}"]')
+DECODER = json.JSONDecoder()
+NUMBER_TAIL = frozenset("0123456789.eE+-") | {""}
+
+
+class SymbolRecord:
+    """One projected symbol: only the fields that scoring, filters, and results read."""
+
+    __slots__ = (
+        "graph_module",
+        "root_module",
+        "kind",
+        "title",
+        "path",
+        "path_tail",
+        "declaration",
+        "doc",
+        "availability",
+        "introduced",
+        "identifier",
+    )
+
+    def __init__(
+        self,
+        graph_module: str = "",
+        root_module: str = "",
+        kind: str = "",
+        title: str = "",
+        path: str = "",
+        path_tail: str = "",
+        declaration: str = "",
+        doc: str = "",
+        availability: str = "",
+        introduced: str = "",
+        identifier: str | None = None,
+    ) -> None:
+        self.graph_module = graph_module
+        self.root_module = root_module
+        self.kind = kind
+        self.title = title
+        self.path = path
+        self.path_tail = path_tail
+        self.declaration = declaration
+        self.doc = doc
+        self.availability = availability
+        # JSON [[lowercased domain, introduced major or null], ...] in availability order; see introduced_versions().
+        self.introduced = introduced
+        self.identifier = identifier
+
+
+def text_from_fragments(fragments: list[dict[str, Any]] | None) -> str:
+    if not fragments:
+        return ""
+    return "".join(str(f.get("spelling", "")) for f in fragments)
+
+
+def doc_text(symbol: dict[str, Any]) -> str:
+    doc = symbol.get("docComment") or {}
+    lines = doc.get("lines") or []
+    return re.sub(r"\s+", " ", " ".join(str(line.get("text", "")) for line in lines)).strip()
+
+
+def version_text(version: dict[str, Any]) -> str:
+    pieces = [str(version.get("major", 0))]
+    if "minor" in version:
+        pieces.append(str(version.get("minor", 0)))
+    if "patch" in version:
+        pieces.append(str(version.get("patch", 0)))
+    return ".".join(pieces)
+
+
+def availability_text(items: list[dict[str, Any]] | None) -> str:
+    if not items:
+        return ""
+    parts: list[str] = []
+    for item in items:
+        domain = item.get("domain")
+        if not domain:
+            continue
+        if item.get("isUnconditionallyUnavailable"):
+            parts.append(f"{domain} unavailable")
+            continue
+        introduced = item.get("introduced")
+        deprecated = item.get("deprecated")
+        renamed = item.get("renamed")
+        value = domain
+        if introduced:
+            value += " " + version_text(introduced)
+        if deprecated:
+            value += " deprecated " + version_text(deprecated)
+        if renamed:
+            value += f" renamed {renamed}"
+        parts.append(value)
+    return ", ".join(parts)
+
+
+def introduced_text(items: list[dict[str, Any]] | None) -> str:
+    if not items:
+        return ""
+    versions: list[list[Any]] = []
+    for item in items:
+        introduced = item.get("introduced")
+        major = int(introduced.get("major", -1)) if introduced else None
+        versions.append([str(item.get("domain", "")).lower(), major])
+    return json.dumps(versions, separators=(",", ":"))
+
+
+@functools.lru_cache(maxsize=1024)
+def introduced_versions(text: str) -> tuple[tuple[str, int | None], ...]:
+    """Decode SymbolRecord.introduced. Most symbols share a handful of values, so this is cached."""
+    if not text:
+        return ()
+    return tuple((domain, major) for domain, major in json.loads(text))
+
+
+def graph_files(out_dir: Path) -> list[Path]:
+    return sorted(out_dir.glob("*.symbols.json"))
+
+
+def read_manifest(out_dir: Path) -> dict[str, Any]:
+    try:
+        return json.loads((out_dir / "manifest.json").read_text())
+    except (OSError, json.JSONDecodeError):
+        return {}
+
+
+def graph_signature(out_dir: Path) -> list[list[Any]]:
+    """Return the manifest's graph files with their mtimes and sizes.
+
+    The index is valid only for this exact signature, so a re-extracted graph or
+    a changed `files` list in the manifest forces a rebuild.
+    """
+    names = read_manifest(out_dir).get("files") or [graph.name for graph in graph_files(out_dir)]
+    signature: list[list[Any]] = []
+    for name in sorted(names):
+        try:
+            stat = (out_dir / name).stat()
+        except OSError:
+            signature.append([name, None, None])
+            continue
+        signature.append([name, stat.st_mtime_ns, stat.st_size])
+    return signature
+
+
+def index_path(out_dir: Path) -> Path:
+    return out_dir / INDEX_NAME
+
+
+def read_meta(connection: sqlite3.Connection) -> dict[str, str]:
+    return dict(connection.execute("SELECT key, value FROM meta"))
+
+
+def index_is_current(out_dir: Path) -> bool:
+    path = index_path(out_dir)
+    if not path.exists():
+        return False
+    try:
+        with sqlite3.connect(path) as connection:
+            meta = read_meta(connection)
+    except sqlite3.Error:
+        return False
+    return meta.get("format") == INDEX_FORMAT and meta.get("signature") == json.dumps(graph_signature(out_dir))
+
+
+def symbol_row(symbol: dict[str, Any], graph_module: str) -> tuple[Any, ...]:
+    names = symbol.get("names") or {}
+    kind = symbol.get("kind") or {}
+    path_parts = [str(part) for part in symbol.get("pathComponents") or []]
+    availability = symbol.get("availability") or []
+    return (
+        graph_module,
+        str(kind.get("displayName") or kind.get("identifier") or ""),
+        str(names.get("title") or ""),
+        ".".join(path_parts),
+        path_parts[-1] if path_parts else "",
+        text_from_fragments(symbol.get("declarationFragments")),
+        doc_text(symbol),
+        availability_text(availability),
+        introduced_text(availability),
+        (symbol.get("identifier") or {}).get("precise"),
+    )
+
+
+class _JSONStream:
+    """Incremental reader over a JSON text that decodes or skips one value at a time."""
+
+    def __init__(self, handle: IO[str]) -> None:
+        self.handle = handle
+        self.buffer = ""
+        self.pos = 0
+
+    def fill(self) -> bool:
+        chunk = self.handle.read(READ_CHUNK)
+        if not chunk:
+            return False
+        self.buffer = self.buffer[self.pos :] + chunk
+        self.pos = 0
+        return True
+
+    def error(self, message: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(message, self.buffer, self.pos)
+
+    def peek(self) -> str:
+        while True:
+            self.pos = WHITESPACE_RE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer) or not self.fill():
+                return self.buffer[self.pos : self.pos + 1]
+
+    def take(self, expected: str) -> str:
+        char = self.peek()
+        if not char or char not in expected:
+            raise self.error(f"expected one of {expected!r}")
+        self.pos += 1
+        return char
+
+    def decode(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                if not self.fill():
+                    raise
+                continue
+            # A bare number may have been cut at the buffer end ("-2" of "-2.5e10"); read on until it is complete.
+            if (
+                not isinstance(value, (dict, list, str))
+                and self.buffer[end : end + 1] in NUMBER_TAIL
+                and self.fill()
+            ):
+                continue
+            self.pos = end
+            return value
+
+    def skip(self) -> None:
+        if self.peek() not in ("{", "["):
+            self.decode()
+            return
+        depth = 0
+        while True:
+            match = STRUCTURE_RE.search(self.buffer, self.pos)
+            if match is None:
+                self.pos = len(self.buffer)
+                if not self.fill():
+                    raise self.error("unterminated value")
+                continue
+            if match.group() == '"':
+                try:
+                    _, self.pos = scanstring(self.buffer, match.end())
+                except json.JSONDecodeError:
+                    self.pos = match.start()
+                    if not self.fill():
+                        raise
+                continue
+            self.pos = match.end()
+            depth += 1 if match.group() in "[{" else -1
+            if depth == 0:
+                return
+
+
+def iter_graph_symbols(graph: Path) -> Iterator[dict[str, Any]]:
+    """Yield the entries of a symbol graph's top-level `symbols` array one at a time.
+
+    Other top-level members, including `relationships`, are skipped without being
+    decoded, so peak memory is one read chunk plus the symbol being yielded.
+    """
+    with graph.open(encoding="utf-8", errors="replace") as handle:
+        stream = _JSONStream(handle)
+        stream.take("{")
+        if stream.peek() == "}":
+            return
+        while True:
+            key = stream.decode()
+            stream.take(":")
+            if key != "symbols":
+                stream.skip()
+            elif stream.peek() != "[":
+                yield from stream.decode() or []
+            else:
+                stream.take("[")
+                if stream.peek() == "]":
+                    stream.take("]")
+                else:
+                    while True:
+                        yield stream.decode()
+                        if stream.take(",]") == "]":
+                            break
+            if stream.take(",}") == "}":
+                return
+
+
+def trigrams(text: str) -> set[str]:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def pack_ids(ids: Iterable[int]) -> bytes:
+    deltas = array("I", (current - previous for previous, current in zip([0, *ids], ids)))
+    return zlib.compress(deltas.tobytes())
+
+
+def unpack_ids(blob: bytes) -> list[int]:
+    deltas = array("I")
+    deltas.frombytes(zlib.decompress(blob))
+    return list(accumulate(deltas))
+
+
+SCHEMA = """
+CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE symbols (
+    id INTEGER PRIMARY KEY,
+    graph_module TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    title TEXT NOT NULL,
+    path TEXT NOT NULL,
+    path_tail TEXT NOT NULL,
+    declaration TEXT NOT NULL,
+    doc TEXT NOT NULL,
+    availability TEXT NOT NULL,
+    introduced TEXT NOT NULL,
+    identifier TEXT
+);
+CREATE TABLE postings (
+    gram TEXT NOT NULL,
+    field INTEGER NOT NULL,
+    ids BLOB NOT NULL,
+    PRIMARY KEY (gram, field)
+) WITHOUT ROWID;
+"""
+
+INSERT_SYMBOL = (
+    "INSERT INTO symbols (id, graph_module, kind, title, path, path_tail, declaration, doc,"
+    " availability, introduced, identifier) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+# Positions of the POSTING_FIELDS within an INSERT_SYMBOL row.
+POSTING_COLUMNS = (3, 4, 6, 7)
+
+
+def build_index(out_dir: Path, module: str) -> Path:
+    """Project every cached graph of `module` into a fresh index, replacing it atomically.
+
+    Alongside the symbol rows, each lowercased posting field gets trigram postings so a
+    query term only has to be checked against symbols that contain all of its trigrams.
+    """
+    signature = graph_signature(out_dir)
+    manifest = read_manifest(out_dir)
+    handle, tmp_name = tempfile.mkstemp(prefix=".index-", suffix=".sqlite", dir=out_dir)
+    os.close(handle)
+    tmp_path = Path(tmp_name)
+    postings: dict[tuple[str, int], array[int]] = {}
+    next_id = 1
+    try:
+        connection = sqlite3.connect(tmp_path)
+        try:
+            connection.executescript(SCHEMA)
+            for name, _, _ in signature:
+                graph = out_dir / name
+                graph_module = name.split(".symbols.json", 1)[0]
+                # Graphs are streamed, but a malformed one is still skipped as a whole.
+                try:
+                    rows = [
+                        (symbol_id, *symbol_row(symbol, graph_module))
+                        for symbol_id, symbol in enumerate(iter_graph_symbols(graph), start=next_id)
+                    ]
+                except (OSError, ValueError):
+                    continue
+                for row in rows:
+                    for field, column in enumerate(POSTING_COLUMNS):
+                        for gram in trigrams(row[column].lower()):
+                            ids = postings.get((gram, field))
+                            if ids is None:
+                                ids = postings[(gram, field)] = array("I")
+                            ids.append(row[0])
+                next_id += len(rows)
+                connection.executemany(INSERT_SYMBOL, rows)
+            connection.executemany(
+                "INSERT INTO postings (gram, field, ids) VALUES (?, ?, ?)",
+                ((gram, field, pack_ids(ids)) for (gram, field), ids in postings.items()),
+            )
+            connection.executemany(
+                "INSERT INTO meta (key, value) VALUES (?, ?)",
+                [
+                    ("format", INDEX_FORMAT),
+                    ("module", module),
+                    ("sdk_path", str(manifest.get("sdk_path") or "")),
+                    ("target", str(manifest.get("target") or "")),
+                    ("signature", json.dumps(signature)),
+                ],
+            )
+            connection.commit()
+        finally:
+            connection.close()
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, index_path(out_dir))
+    except BaseException:
+        tmp_path.unlink(missing_ok=True)
+        raise
+    return index_path(out_dir)
+
+
+def ensure_index(out_dir: Path, module: str) -> Path:
+    if index_is_current(out_dir):
+        return index_path(out_dir)
+    return build_index(out_dir, module)
+
+
+def candidate_ids(connection: sqlite3.Connection, terms: list[str]) -> list[int] | None:
+    """Return ids of symbols with some posting field that may contain one of `terms`.
+
+    Every symbol that score_symbol() can give a positive score has at least one term in
+    one of its haystacks, so the union of the per-term candidates is a superset of the
+    ranked results. Returns None when a term is shorter than a trigram and cannot narrow.
+    """
+    if not terms or any(len(term) < GRAM for term in terms):
+        return None
+    found: set[int] = set()
+    for term in ordered_terms(terms):
+        grams = sorted(trigrams(term))
+        blobs: dict[int, list[bytes]] = {}
+        for gram, field, blob in connection.execute(
+            f"SELECT gram, field, ids FROM postings WHERE gram IN ({', '.join('?' for _ in grams)})",
+            grams,
+        ):
+            blobs.setdefault(field, []).append(blob)
+        for field_blobs in blobs.values():
+            if len(field_blobs) < len(grams):
+                continue
+            field_blobs.sort(key=len)
+            ids = set(unpack_ids(field_blobs[0]))
+            for blob in field_blobs[1:]:
+                if not ids:
+                    break
+                ids.intersection_update(unpack_ids(blob))
+            found.update(ids)
+    return sorted(found)
+
+
+def similar_ids(connection: sqlite3.Connection, text: str, limit: int) -> list[int]:
+    """Return ids of up to `limit` symbols sharing the most title trigrams with `text`.
+
+    A symbol must share at least half of the trigrams, which every title within a few
+    edits of `text` does. The cost is bounded by the number of trigrams in `text`.
+    """
+    grams = sorted(trigrams(text))[:SQLITE_MAX_PARAMS]
+    if not grams or limit <= 0:
+        return []
+    shared: Counter[int] = Counter()
+    for (blob,) in connection.execute(
+        f"SELECT ids FROM postings WHERE field = ? AND gram IN ({', '.join('?' for _ in grams)})",
+        [TITLE_FIELD, *grams],
+    ):
+        shared.update(unpack_ids(blob))
+    needed = (len(grams) + 1) // 2
+    best = heapq.nlargest(limit, (item for item in shared.items() if item[1] >= needed), key=lambda item: item[1])
+    return sorted(symbol_id for symbol_id, _ in best)
+
+
+def ordered_terms(terms: Iterable[str]) -> list[str]:
+    return list(dict.fromkeys(terms))
+
+
+SELECT_SYMBOLS = (
+    "SELECT graph_module, kind, title, path, path_tail, declaration, doc, availability,"
+    " introduced, identifier FROM symbols"
+)
+
+
+def select_rows(connection: sqlite3.Connection, ids: list[int] | None) -> list[tuple[Any, ...]]:
+    if ids is None:
+        return connection.execute(SELECT_SYMBOLS + " ORDER BY id").fetchall()
+    rows: list[tuple[Any, ...]] = []
+    for start in range(0, len(ids), SQLITE_MAX_PARAMS):
+        chunk = ids[start : start + SQLITE_MAX_PARAMS]
+        rows.extend(
+            connection.execute(
+                SELECT_SYMBOLS + f" WHERE id IN ({', '.join('?' for _ in chunk)}) ORDER BY id",
+                chunk,
+            )
+        )
+    return rows
+
+
+# Connections and full symbol lists stay open for the life of the process, so a
+# long-running search daemon only reopens an index after its signature changes.
+_open_indexes: dict[Path, dict[str, Any]] = {}
+
+
+def open_index(out_dir: Path, module: str) -> dict[str, Any]:
+    signature = json.dumps(graph_signature(out_dir))
+    cached = _open_indexes.get(out_dir)
+    if cached and cached["signature"] == signature:
+        return cached
+    if cached:
+        cached["connection"].close()
+    opened = {
+        "signature": signature,
+        "connection": sqlite3.connect(ensure_index(out_dir, module), check_same_thread=False),
+        "symbols": None,
+    }
+    _open_indexes[out_dir] = opened
+    return opened
+
+
+def load_index(out_dir: Path, module: str, terms: list[str] | None = None) -> list[SymbolRecord]:
+    """Load the projected symbols of one module cache, rebuilding a stale index first.
+
+    With lowercased `terms`, only symbols retrieved through the trigram postings are loaded.
+    """
+    if not graph_files(out_dir):
+        return []
+    opened = open_index(out_dir, module)
+    ids = candidate_ids(opened["connection"], terms) if terms else None
+    return index_records(opened, module, ids)
+
+
+def load_similar(out_dir: Path, module: str, text: str, limit: int) -> list[SymbolRecord]:
+    """Load up to `limit` symbols whose titles look like `text`; see similar_ids()."""
+    if not graph_files(out_dir):
+        return []
+    opened = open_index(out_dir, module)
+    return index_records(opened, module, similar_ids(opened["connection"], text, limit))
+
+
+def index_records(opened: dict[str, Any], module: str, ids: list[int] | None) -> list[SymbolRecord]:
+    """Return the records for `ids` in id order, or every record (kept for reuse) when `ids` is None."""
+    if opened["symbols"] is not None:
+        # Row ids are assigned 1..n in load order, so a warm list can be indexed directly.
+        return opened["symbols"] if ids is None else [opened["symbols"][i - 1] for i in ids]
+    # Interning the low-cardinality columns shares one string per distinct value across records.
+    symbols = [
+        SymbolRecord(
+            intern(graph_module),
+            module,
+            intern(kind),
+            title,
+            path_text,
+            path_tail,
+            declaration,
+            doc,
+            intern(availability),
+            intern(introduced),
+            identifier,
+        )
+        for (
+            graph_module,
+            kind,
+            title,
+            path_text,
+            path_tail,
+            declaration,
+            doc,
+            availability,
+            introduced,
+            identifier,
+        ) in select_rows(opened["connection"], ids)
+    ]
+    if ids is None:
+        opened["symbols"] = symbols
+    return symbols
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""Peak-RSS benchmark for symbol graph indexing and search on synthetic SwiftUI-sized graphs.
+
+Each phase runs in its own child process and reports that child's maximum resident set size:
+
+    python3 tests/benchmark_memory.py --symbols 60000
+
+`graph-json` is the cost of decoding the graphs with json.loads, which is what searches
+paid before the index existed; it is the reference the other phases are compared with.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from synthetic_sdk import SDK_NAME, TARGET, introduced, make_sdk, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS = SKILL_DIR / "scripts"
+MODULES = ("SwiftUI", "SwiftUICore")
+WORDS = (
+    "view glass effect button style navigation stack toolbar spacer label text image shape "
+    "transition scroll list grid sheet menu picker gesture animation layout container"
+).split()
+
+PHASES = {
+    "graph-json": """
+import json, sys
+from pathlib import Path
+graphs = [json.loads(path.read_text()) for path in Path(sys.argv[1]).rglob("*.symbols.json")]
+print(sum(len(graph["symbols"]) for graph in graphs))
+""",
+    "index-build": """
+import sys
+from pathlib import Path
+from symbol_index import build_index
+for module in sys.argv[2:]:
+    build_index(next(Path(sys.argv[1]).rglob(module)), module)
+""",
+    "search-broad": "search view",
+    "search-selective": "search glass effect",
+}
+
+
+def fixture_symbol(rng: random.Random, index: int) -> dict:
+    words = rng.sample(WORDS, 3)
+    title = "".join(word.title() for word in words) + str(index)
+    symbol = make_symbol(
+        title,
+        path=[rng.choice(("View", "Scene", "Shape")), title],
+        kind=rng.choice(("Structure", "Instance Method", "Instance Property", "Enumeration Case")),
+        declaration=f"func {title}(_ {words[0]}: some {words[1].title()}, in {words[2]}: CGFloat = 0) -> some View",
+        doc=" ".join(rng.choices(WORDS, k=40)),
+        availability=[introduced("iOS", rng.choice((13, 17, 26))), introduced("visionOS", 2)],
+    )
+    # Real graphs carry token-level fragments, signatures, and locations that the index drops.
+    symbol["declarationFragments"] = [
+        {"kind": "keyword", "spelling": "func"},
+        {"kind": "text", "spelling": " "},
+        {"kind": "identifier", "spelling": title},
+        {"kind": "text", "spelling": f"(_ {words[0]}: some {words[1].title()}, in {words[2]}: CGFloat = 0) -> some View"},
+    ]
+    symbol["functionSignature"] = {"parameters": [{"name": word, "declarationFragments": []} for word in words]}
+    symbol["location"] = {"uri": f"file:///SwiftUI/{title}.swift", "position": {"line": index, "character": 4}}
+    symbol["accessLevel"] = "public"
+    return symbol
+
+
+def write_fixture(root: Path, symbols: int) -> tuple[Path, Path]:
+    rng = random.Random(26)
+    sdk = make_sdk(root)
+    cache_root = root / "cache"
+    per_module = symbols // len(MODULES)
+    for module in MODULES:
+        generated = [fixture_symbol(rng, i) for i in range(per_module)]
+        out_dir = write_module_cache(cache_root, sdk, module, {module: generated})
+        graph = out_dir / f"{module}.symbols.json"
+        data = json.loads(graph.read_text())
+        data["relationships"] = [
+            {"kind": "memberOf", "source": symbol["identifier"]["precise"], "target": "s:7SwiftUI4ViewP"}
+            for symbol in generated
+        ]
+        graph.write_text(json.dumps(data))
+    return sdk, cache_root
+
+
+def generate(root: Path, symbols: int) -> tuple[Path, Path]:
+    """Write the fixture from a child process.
+
+    Linux carries a process's peak RSS across fork and exec, so the parent stays small
+    to keep the fixture's memory out of every phase measurement.
+    """
+    subprocess.run([sys.executable, __file__, "--write-fixture", str(root), "--symbols", str(symbols)], check=True)
+    return root / SDK_NAME, root / "cache"
+
+
+def peak_rss(args: list[str]) -> tuple[int, float]:
+    """Run `args` and return its peak RSS in bytes and its wall time in seconds."""
+    started = time.perf_counter()
+    process = subprocess.Popen(args, stdout=subprocess.DEVNULL, env={**os.environ, "PYTHONPATH": str(SCRIPTS)})
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode:
+        raise subprocess.CalledProcessError(process.returncode, args)
+    # ru_maxrss is kilobytes on Linux and bytes on macOS.
+    return usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024), elapsed
+
+
+def phase_command(name: str, sdk: Path, cache_root: Path) -> list[str]:
+    code = PHASES[name]
+    if code.startswith("search "):
+        return [
+            sys.executable,
+            str(SCRIPTS / "search_symbols.py"),
+            *code.split()[1:],
+            "--sdk-path",
+            str(sdk),
+            "--cache-dir",
+            str(cache_root),
+            "--target",
+            TARGET,
+            "--no-daemon",
+            "--json",
+            *[arg for module in MODULES for arg in ("--module", module)],
+        ]
+    return [sys.executable, "-c", code, str(cache_root), *MODULES]
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=60000, help="Symbols across both modules, default: 60000.")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    parser.add_argument("--write-fixture", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    if args.write_fixture:
+        write_fixture(args.write_fixture, args.symbols)
+        return 0
+    with tempfile.TemporaryDirectory() as tmp:
+        sdk, cache_root = generate(Path(tmp), args.symbols)
+        graph_bytes = sum(path.stat().st_size for path in cache_root.rglob("*.symbols.json"))
+        report = {"symbols": args.symbols, "graphBytes": graph_bytes, "phases": {}}
+        for name in PHASES:
+            rss, seconds = peak_rss(phase_command(name, sdk, cache_root))
+            report["phases"][name] = {"peakRssBytes": rss, "seconds": round(seconds, 3)}
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    print(f"symbols={report['symbols']} graphs={graph_bytes / 2**20:.1f} MiB")
+    for name, phase in report["phases"].items():
+        print(f"{name:18} peak {phase['peakRssBytes'] / 2**20:8.1f} MiB  {phase['seconds']:7.2f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
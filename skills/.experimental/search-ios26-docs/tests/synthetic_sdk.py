@@ -0,0 +1,83 @@
+"""Synthetic SDK trees and symbol graph caches for tests that run without Xcode."""
+
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any
+
+
+SDK_NAME = "Synthetic26.0.sdk"
+TARGET = "arm64-apple-ios-simulator"
+
+
+def make_symbol(
+    title: str,
+    *,
+    path: list[str] | None = None,
+    kind: str = "Structure",
+    declaration: str | None = None,
+    doc: str = "",
+    availability: list[dict[str, Any]] | None = None,
+    precise: str | None = None,
+) -> dict[str, Any]:
+    symbol: dict[str, Any] = {
+        "kind": {"identifier": f"swift.{kind.lower().replace(' ', '.')}", "displayName": kind},
+        "identifier": {"precise": precise or f"s:7Fixture{title}", "interfaceLanguage": "swift"},
+        "names": {"title": title},
+        "pathComponents": path or [title],
+        "declarationFragments": [{"kind": "text", "spelling": declaration or f"struct {title}"}],
+    }
+    if doc:
+        symbol["docComment"] = {"lines": [{"text": line} for line in doc.split("\n")]}
+    if availability is not None:
+        symbol["availability"] = availability
+    return symbol
+
+
+def introduced(domain: str, major: int, minor: int = 0) -> dict[str, Any]:
+    return {"domain": domain, "introduced": {"major": major, "minor": minor}}
+
+
+def write_module_cache(
+    cache_root: Path,
+    sdk: Path,
+    module: str,
+    graphs: dict[str, list[dict[str, Any]]],
+    *,
+    target: str = TARGET,
+) -> Path:
+    """Write `graphs` ({graph module name: symbols}) the way build_cache.py lays them out."""
+    out_dir = cache_root / sdk.name / target / module
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for graph_module, symbols in graphs.items():
+        (out_dir / f"{graph_module}.symbols.json").write_text(
+            json.dumps({"module": {"name": graph_module}, "symbols": symbols, "relationships": []})
+        )
+    (out_dir / "manifest.json").write_text(
+        json.dumps(
+            {
+                "module": module,
+                "sdk_path": str(sdk),
+                "sdk_name": sdk.name,
+                "target": target,
+                "files": sorted(p.name for p in out_dir.glob("*.symbols.json")),
+            },
+            indent=2,
+            sort_keys=True,
+        )
+        + "\n"
+    )
+    return out_dir
+
+
+def make_sdk(root: Path, interfaces: dict[str, str] | None = None, *, target: str = TARGET) -> Path:
+    """Create an SDK directory with one framework per entry of `interfaces` ({module: swiftinterface text})."""
+    sdk = root / SDK_NAME
+    frameworks = sdk / "System" / "Library" / "Frameworks"
+    frameworks.mkdir(parents=True, exist_ok=True)
+    for module, text in (interfaces or {}).items():
+        swiftmodule = frameworks / f"{module}.framework" / "Modules" / f"{module}.swiftmodule"
+        swiftmodule.mkdir(parents=True, exist_ok=True)
+        (swiftmodule / f"{target}.swiftinterface").write_text(text)
+    return sdk
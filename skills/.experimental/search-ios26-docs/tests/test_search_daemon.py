@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""Checks for the --serve search daemon and its thin CLI client."""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import socket
+import stat
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from synthetic_sdk import TARGET, make_sdk, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SEARCH = SKILL_DIR / "scripts" / "search_symbols.py"
+PROBE = SKILL_DIR / "scripts" / "probe_symbol.py"
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+from search_daemon import make_private_dir, request, serve, socket_path  # noqa: E402
+
+
+class SearchDaemonTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.sdk = make_sdk(
+            self.root,
+            {"SwiftUI": "public struct ZoomNavigationTransition : SwiftUI.NavigationTransition {\n}\n"},
+        )
+        self.cache_root = self.root / "cache"
+        self.out_dir = write_module_cache(
+            self.cache_root,
+            self.sdk,
+            "SwiftUI",
+            {
+                "SwiftUI": [
+                    make_symbol("ZoomNavigationTransition", declaration="struct ZoomNavigationTransition"),
+                    make_symbol("NavigationStack"),
+                ]
+            },
+        )
+        self.socket = socket_path(self.cache_root, "iphonesimulator", TARGET)
+        self.daemon: subprocess.Popen[str] | None = None
+
+    def tearDown(self) -> None:
+        if self.daemon and self.daemon.poll() is None:
+            self.daemon.terminate()
+            self.daemon.communicate(timeout=10)
+
+    def common_args(self) -> list[str]:
+        return ["--sdk-path", str(self.sdk), "--cache-dir", str(self.cache_root), "--target", TARGET, "--module", "SwiftUI"]
+
+    def start_daemon(self, idle_timeout: float = 60) -> None:
+        self.daemon = subprocess.Popen(
+            [sys.executable, str(SEARCH), "--serve", "--idle-timeout", str(idle_timeout), *self.common_args()],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        deadline = time.monotonic() + 20
+        while not self.socket.exists():
+            if self.daemon.poll() is not None or time.monotonic() > deadline:
+                self.fail(f"daemon did not start: {self.daemon.communicate()[1]}")
+            time.sleep(0.05)
+
+    def stop_daemon(self) -> str:
+        assert self.daemon is not None
+        self.daemon.terminate()
+        return self.daemon.communicate(timeout=10)[1]
+
+    def run_script(self, script: Path, *args: str) -> dict:
+        result = subprocess.run(
+            [sys.executable, str(script), *args, *self.common_args(), "--json"],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        return json.loads(result.stdout)
+
+    def test_daemon_answers_with_in_process_output(self) -> None:
+        expected = self.run_script(SEARCH, "navigation", "--no-daemon")
+        self.start_daemon()
+
+        self.assertEqual(self.run_script(SEARCH, "navigation"), expected)
+        probe = self.run_script(PROBE, "ZoomNavigationTransition")
+        self.assertTrue(probe["results"][0]["sourceDiagnostics"]["found"])
+        self.assertEqual(self.stop_daemon().count("[served]"), 2)
+
+    def test_daemon_reloads_index_when_a_graph_is_rebuilt(self) -> None:
+        self.start_daemon()
+        self.assertEqual([r["title"] for r in self.run_script(SEARCH, "toolbar")["results"]], [])
+
+        graph = self.out_dir / "SwiftUI.symbols.json"
+        graph.write_text(json.dumps({"symbols": [make_symbol("ToolbarSpacer")]}))
+        stat = graph.stat()
+        os.utime(graph, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertEqual([r["title"] for r in self.run_script(SEARCH, "toolbar")["results"]], ["ToolbarSpacer"])
+        self.assertEqual(self.stop_daemon().count("[served]"), 2)
+
+    def test_daemon_exits_and_removes_socket_after_idle_timeout(self) -> None:
+        self.start_daemon(idle_timeout=0.5)
+        assert self.daemon is not None
+
+        self.assertEqual(self.daemon.wait(timeout=20), 0)
+        self.assertFalse(self.socket.exists())
+        self.assertIn("idle timeout", self.daemon.communicate()[1])
+
+    def test_daemon_socket_is_owner_only(self) -> None:
+        self.start_daemon()
+        self.assertEqual(stat.S_IMODE(self.socket.stat().st_mode), 0o600)
+
+    def test_client_gives_up_on_a_daemon_that_never_replies(self) -> None:
+        # A listener that is never accepted from: connect succeeds, no reply ever comes.
+        self.socket.parent.mkdir(parents=True, exist_ok=True)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+            listener.bind(str(self.socket))
+            listener.listen(1)
+            started = time.monotonic()
+
+            self.assertIsNone(request(self.socket, {"args": {}}, timeout=0.3))
+            self.assertLess(time.monotonic() - started, 5)
+
+    def test_client_ignores_a_socket_owned_by_another_user(self) -> None:
+        self.start_daemon()
+        query = {"args": {"query": "zoom"}}
+        self.assertIsNotNone(request(self.socket, query))
+
+        with mock.patch("os.getuid", return_value=os.getuid() + 1):
+            self.assertIsNone(request(self.socket, query))
+        self.assertEqual(self.stop_daemon().count("[served]"), 1)
+
+    def test_daemon_does_not_replace_a_socket_owned_by_another_user(self) -> None:
+        self.socket.parent.mkdir(parents=True, exist_ok=True)
+        self.socket.write_text("")
+
+        with mock.patch("os.getuid", return_value=os.getuid() + 1), mock.patch("sys.stderr", io.StringIO()) as stderr:
+            self.assertEqual(serve(self.socket, lambda message: {}, idle_timeout=0.1), 1)
+        self.assertIn("belongs to another user", stderr.getvalue())
+        self.assertTrue(self.socket.is_file())
+
+    def test_long_cache_paths_put_the_socket_in_a_per_user_directory(self) -> None:
+        long_root = self.root / ("c" * 120)
+        with mock.patch.dict(os.environ, {"XDG_RUNTIME_DIR": str(self.root / "run")}):
+            self.assertEqual(socket_path(long_root, "iphonesimulator", TARGET).parent, self.root / "run")
+        with mock.patch.dict(os.environ, {"TMPDIR": str(self.root)}):
+            os.environ.pop("XDG_RUNTIME_DIR", None)
+            with mock.patch("tempfile.tempdir", None):
+                path = socket_path(long_root, "iphonesimulator", TARGET)
+        self.assertEqual(path.parent, self.root / f"search-docs-{os.getuid()}")
+
+        make_private_dir(path.parent)
+        self.assertEqual(stat.S_IMODE(path.parent.stat().st_mode), 0o700)
+        path.parent.chmod(0o777)
+        with self.assertRaises(PermissionError):
+            make_private_dir(path.parent)
+
+    def test_client_falls_back_to_in_process_search_with_a_stale_socket(self) -> None:
+        self.socket.parent.mkdir(parents=True, exist_ok=True)
+        self.socket.write_text("")
+
+        data = self.run_script(SEARCH, "zoom")
+
+        self.assertEqual([r["title"] for r in data["results"]], ["ZoomNavigationTransition"])
+
+
+if __name__ == "__main__":
+    unittest.main()
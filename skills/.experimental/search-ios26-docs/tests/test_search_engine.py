@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Checks for the search engine shared with the sibling SDK skill and for mixed-platform queries."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from synthetic_sdk import introduced, make_sdk, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SEARCH = SKILL_DIR / "scripts" / "search_symbols.py"
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import search_engine  # noqa: E402
+from search_symbols import PLATFORM  # noqa: E402
+
+# Scripts vendored byte for byte into every skill that uses the engine.
+SHARED_SCRIPTS = ("search_engine.py", "symbol_index.py", "source_store.py", "sdk_inventory.py", "search_daemon.py")
+OTHER = next(platform for platform in search_engine.PLATFORMS.values() if platform != PLATFORM)
+
+
+class SharedEngineTests(unittest.TestCase):
+    def test_vendored_scripts_match_the_sibling_skill(self) -> None:
+        siblings = [SKILL_DIR.parent / platform.cache_name for platform in search_engine.PLATFORMS.values()]
+        siblings = [sibling for sibling in siblings if sibling != SKILL_DIR and sibling.exists()]
+        if not siblings:
+            self.skipTest("no sibling skill is installed next to this one")
+        for sibling in siblings:
+            for name in SHARED_SCRIPTS:
+                self.assertEqual(
+                    (SKILL_DIR / "scripts" / name).read_bytes(),
+                    (sibling / "scripts" / name).read_bytes(),
+                    f"scripts/{name} differs from {sibling.name}; make the change in both skills",
+                )
+
+    def test_skill_platform_is_registered(self) -> None:
+        self.assertIs(search_engine.PLATFORMS[PLATFORM.name], PLATFORM)
+        self.assertEqual(PLATFORM.cache_name, SKILL_DIR.name)
+
+
+class MixedPlatformTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        root = Path(self.tmp.name)
+        self.cache_root = root / "cache"
+        self.sdks = {}
+        symbols = {
+            PLATFORM.name: [
+                make_symbol("GlassButtonStyle", availability=[introduced(PLATFORM.domain, 26)]),
+                make_symbol("Button", declaration="struct Button<Label> where Label : View"),
+            ],
+            OTHER.name: [
+                make_symbol("glassEffect(_:in:)", path=["View", "glassEffect(_:in:)"], kind="Instance Method"),
+                make_symbol("GlassButtonStyle", availability=[introduced(OTHER.domain, 26)]),
+            ],
+        }
+        for platform in (PLATFORM, OTHER):
+            sdk = make_sdk(root / platform.name, {"SwiftUI": "public struct GlassButtonStyle {}\n"}, target=platform.target)
+            write_module_cache(self.cache_root, sdk, "SwiftUI", {"SwiftUI": symbols[platform.name]}, target=platform.target)
+            self.sdks[platform.sdk] = sdk
+        # A stand-in for `xcrun --sdk NAME --show-sdk-path`, so the other platform resolves without Xcode.
+        bin_dir = root / "bin"
+        bin_dir.mkdir()
+        xcrun = bin_dir / "xcrun"
+        cases = "".join(f'  {name}) echo "{sdk}" ;;\n' for name, sdk in self.sdks.items())
+        xcrun.write_text(f'#!/bin/sh\ncase "$2" in\n{cases}  *) exit 1 ;;\nesac\n')
+        xcrun.chmod(0o755)
+        self.env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+
+    def search(self, *args: str) -> dict:
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SEARCH),
+                *args,
+                "--cache-dir",
+                str(self.cache_root),
+                "--module",
+                "SwiftUI",
+                "--no-daemon",
+                "--json",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=self.env,
+        )
+        return json.loads(result.stdout)
+
+    def test_mixed_query_ranks_both_platforms_in_one_list(self) -> None:
+        data = self.search("glass", "--platform", PLATFORM.name, "--platform", OTHER.name, "--no-dedupe")
+
+        self.assertEqual([item["platform"] for item in data["platforms"]], [PLATFORM.domain, OTHER.domain])
+        self.assertEqual(data["target"], PLATFORM.target)
+        ranked = [(result["platform"], result["title"]) for result in data["results"]]
+        self.assertEqual(
+            ranked,
+            [
+                (PLATFORM.domain, "GlassButtonStyle"),
+                (OTHER.domain, "GlassButtonStyle"),
+                (OTHER.domain, "glassEffect(_:in:)"),
+            ],
+        )
+        scores = [result["score"] for result in data["results"]]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_latest_release_filter_uses_the_skill_platform(self) -> None:
+        data = self.search("glass", "--platform", PLATFORM.name, "--platform", OTHER.name, f"--{PLATFORM.latest_flag}")
+        self.assertEqual([(result["platform"], result["title"]) for result in data["results"]], [(PLATFORM.domain, "GlassButtonStyle")])
+
+    def test_each_platform_index_is_loaded_once_per_query(self) -> None:
+        args = search_engine.parse_args(
+            PLATFORM,
+            ["glass", "--platform", PLATFORM.name, "--platform", OTHER.name, "--cache-dir", str(self.cache_root), "--module", "SwiftUI"],
+        )
+        with mock.patch.dict(os.environ, {"PATH": self.env["PATH"]}):
+            search_engine.sdk_path.cache_clear()
+            self.addCleanup(search_engine.sdk_path.cache_clear)
+            scopes = search_engine.search_scopes(PLATFORM, args)
+        with mock.patch.object(search_engine, "load_index", wraps=search_engine.load_index) as load_index:
+            payload, raw_matches = search_engine.search(PLATFORM, args, scopes)
+
+        self.assertEqual([call.args[0] for call in load_index.call_args_list], [
+            self.cache_root / scope.sdk.name / scope.target / "SwiftUI" for scope in scopes
+        ])
+        self.assertEqual(raw_matches, 3)
+        self.assertEqual(len(payload["results"]), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
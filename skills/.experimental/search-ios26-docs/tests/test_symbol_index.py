@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+"""Checks for the on-disk symbol index against synthetic symbol graphs."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from synthetic_sdk import TARGET, introduced, make_sdk, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SEARCH = SKILL_DIR / "scripts" / "search_symbols.py"
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import search_engine  # noqa: E402
+import symbol_index  # noqa: E402
+
+
+class SymbolIndexTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.sdk = make_sdk(self.root)
+        self.cache_root = self.root / "cache"
+        self.out_dir = write_module_cache(
+            self.cache_root,
+            self.sdk,
+            "SwiftUI",
+            {
+                "SwiftUI": [
+                    make_symbol(
+                        "GlassButtonStyle",
+                        declaration="struct GlassButtonStyle",
+                        doc="A button style that applies glass.",
+                        availability=[introduced("iOS", 26)],
+                    ),
+                    make_symbol("Button", declaration="struct Button<Label> where Label : View"),
+                ],
+                "SwiftUI@SwiftUICore": [
+                    make_symbol(
+                        "glassEffect(_:in:)",
+                        path=["View", "glassEffect(_:in:)"],
+                        kind="Instance Method",
+                        declaration="func glassEffect(_ glass: Glass = .regular, in shape: some Shape) -> some View",
+                        availability=[introduced("iOS", 26)],
+                    ),
+                ],
+            },
+        )
+
+    def run_search(self, *args: str) -> dict:
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(SEARCH),
+                *args,
+                "--sdk-path",
+                str(self.sdk),
+                "--cache-dir",
+                str(self.cache_root),
+                "--target",
+                TARGET,
+                "--module",
+                "SwiftUI",
+                "--json",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        return json.loads(result.stdout)
+
+    def test_load_index_projects_symbol_fields_in_graph_order(self) -> None:
+        symbols = symbol_index.load_index(self.out_dir, "SwiftUI")
+
+        self.assertEqual([symbol.title for symbol in symbols], ["GlassButtonStyle", "Button", "glassEffect(_:in:)"])
+        method = symbols[2]
+        self.assertEqual(method.graph_module, "SwiftUI@SwiftUICore")
+        self.assertEqual(method.root_module, "SwiftUI")
+        self.assertEqual(method.kind, "Instance Method")
+        self.assertEqual(method.path, "View.glassEffect(_:in:)")
+        self.assertEqual(method.path_tail, "glassEffect(_:in:)")
+        self.assertEqual(method.availability, "iOS 26.0")
+        self.assertEqual(symbol_index.introduced_versions(method.introduced), (("ios", 26),))
+        self.assertEqual(symbols[0].doc, "A button style that applies glass.")
+        self.assertEqual(symbols[1].introduced, "")
+        self.assertTrue(symbol_index.index_is_current(self.out_dir))
+
+    def test_index_rebuilds_when_a_graph_changes(self) -> None:
+        symbol_index.load_index(self.out_dir, "SwiftUI")
+        graph = self.out_dir / "SwiftUI.symbols.json"
+        graph.write_text(json.dumps({"symbols": [make_symbol("ToolbarSpacer")]}))
+        stat = graph.stat()
+        os.utime(graph, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        self.assertFalse(symbol_index.index_is_current(self.out_dir))
+        titles = [symbol.title for symbol in symbol_index.load_index(self.out_dir, "SwiftUI")]
+        self.assertEqual(titles, ["ToolbarSpacer", "glassEffect(_:in:)"])
+
+    def test_index_rebuilds_when_manifest_files_change(self) -> None:
+        symbol_index.load_index(self.out_dir, "SwiftUI")
+        manifest_path = self.out_dir / "manifest.json"
+        manifest = json.loads(manifest_path.read_text())
+        manifest["files"] = ["SwiftUI.symbols.json"]
+        manifest_path.write_text(json.dumps(manifest))
+
+        self.assertFalse(symbol_index.index_is_current(self.out_dir))
+        titles = [symbol.title for symbol in symbol_index.load_index(self.out_dir, "SwiftUI")]
+        self.assertEqual(titles, ["GlassButtonStyle", "Button"])
+
+    def test_term_postings_load_only_symbols_containing_the_terms(self) -> None:
+        titles = [symbol.title for symbol in symbol_index.load_index(self.out_dir, "SwiftUI", ["glass"])]
+        self.assertEqual(titles, ["GlassButtonStyle", "glassEffect(_:in:)"])
+
+        titles = [symbol.title for symbol in symbol_index.load_index(self.out_dir, "SwiftUI", ["label", "applies"])]
+        self.assertEqual(titles, ["GlassButtonStyle", "Button"])
+
+        self.assertEqual(symbol_index.load_index(self.out_dir, "SwiftUI", ["toolbar"]), [])
+
+    def test_term_postings_intersect_within_each_field(self) -> None:
+        out_dir = write_module_cache(
+            self.cache_root,
+            self.sdk,
+            "Split",
+            {"Split": [make_symbol("Spacer", declaration="struct Acersp"), make_symbol("SpacerSizing")]},
+        )
+
+        # Every trigram of "spacers" occurs somewhere in the first symbol, but no single field
+        # holds the whole term, so only SpacerSizing could score.
+        titles = [symbol.title for symbol in symbol_index.load_index(out_dir, "Split", ["spacers"])]
+        self.assertEqual(titles, ["SpacerSizing"])
+
+    def test_short_terms_fall_back_to_a_full_scan(self) -> None:
+        symbols = symbol_index.load_index(self.out_dir, "SwiftUI", ["gl"])
+        self.assertEqual(len(symbols), 3)
+
+    def test_similar_titles_share_half_the_query_trigrams(self) -> None:
+        similar = symbol_index.load_similar(self.out_dir, "SwiftUI", "glassbuttonstyel", 10)
+        self.assertEqual([symbol.title for symbol in similar], ["GlassButtonStyle"])
+
+        similar = symbol_index.load_similar(self.out_dir, "SwiftUI", "glasseffect", 10)
+        self.assertEqual([symbol.title for symbol in similar], ["glassEffect(_:in:)"])
+
+        best = symbol_index.load_similar(self.out_dir, "SwiftUI", "glassbutton", 1)
+        self.assertEqual([symbol.title for symbol in best], ["GlassButtonStyle"])
+        self.assertEqual(symbol_index.load_similar(self.out_dir, "SwiftUI", "toolbarspacer", 10), [])
+
+    def test_graph_symbols_stream_in_small_chunks(self) -> None:
+        graph = self.root / "Streamed.symbols.json"
+        symbols = [make_symbol(f"Item{i}", doc='quoted "}]" text', availability=[introduced("iOS", 26)]) for i in range(40)]
+        graph.write_text(
+            json.dumps(
+                {
+                    "relationships": [{"kind": "memberOf", "source": "a", "target": "b"}] * 30,
+                    "symbols": symbols,
+                    "metadata": {"formatVersion": {"major": 0, "minor": 6, "patch": -1.5e3}},
+                },
+                indent=1,
+            )
+        )
+        chunk = symbol_index.READ_CHUNK
+        self.addCleanup(setattr, symbol_index, "READ_CHUNK", chunk)
+        symbol_index.READ_CHUNK = 7
+
+        self.assertEqual(list(symbol_index.iter_graph_symbols(graph)), symbols)
+
+    def test_malformed_graph_is_skipped_as_a_whole(self) -> None:
+        graph = self.out_dir / "SwiftUI.symbols.json"
+        text = graph.read_text()
+        graph.write_text(text[: text.index("Button") + 20])
+
+        titles = [symbol.title for symbol in symbol_index.load_index(self.out_dir, "SwiftUI")]
+        self.assertEqual(titles, ["glassEffect(_:in:)"])
+
+    def test_search_ranks_from_index_without_xcrun(self) -> None:
+        data = self.run_search("glass", "--ios26", "--no-doc")
+
+        self.assertEqual(
+            [(result["title"], result["score"]) for result in data["results"]],
+            [("GlassButtonStyle", 563), ("glassEffect(_:in:)", 520)],
+        )
+        self.assertTrue((self.out_dir / symbol_index.INDEX_NAME).exists())
+
+    def test_search_applies_kind_filter_and_reports_declaration(self) -> None:
+        data = self.run_search("glass", "--kind", "method")
+
+        self.assertEqual(len(data["results"]), 1)
+        result = data["results"][0]
+        self.assertEqual(result["module"], "SwiftUI@SwiftUICore")
+        self.assertEqual(result["path"], "View.glassEffect(_:in:)")
+        self.assertTrue(result["declaration"].startswith("func glassEffect"))
+
+    def test_search_falls_back_to_fuzzy_names_without_exact_matches(self) -> None:
+        exact = self.run_search("glass")
+        self.assertFalse(exact["fuzzy"])
+
+        data = self.run_search("GlassButonStyle", "--no-doc")
+        self.assertTrue(data["fuzzy"])
+        self.assertEqual([result["title"] for result in data["results"]], ["GlassButtonStyle"])
+        self.assertLess(data["results"][0]["score"], 100)
+
+        data = self.run_search("glasEffect", "--kind", "method")
+        self.assertEqual([result["title"] for result in data["results"]], ["glassEffect(_:in:)"])
+        self.assertEqual(self.run_search("glasEffect", "--kind", "structure")["results"], [])
+        self.assertEqual(self.run_search("GlassButonStyle", "--no-fuzzy")["results"], [])
+
+    def test_fuzzy_flag_is_unset_when_the_fuzzy_tier_finds_nothing(self) -> None:
+        data = self.run_search("qqzzxv")
+        self.assertEqual(data["results"], [])
+        self.assertFalse(data["fuzzy"])
+
+        self.assertFalse(self.run_search("GlassButonStyle", "--no-fuzzy")["fuzzy"])
+
+    def test_search_scores_match_a_full_scan(self) -> None:
+        for query in (["glass"], ["glass", "button"], ["some", "view"], ["label"], ["a"]):
+            terms = [term.lower() for term in query]
+            phrase = " ".join(query)
+            full = [
+                (search_engine.score_symbol(symbol, terms, phrase), symbol.title)
+                for symbol in symbol_index.load_index(self.out_dir, "SwiftUI")
+            ]
+            narrowed = [
+                (search_engine.score_symbol(symbol, terms, phrase), symbol.title)
+                for symbol in symbol_index.load_index(self.out_dir, "SwiftUI", terms)
+            ]
+            self.assertEqual([item for item in full if item[0] > 0], [item for item in narrowed if item[0] > 0])
+
+
+if __name__ == "__main__":
+    unittest.main()
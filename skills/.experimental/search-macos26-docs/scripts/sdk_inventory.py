@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""Persistent inventory of an SDK's frameworks and their interface, header, and apinotes files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import Any
+
+
+INVENTORY_FORMAT = 1
+SOURCE_SUFFIXES = (".h", ".apinotes")
+
+
+def framework_roots(sdk: Path) -> list[Path]:
+    return [
+        sdk / "System" / "Library" / "Frameworks",
+        sdk / "System" / "Library" / "PrivateFrameworks",
+    ]
+
+
+def framework_dirs(sdk: Path, module: str) -> list[Path]:
+    return [root / f"{module}.framework" for root in framework_roots(sdk) if (root / f"{module}.framework").exists()]
+
+
+def source_sort_key(path: Path) -> tuple[int, int, str]:
+    suffix_order = 3
+    if path.suffix == ".swiftinterface":
+        suffix_order = 0
+    elif path.suffix == ".h":
+        suffix_order = 1
+    elif path.suffix == ".apinotes":
+        suffix_order = 2
+    name = path.name
+    arch_order = 2
+    if "arm64" in name:
+        arch_order = 0
+    elif "x86_64" in name:
+        arch_order = 1
+    return (suffix_order, arch_order, str(path))
+
+
+def mtime_ns(path: Path | str) -> int | None:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def file_size(path: str) -> int | None:
+    try:
+        return os.stat(path).st_size
+    except OSError:
+        return None
+
+
+def dirs_current(dirs: dict[str, int | None]) -> bool:
+    return all(mtime_ns(path) == recorded for path, recorded in dirs.items())
+
+
+def names_in(directory: Path) -> list[str]:
+    try:
+        with os.scandir(directory) as entries:
+            return [entry.name for entry in entries]
+    except OSError:
+        return []
+
+
+def walk_headers(headers: Path, dirs: dict[str, int | None], files: list[str]) -> None:
+    """Collect header and apinotes files below `headers` the way Path.rglob would, recording each directory."""
+    dirs[str(headers)] = mtime_ns(headers)
+    try:
+        with os.scandir(headers) as entries:
+            children = list(entries)
+    except OSError:
+        return
+    for entry in children:
+        if entry.name.endswith(SOURCE_SUFFIXES):
+            files.append(entry.path)
+        if entry.is_dir() and not entry.is_symlink():
+            walk_headers(Path(entry.path), dirs, files)
+
+
+def scan_modules(sdk: Path) -> tuple[list[str], dict[str, int | None]]:
+    modules: set[str] = set()
+    dirs: dict[str, int | None] = {}
+    for root in framework_roots(sdk):
+        dirs[str(root)] = mtime_ns(root)
+        for name in names_in(root):
+            if not name.endswith(".framework"):
+                continue
+            framework = root / name
+            dirs[str(framework)] = mtime_ns(framework)
+            if (framework / "Modules").exists() or (framework / "Headers").exists():
+                modules.add(name.removesuffix(".framework"))
+    return sorted(modules, key=str.lower), dirs
+
+
+def scan_sources(sdk: Path, module: str) -> dict[str, Any]:
+    dirs: dict[str, int | None] = {str(root): mtime_ns(root) for root in framework_roots(sdk)}
+    files: list[str] = []
+    for framework in framework_dirs(sdk, module):
+        dirs[str(framework)] = mtime_ns(framework)
+        swiftmodule = framework / "Modules" / f"{module}.swiftmodule"
+        dirs[str(swiftmodule)] = mtime_ns(swiftmodule)
+        if swiftmodule.exists():
+            files.extend(str(swiftmodule / name) for name in names_in(swiftmodule) if name.endswith(".swiftinterface"))
+        headers = framework / "Headers"
+        dirs[str(headers)] = mtime_ns(headers)
+        if headers.exists():
+            walk_headers(headers, dirs, files)
+        files.extend(str(framework / name) for name in names_in(framework) if name.endswith(".apinotes"))
+    files.sort(key=lambda path: source_sort_key(Path(path)))
+    return {"dirs": dirs, "files": [[path, file_size(path)] for path in files]}
+
+
+class SDKInventory:
+    """Framework modules and per-module source files of one SDK, stored as JSON beside the caches.
+
+    Every entry records the mtimes of the directories it was built from and is rescanned
+    once one of them changes. An entry is validated once per `begin_query()`, so a batch or
+    daemon query never stats the SDK more than once per module.
+    """
+
+    def __init__(self, sdk: Path, path: Path | None) -> None:
+        self.sdk = sdk
+        self.path = path
+        self.data = self.read()
+        self.validated: set[str] = set()
+
+    def read(self) -> dict[str, Any]:
+        empty = {"format": INVENTORY_FORMAT, "sdk": str(self.sdk), "modules": None, "sources": {}}
+        if self.path is None:
+            return empty
+        try:
+            data = json.loads(self.path.read_text())
+        except (OSError, json.JSONDecodeError):
+            return empty
+        if not isinstance(data, dict) or data.get("format") != INVENTORY_FORMAT or data.get("sdk") != str(self.sdk):
+            return empty
+        return data
+
+    def write(self) -> None:
+        if self.path is None:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            handle, tmp_name = tempfile.mkstemp(prefix=".inventory-", suffix=".json", dir=self.path.parent)
+        except OSError:
+            return
+        try:
+            with os.fdopen(handle, "w") as tmp:
+                json.dump(self.data, tmp, separators=(",", ":"))
+            os.chmod(tmp_name, 0o644)
+            os.replace(tmp_name, self.path)
+        except OSError:
+            Path(tmp_name).unlink(missing_ok=True)
+
+    def begin_query(self) -> None:
+        self.validated.clear()
+
+    def current(self, key: str, entry: dict[str, Any] | None) -> bool:
+        if entry is None:
+            return False
+        if key in self.validated:
+            return True
+        if not dirs_current(entry["dirs"]):
+            return False
+        self.validated.add(key)
+        return True
+
+    def modules(self) -> list[str]:
+        entry = self.data.get("modules")
+        if not self.current("modules", entry):
+            names, dirs = scan_modules(self.sdk)
+            entry = self.data["modules"] = {"dirs": dirs, "names": names}
+            self.validated.add("modules")
+            self.write()
+        return entry["names"]
+
+    def sources(self, module: str) -> list[tuple[Path, int | None]]:
+        """Return (path, size) for the module's swiftinterfaces, headers, and apinotes in search order."""
+        key = f"sources:{module}"
+        entry = self.data["sources"].get(module)
+        if not self.current(key, entry):
+            entry = self.data["sources"][module] = scan_sources(self.sdk, module)
+            self.validated.add(key)
+            self.write()
+        return [(Path(path), size) for path, size in entry["files"]]
+
+
+_inventories: dict[Path, SDKInventory] = {}
+
+
+def inventory_path(cache_root: Path, sdk: Path) -> Path:
+    digest = hashlib.sha1(str(sdk).encode()).hexdigest()[:12]
+    return cache_root / sdk.name / f"inventory-{digest}.json"
+
+
+def open_inventory(sdk: Path, cache_root: Path | None) -> SDKInventory:
+    """Bind `sdk` to an inventory persisted under `cache_root` and start a new validation round."""
+    path = inventory_path(cache_root, sdk) if cache_root is not None else None
+    inventory = _inventories.get(sdk)
+    if inventory is None or inventory.path != path:
+        inventory = _inventories[sdk] = SDKInventory(sdk, path)
+    inventory.begin_query()
+    return inventory
+
+
+def inventory_for(sdk: Path) -> SDKInventory:
+    """Return the inventory opened for `sdk`, or an in-memory one when none was opened."""
+    return _inventories.get(sdk) or open_inventory(sdk, None)
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""Unix-socket transport that keeps a warm search process serving CLI queries."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import signal
+import socket
+import socketserver
+import stat
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable
+
+
+PROTOCOL = 1
+DEFAULT_IDLE_TIMEOUT = 900.0
+CONNECT_TIMEOUT = 0.2
+# A client that has no complete reply by then searches in-process instead, so a daemon that
+# accepts but hangs (stopped, deadlocked) cannot block the CLI.
+REPLY_TIMEOUT = 60.0
+# sockaddr_un.sun_path is 104 bytes on macOS; keep a margin for the terminating NUL.
+MAX_SOCKET_PATH = 100
+
+
+def socket_path(root: Path, sdk: str, target: str) -> Path:
+    path = root / f"daemon-{sdk}-{target}.sock"
+    if len(str(path)) <= MAX_SOCKET_PATH:
+        return path
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:16]
+    return runtime_dir() / f"search-docs-{digest}.sock"
+
+
+def runtime_dir() -> Path:
+    """Per-user home for sockets whose cache path is too long.
+
+    A shared temp directory would let another user bind the predictable name first and
+    answer our queries, so use $XDG_RUNTIME_DIR or an owner-only directory named by uid.
+    """
+    runtime = os.environ.get("XDG_RUNTIME_DIR")
+    if runtime:
+        return Path(runtime)
+    return Path(tempfile.gettempdir()) / f"search-docs-{os.getuid()}"
+
+
+def make_private_dir(directory: Path) -> None:
+    """Create `directory` owner-only; raises PermissionError if it exists and is not exactly that."""
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = os.lstat(directory)
+    if not stat.S_ISDIR(info.st_mode) or info.st_uid != os.getuid() or info.st_mode & 0o077:
+        raise PermissionError(f"{directory} is not an owner-only directory")
+
+
+def owned_by_user(path: Path) -> bool:
+    try:
+        return os.stat(path).st_uid == os.getuid()
+    except OSError:
+        return False
+
+
+def read_message(sock: socket.socket, deadline: float | None = None) -> dict[str, Any] | None:
+    """Read one newline-terminated message; raises TimeoutError once time.monotonic() passes `deadline`."""
+    chunks: list[bytes] = []
+    while True:
+        if deadline is not None:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise TimeoutError("no complete reply before the deadline")
+            sock.settimeout(remaining)
+        chunk = sock.recv(65536)
+        if not chunk:
+            break
+        chunks.append(chunk)
+        if chunk.endswith(b"\n"):
+            break
+    if not chunks:
+        return None
+    return json.loads(b"".join(chunks))
+
+
+def write_message(sock: socket.socket, message: dict[str, Any]) -> None:
+    sock.sendall(json.dumps(message).encode() + b"\n")
+
+
+def request(path: Path, payload: dict[str, Any], *, timeout: float = REPLY_TIMEOUT) -> dict[str, Any] | None:
+    """Send one query to a running daemon. Returns None when no compatible daemon answers within `timeout`.
+
+    Sockets owned by another user are never contacted: their replies would be printed as results.
+    """
+    if not owned_by_user(path):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+            deadline = time.monotonic() + timeout
+            sock.settimeout(timeout)
+            write_message(sock, {"protocol": PROTOCOL, **payload})
+            reply = read_message(sock, deadline)
+    except (OSError, ValueError):
+        return None
+    if not reply or reply.get("protocol") != PROTOCOL:
+        return None
+    return reply
+
+
+def daemon_alive(path: Path) -> bool:
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.settimeout(CONNECT_TIMEOUT)
+            sock.connect(str(path))
+    except OSError:
+        return False
+    return True
+
+
+class _Server(socketserver.UnixStreamServer):
+    idle = False
+
+    def handle_timeout(self) -> None:
+        self.idle = True
+
+
+def serve(path: Path, handler: Callable[[dict[str, Any]], dict[str, Any]], *, idle_timeout: float) -> int:
+    """Answer queries on `path` one at a time until no request arrives for `idle_timeout` seconds.
+
+    `handler` receives the decoded request and returns a reply with `exitCode`, `stdout`
+    and `stderr`. Requests are handled serially so handlers may keep unsynchronised caches.
+    """
+    try:
+        if path.parent == runtime_dir():
+            make_private_dir(path.parent)
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError as exc:
+        print(f"error: cannot serve from {path.parent}: {exc}", file=sys.stderr)
+        return 1
+    if path.exists():
+        if not owned_by_user(path):
+            print(f"error: {path} belongs to another user; not replacing it", file=sys.stderr)
+            return 1
+        if daemon_alive(path):
+            print(f"error: a search daemon is already listening on {path}", file=sys.stderr)
+            return 1
+        path.unlink()
+
+    class Handler(socketserver.BaseRequestHandler):
+        def handle(self) -> None:
+            try:
+                message = read_message(self.request)
+            except ValueError:
+                return
+            if not message:
+                return
+            if message.get("protocol") != PROTOCOL:
+                write_message(self.request, {"protocol": PROTOCOL, "error": "protocol mismatch"})
+                return
+            started = time.perf_counter()
+            try:
+                reply = handler(message)
+            except Exception as exc:  # keep serving other clients
+                reply = {"exitCode": 1, "stdout": "", "stderr": f"search daemon error: {exc.__class__.__name__}: {exc}\n"}
+            print(
+                f"[served] exit={reply.get('exitCode')} {time.perf_counter() - started:.3f}s",
+                file=sys.stderr,
+                flush=True,
+            )
+            try:
+                write_message(self.request, {"protocol": PROTOCOL, **reply})
+            except OSError:
+                pass
+
+    # Turn SIGTERM into a normal exit so the socket file is removed on the way out.
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    # Bind under an owner-only umask: a chmod after bind would leave the socket open to others for a moment.
+    umask = os.umask(0o177)
+    try:
+        server = _Server(str(path), Handler)
+    finally:
+        os.umask(umask)
+    with server:
+        server.timeout = idle_timeout
+        print(f"[serve] listening on {path} (idle timeout {idle_timeout:g}s)", file=sys.stderr, flush=True)
+        try:
+            while not server.idle:
+                server.handle_request()
+        except KeyboardInterrupt:
+            return 130
+        finally:
+            path.unlink(missing_ok=True)
+    print("[serve] idle timeout reached, shutting down", file=sys.stderr, flush=True)
+    return 0
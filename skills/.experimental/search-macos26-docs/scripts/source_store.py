@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Per-process store of SDK interface, header, and apinotes sources for verified search."""
+
+from __future__ import annotations
+
+import functools
+import re
+from bisect import bisect_right
+from pathlib import Path
+
+
+WORD_RE = re.compile(r"\w+")
+ESCAPE_RE = re.compile(r"\\(?:x[0-9a-fA-F]{2}|u[0-9a-fA-F]{4}|U[0-9a-fA-F]{8}|N\{[^}]*\}|[0-7]{1,3}|.)")
+CHAR_CLASS_RE = re.compile(r"\[[^\]]*\]")
+# Constructs that make a literal optional or alternative; patterns using them get no anchor.
+UNANCHORED_RE = re.compile(r"[|?{(]|\w[*+]")
+
+
+def read_lines(path: Path) -> list[str]:
+    try:
+        return path.read_text(errors="replace").splitlines()
+    except OSError:
+        return []
+
+
+class SourceFile:
+    """One source file read once, with identifiers indexed to line numbers on first lookup.
+
+    `folded` joins the lines with newlines so every offset maps back to a line number
+    through `newlines`; anchors are located with str.find over the whole file instead
+    of running each regex on every line.
+    """
+
+    __slots__ = ("path", "lines", "folded", "newlines", "anchors")
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.lines = read_lines(path)
+        self.folded = "\n".join(self.lines).casefold()
+        self.newlines = [match.start() for match in re.finditer("\n", self.folded)]
+        self.anchors: dict[str, list[int]] = {}
+
+    def anchor_lines(self, anchor: str) -> list[int]:
+        """Return the 1-based numbers of lines containing the casefolded `anchor`."""
+        found = self.anchors.get(anchor)
+        if found is not None:
+            return found
+        found = []
+        start = 0
+        while True:
+            offset = self.folded.find(anchor, start)
+            if offset < 0:
+                break
+            index = bisect_right(self.newlines, offset)
+            found.append(index + 1)
+            if index >= len(self.newlines):
+                break
+            start = self.newlines[index] + 1
+        self.anchors[anchor] = found
+        return found
+
+    def candidate_lines(self, patterns: list[re.Pattern[str]]) -> list[int] | range:
+        """Return line numbers that can match any of `patterns`, in file order."""
+        anchors = [pattern_anchor(pattern) for pattern in patterns]
+        if any(anchor is None for anchor in anchors):
+            return range(1, len(self.lines) + 1)
+        lines: set[int] = set()
+        for anchor in anchors:
+            lines.update(self.anchor_lines(anchor))
+        return sorted(lines)
+
+    def context(self, index: int, context_lines: int) -> tuple[int, list[dict[str, object]]]:
+        start = max(1, index - context_lines)
+        end = min(len(self.lines), index + context_lines)
+        return start, [
+            {"line": line_number, "text": self.lines[line_number - 1].strip()}
+            for line_number in range(start, end + 1)
+        ]
+
+
+# Sources stay loaded for the life of the process; a search daemon rereads a file only
+# after its mtime or size changes.
+_sources: dict[Path, tuple[tuple[int, int] | None, SourceFile]] = {}
+
+
+def load_source(path: Path) -> SourceFile:
+    try:
+        stat = path.stat()
+        signature: tuple[int, int] | None = (stat.st_mtime_ns, stat.st_size)
+    except OSError:
+        signature = None
+    cached = _sources.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+    source = SourceFile(path)
+    _sources[path] = (signature, source)
+    return source
+
+
+@functools.lru_cache(maxsize=4096)
+def pattern_anchor(pattern: re.Pattern[str]) -> str | None:
+    """Return the longest casefolded word that every match of `pattern` must contain.
+
+    Only literal text, escapes, `.*`-style gaps, and character classes are understood;
+    anything that can make a word optional yields None so callers scan every line.
+    """
+    literal = CHAR_CLASS_RE.sub(" ", ESCAPE_RE.sub(" ", pattern.pattern))
+    if UNANCHORED_RE.search(literal):
+        return None
+    words = [word for word in WORD_RE.findall(literal) if word.isascii()]
+    if not words:
+        return None
+    return max(words, key=len).casefold()
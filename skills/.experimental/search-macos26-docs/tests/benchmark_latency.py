@@ -0,0 +1,242 @@
+#!/usr/bin/env python3
+"""Query latency benchmark for search_symbols.py and probe_symbol.py on a synthetic SDK.
+
+The fixture has SwiftUI + SwiftUICore symbol graphs and a swiftinterface per module
+(100k symbols and 20 MB of interface by default). Every phase times whole CLI
+invocations, the way an agent calls the scripts, and records peak RSS:
+
+    python3 tests/benchmark_latency.py --output before.json
+    python3 tests/benchmark_latency.py --compare before.json
+
+`cold-index` builds the indexes from the graphs; `search`, `verified`, and `probe`
+start a fresh process per query against built indexes; `batch` answers every query in
+one --batch process; `daemon` sends the queries to a warm --serve process.
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from benchmark_memory import MODULES, peak_rss, write_fixture
+from synthetic_sdk import SDK_NAME, TARGET
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SCRIPTS = SKILL_DIR / "scripts"
+sys.path.insert(0, str(SCRIPTS))
+
+from search_daemon import socket_path  # noqa: E402
+from search_symbols import PLATFORM  # noqa: E402
+
+QUERIES = ("glass effect", "toolbar spacer", "navigation stack", "view")
+
+
+def write_interfaces(sdk: Path, cache_root: Path, interface_bytes: int) -> None:
+    """Write one swiftinterface per module from its graph's symbols, cycling until the module's share of bytes."""
+    budget = interface_bytes // len(MODULES)
+    for module in MODULES:
+        graph = cache_root / SDK_NAME / TARGET / module / f"{module}.symbols.json"
+        symbols = json.loads(graph.read_text())["symbols"]
+        swiftmodule = sdk / "System" / "Library" / "Frameworks" / f"{module}.framework" / "Modules" / f"{module}.swiftmodule"
+        swiftmodule.mkdir(parents=True, exist_ok=True)
+        with (swiftmodule / f"{TARGET}.swiftinterface").open("w") as handle:
+            written = handle.write(f"// swift-module-flags: -target {TARGET} -module-name {module}\nimport Swift\n")
+            for symbol in itertools.cycle(symbols):
+                if written >= budget:
+                    break
+                doc = " ".join(line["text"] for line in symbol["docComment"]["lines"])
+                declaration = symbol["declarationFragments"][0]["spelling"]
+                written += handle.write(f"  /// {doc}\n  @available(macOS 26.0, *)\n  public {declaration}\n")
+
+
+def generate(root: Path, symbols: int, interface_bytes: int) -> tuple[Path, Path]:
+    """Write the fixture from a child process so its memory stays out of the measured phases."""
+    subprocess.run(
+        [
+            sys.executable,
+            __file__,
+            "--write-fixture",
+            str(root),
+            "--symbols",
+            str(symbols),
+            "--interface-mb",
+            str(interface_bytes / 2**20),
+        ],
+        check=True,
+    )
+    return root / SDK_NAME, root / "cache"
+
+
+def common_args(sdk: Path, cache_root: Path) -> list[str]:
+    return [
+        "--sdk-path",
+        str(sdk),
+        "--cache-dir",
+        str(cache_root),
+        "--target",
+        TARGET,
+        "--json",
+        *[arg for module in MODULES for arg in ("--module", module)],
+    ]
+
+
+def script(name: str, *args: str) -> list[str]:
+    return [sys.executable, str(SCRIPTS / name), *args]
+
+
+def summarize(samples: list[tuple[int, float]], **extra: Any) -> dict[str, Any]:
+    seconds = [elapsed for _, elapsed in samples]
+    return {
+        "runs": len(samples),
+        "medianSeconds": round(statistics.median(seconds), 4),
+        "minSeconds": round(min(seconds), 4),
+        "maxSeconds": round(max(seconds), 4),
+        "peakRssBytes": max(rss for rss, _ in samples),
+        **extra,
+    }
+
+
+def time_daemon(sdk: Path, cache_root: Path, runs: int) -> dict[str, Any]:
+    """Time client invocations against a warm daemon; its peak RSS is read when it exits."""
+    serve = subprocess.Popen(
+        script("search_symbols.py", "--serve", "--idle-timeout", "600", *common_args(sdk, cache_root)),
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+    )
+    started = time.perf_counter()
+    try:
+        while not socket_path(cache_root, PLATFORM.sdk, TARGET).exists():
+            if serve.poll() is not None:
+                raise RuntimeError(f"daemon exited: {serve.stderr.read().decode()}")
+            time.sleep(0.05)
+        warmup = time.perf_counter() - started
+        samples = [
+            peak_rss(script("search_symbols.py", *query.split(), *common_args(sdk, cache_root)))
+            for _ in range(runs)
+            for query in QUERIES
+        ]
+    finally:
+        serve.terminate()
+    _, _, usage = os.wait4(serve.pid, 0)
+    serve.stderr.close()
+    daemon_rss = usage.ru_maxrss * (1 if sys.platform == "darwin" else 1024)
+    return summarize(samples, warmupSeconds=round(warmup, 4), daemonPeakRssBytes=daemon_rss)
+
+
+def run_phases(sdk: Path, cache_root: Path, runs: int) -> dict[str, dict[str, Any]]:
+    common = common_args(sdk, cache_root)
+    phases: dict[str, dict[str, Any]] = {}
+
+    for index in cache_root.rglob("index.sqlite"):
+        index.unlink()
+    phases["cold-index"] = summarize([peak_rss(script("search_symbols.py", *QUERIES[0].split(), "--no-daemon", *common))])
+
+    def per_query(name: str, *options: str) -> list[tuple[int, float]]:
+        return [
+            peak_rss(script(name, *query.split(), *options, "--no-daemon", *common))
+            for _ in range(runs)
+            for query in QUERIES
+        ]
+
+    phases["search"] = summarize(per_query("search_symbols.py"))
+    phases["verified"] = summarize(per_query("search_symbols.py", "--verify-interfaces"))
+    phases["probe"] = summarize(per_query("probe_symbol.py"))
+
+    with tempfile.NamedTemporaryFile("w", suffix=".ndjson", delete=False) as batch:
+        for number, query in enumerate(QUERIES * runs, start=1):
+            batch.write(json.dumps({"id": number, "query": query, "verifyInterfaces": number % 2 == 0}) + "\n")
+    try:
+        rss, seconds = peak_rss(script("search_symbols.py", "--batch", batch.name, *common))
+    finally:
+        os.unlink(batch.name)
+    queries = len(QUERIES) * runs
+    phases["batch"] = summarize([(rss, seconds)], queries=queries, perQuerySeconds=round(seconds / queries, 4))
+
+    phases["daemon"] = time_daemon(sdk, cache_root, runs)
+    return phases
+
+
+def git_commit() -> str | None:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SKILL_DIR, capture_output=True, text=True, check=True
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return result.stdout.strip() or None
+
+
+def print_report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    print(
+        f"commit={report['commit'] or '-'} symbols={report['symbols']} "
+        f"graphs={report['graphBytes'] / 2**20:.1f} MiB interfaces={report['interfaceBytes'] / 2**20:.1f} MiB"
+    )
+    for name, phase in report["phases"].items():
+        line = (
+            f"{name:11} median {phase['medianSeconds']:7.3f}s  min {phase['minSeconds']:7.3f}s  "
+            f"peak {phase['peakRssBytes'] / 2**20:7.1f} MiB"
+        )
+        if "daemonPeakRssBytes" in phase:
+            line += f" (server {phase['daemonPeakRssBytes'] / 2**20:.1f} MiB)"
+        previous = (baseline or {}).get("phases", {}).get(name)
+        if previous:
+            line += f"  vs {baseline.get('commit') or 'baseline'}: {phase['medianSeconds'] / previous['medianSeconds']:5.2f}x time"
+            line += f", {phase['peakRssBytes'] / previous['peakRssBytes']:5.2f}x memory"
+        print(line)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--symbols", type=int, default=100000, help="Symbols across both modules, default: 100000.")
+    parser.add_argument("--interface-mb", type=float, default=20, help="Swiftinterface megabytes across both modules, default: 20.")
+    parser.add_argument("--runs", type=int, default=3, help="Times each query is repeated per phase, default: 3.")
+    parser.add_argument("--output", type=Path, help="Also write the JSON report to this file.")
+    parser.add_argument("--compare", type=Path, help="A previous JSON report to print ratios against.")
+    parser.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    parser.add_argument("--write-fixture", type=Path, help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = parse_args()
+    interface_bytes = int(args.interface_mb * 2**20)
+    if args.write_fixture:
+        sdk, cache_root = write_fixture(args.write_fixture, args.symbols)
+        write_interfaces(sdk, cache_root, interface_bytes)
+        return 0
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    with tempfile.TemporaryDirectory() as tmp:
+        sdk, cache_root = generate(Path(tmp), args.symbols, interface_bytes)
+        report = {
+            "commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": sys.platform,
+            "symbols": args.symbols,
+            "graphBytes": sum(path.stat().st_size for path in cache_root.rglob("*.symbols.json")),
+            "interfaceBytes": sum(path.stat().st_size for path in sdk.rglob("*.swiftinterface")),
+            "queries": list(QUERIES),
+            "phases": run_phases(sdk, cache_root, args.runs),
+        }
+
+    if args.output:
+        args.output.write_text(json.dumps(report, indent=2) + "\n")
+    if args.json:
+        print(json.dumps(report, indent=2))
+    else:
+        print_report(report, baseline)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
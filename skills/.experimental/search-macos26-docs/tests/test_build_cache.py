@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""Checks for build_cache.py scheduling with a fake symbol graph extractor."""
+
+from __future__ import annotations
+
+import json
+import os
+import shlex
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from synthetic_sdk import TARGET, make_sdk, make_symbol
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+BUILD = SKILL_DIR / "scripts" / "build_cache.py"
+
+FAKE_EXTRACTOR = """\
+import json, sys, time
+from pathlib import Path
+
+args = dict(zip(sys.argv[1::2], sys.argv[2::2]))
+module = args["-module-name"]
+log = Path(__file__).with_name("extract.log")
+with log.open("a") as handle:
+    handle.write(json.dumps({"module": module, "event": "start", "at": time.time()}) + "\\n")
+if module == "Broken":
+    sys.exit(3)
+time.sleep(0.4)
+out = Path(args["-output-dir"])
+for graph in (module, module + "@Foundation"):
+    (out / (graph + ".symbols.json")).write_text(json.dumps({"symbols": [SYMBOL]}))
+with log.open("a") as handle:
+    handle.write(json.dumps({"module": module, "event": "end", "at": time.time()}) + "\\n")
+"""
+
+
+class BuildCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.sdk = make_sdk(self.root)
+        self.cache_root = self.root / "cache"
+        self.extractor = self.root / "fake_extract.py"
+        symbol = json.dumps(make_symbol("FixtureView"))
+        self.extractor.write_text(FAKE_EXTRACTOR.replace("SYMBOL", f"json.loads({symbol!r})"))
+
+    def build(self, *args: str, env: dict[str, str] | None = None, check: bool = True) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [
+                sys.executable,
+                str(BUILD),
+                "--sdk-path",
+                str(self.sdk),
+                "--cache-dir",
+                str(self.cache_root),
+                "--target",
+                TARGET,
+                *args,
+            ],
+            check=check,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env={**os.environ, **(env or {})},
+        )
+
+    def extractor_env(self) -> dict[str, str]:
+        return {"CODEX_SYMBOLGRAPH_EXTRACT": shlex.join([sys.executable, str(self.extractor)])}
+
+    def log_events(self) -> list[dict]:
+        log = self.root / "extract.log"
+        return [json.loads(line) for line in log.read_text().splitlines()] if log.exists() else []
+
+    def test_parallel_build_overlaps_extractors_and_writes_manifests(self) -> None:
+        modules = ["Alpha", "Beta", "Gamma"]
+        result = self.build(*[f"--module={m}" for m in modules], "--jobs", "3", env=self.extractor_env())
+
+        events = self.log_events()
+        starts = [e["at"] for e in events if e["event"] == "start"]
+        ends = [e["at"] for e in events if e["event"] == "end"]
+        self.assertEqual(len(starts), 3)
+        self.assertLess(max(starts), min(ends), "extractors did not run concurrently")
+
+        for module in modules:
+            out_dir = self.cache_root / self.sdk.name / TARGET / module
+            manifest = json.loads((out_dir / "manifest.json").read_text())
+            self.assertEqual(manifest["files"], [f"{module}.symbols.json", f"{module}@Foundation.symbols.json"])
+            self.assertEqual(manifest["sdk_path"], str(self.sdk))
+            self.assertTrue((out_dir / "index.sqlite").exists())
+            self.assertEqual(sorted(p.name for p in out_dir.iterdir() if p.name.startswith(".")), [])
+            self.assertRegex(result.stdout, rf"\[built\] {module}: 2 graphs, extract \d+\.\ds, index \d+\.\ds")
+        self.assertEqual(result.stdout.count("sdk="), 1)
+        self.assertIn("(jobs=3)", result.stdout)
+
+    def test_second_build_reuses_cache(self) -> None:
+        self.build("--module", "Alpha", env=self.extractor_env())
+        result = self.build("--module", "Alpha", "--module", "Beta", "--jobs", "2", env=self.extractor_env())
+
+        self.assertIn("[cached] Alpha", result.stdout)
+        self.assertIn("[built] Beta", result.stdout)
+        self.assertEqual([e["module"] for e in self.log_events() if e["event"] == "start"], ["Alpha", "Beta"])
+
+    def test_extractor_flag_overrides_environment(self) -> None:
+        env = {"CODEX_SYMBOLGRAPH_EXTRACT": "/nonexistent/extractor"}
+        flag = shlex.join([sys.executable, str(self.extractor)])
+
+        listed = self.build("--list", "--extractor", flag, env=env)
+        self.assertIn(f"extractor={flag}", listed.stdout)
+
+        self.build("--module", "Alpha", "--extractor", flag, env=env)
+        self.assertEqual([e["module"] for e in self.log_events() if e["event"] == "end"], ["Alpha"])
+
+    def test_failed_module_does_not_stop_the_others(self) -> None:
+        result = self.build("--module", "Broken", "--module", "Alpha", "--jobs", "2", env=self.extractor_env(), check=False)
+
+        self.assertEqual(result.returncode, 3)
+        self.assertIn("command failed:", result.stderr)
+        self.assertTrue((self.cache_root / self.sdk.name / TARGET / "Alpha" / "manifest.json").exists())
+        self.assertFalse((self.cache_root / self.sdk.name / TARGET / "Broken" / "manifest.json").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
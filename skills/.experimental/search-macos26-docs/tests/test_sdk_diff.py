@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Checks for the cross-SDK symbol diff built from two cached SDK versions."""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from synthetic_sdk import TARGET, introduced, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+DIFF = SKILL_DIR / "scripts" / "sdk_diff.py"
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import sdk_diff  # noqa: E402
+
+OLD = "Synthetic18.5.sdk"
+NEW = "SyntheticMac26.0.sdk"
+
+
+class SDKDiffTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.cache_root = Path(self.tmp.name) / "cache"
+        write_module_cache(
+            self.cache_root,
+            Path(OLD),
+            "SwiftUI",
+            {
+                "SwiftUI": [
+                    make_symbol("Button", declaration="struct Button<Label> where Label : View"),
+                    make_symbol("buttonStyle(_:)", path=["View", "buttonStyle(_:)"], kind="Instance Method"),
+                    make_symbol("LegacyStyle", availability=[introduced("macOS", 13)]),
+                    make_symbol("Toolbar", availability=[introduced("macOS", 14)]),
+                ]
+            },
+        )
+        self.new_dir = write_module_cache(
+            self.cache_root,
+            Path(NEW),
+            "SwiftUI",
+            {
+                "SwiftUI": [
+                    make_symbol("Button", declaration="struct Button<Label> where Label : View"),
+                    make_symbol(
+                        "buttonStyle(_:)",
+                        path=["View", "buttonStyle(_:)"],
+                        kind="Instance Method",
+                        declaration="func buttonStyle(_ style: some PrimitiveButtonStyle) -> some View",
+                    ),
+                    make_symbol("Toolbar", availability=[introduced("macOS", 14)]),
+                    make_symbol("GlassButtonStyle", availability=[introduced("macOS", 26)]),
+                ],
+                "SwiftUI@SwiftUICore": [
+                    make_symbol("glassEffect(_:in:)", path=["View", "glassEffect(_:in:)"], kind="Instance Method"),
+                    # The same symbol in a second graph is reported once.
+                    make_symbol("GlassButtonStyle", availability=[introduced("macOS", 26)]),
+                ],
+            },
+        )
+
+    def load(self, **kwargs: bool) -> dict:
+        return sdk_diff.load_diff(self.cache_root, OLD, NEW, TARGET, "SwiftUI", **kwargs)
+
+    def test_diff_reports_added_removed_and_changed_symbols(self) -> None:
+        diff = self.load()
+
+        self.assertEqual([entry["title"] for entry in diff["added"]], ["GlassButtonStyle", "glassEffect(_:in:)"])
+        self.assertEqual(diff["added"][0]["availability"], "macOS 26.0")
+        self.assertEqual([entry["title"] for entry in diff["removed"]], ["LegacyStyle"])
+        [changed] = diff["changed"]
+        self.assertEqual(changed["identifier"], "s:7FixturebuttonStyle(_:)")
+        self.assertEqual(changed["changes"], ["declaration"])
+        self.assertEqual(changed["old"]["declaration"], "struct buttonStyle(_:)")
+        self.assertTrue(changed["declaration"].startswith("func buttonStyle"))
+
+    def test_current_diff_is_answered_without_the_indexes(self) -> None:
+        self.load()
+        self.assertTrue(sdk_diff.diff_path(self.cache_root, OLD, NEW, TARGET, "SwiftUI").exists())
+
+        with mock.patch.object(sdk_diff, "load_index", side_effect=AssertionError("index loaded")):
+            self.assertEqual(len(self.load()["added"]), 2)
+
+        graph = self.new_dir / "SwiftUI.symbols.json"
+        graph.write_text(json.dumps({"symbols": [make_symbol("Toolbar", availability=[introduced("macOS", 26)])]}))
+        stat = graph.stat()
+        os.utime(graph, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        diff = self.load()
+        self.assertEqual([entry["title"] for entry in diff["changed"]], ["Toolbar"])
+        self.assertEqual(diff["changed"][0]["changes"], ["availability"])
+        self.assertEqual(diff["changed"][0]["old"]["availability"], "macOS 14.0")
+
+    def test_query_command_filters_by_status_and_terms(self) -> None:
+        result = subprocess.run(
+            [
+                sys.executable,
+                str(DIFF),
+                "glass",
+                "--old",
+                OLD,
+                "--new",
+                NEW,
+                "--cache-dir",
+                str(self.cache_root),
+                "--target",
+                TARGET,
+                "--module",
+                "SwiftUI",
+                "--status",
+                "added",
+                "--kind",
+                "method",
+                "--json",
+            ],
+            check=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+        )
+        data = json.loads(result.stdout)
+
+        self.assertEqual(data["counts"], {"SwiftUI": {"added": 2, "removed": 1, "changed": 1}})
+        self.assertEqual([(entry["status"], entry["title"]) for entry in data["results"]], [("added", "glassEffect(_:in:)")])
+
+    def test_missing_cache_is_reported(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            sdk_diff.load_diff(self.cache_root, "Missing.sdk", NEW, TARGET, "SwiftUI")
+        self.assertEqual(sdk_diff.cached_sdks(self.cache_root, TARGET), [OLD, NEW])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""Checks for the persistent SDK framework inventory against a synthetic SDK tree."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from synthetic_sdk import TARGET, make_sdk
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import sdk_inventory  # noqa: E402
+
+
+def globbed_sources(sdk: Path, module: str) -> list[Path]:
+    """Source discovery as search_symbols.py did it with pathlib globs before the inventory."""
+    files: list[Path] = []
+    for framework in sdk_inventory.framework_dirs(sdk, module):
+        swiftmodule = framework / "Modules" / f"{module}.swiftmodule"
+        if swiftmodule.exists():
+            files.extend(swiftmodule.glob("*.swiftinterface"))
+        headers = framework / "Headers"
+        if headers.exists():
+            files.extend(headers.rglob("*.h"))
+            files.extend(headers.rglob("*.apinotes"))
+        files.extend(framework.glob("*.apinotes"))
+    return sorted(files, key=sdk_inventory.source_sort_key)
+
+
+def touch(path: Path, text: str = "") -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text)
+
+
+def bump_mtime(path: Path) -> None:
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+class SDKInventoryTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.sdk = make_sdk(self.root, {"SwiftUI": "public struct A {}\n", "SwiftUICore": "public struct B {}\n"})
+        frameworks = self.sdk / "System" / "Library" / "Frameworks"
+        swiftmodule = frameworks / "SwiftUI.framework" / "Modules" / "SwiftUI.swiftmodule"
+        touch(swiftmodule / "x86_64-apple-ios-simulator.swiftinterface")
+        touch(swiftmodule / "arm64-apple-macos.private.swiftinterface")
+        uikit = frameworks / "UIKit.framework"
+        touch(uikit / "Headers" / "UIKit.h", "#import <UIKit/UIView.h>\n")
+        touch(uikit / "Headers" / "UIView.h")
+        touch(uikit / "Headers" / "Deep" / "UIViewPrivate.h")
+        touch(uikit / "Headers" / "UIKit.apinotes")
+        touch(uikit / "UIKit.apinotes")
+        (uikit / "Headers" / "Linked").symlink_to(uikit / "Headers" / "Deep")
+        (frameworks / "Empty.framework").mkdir()
+        touch(self.sdk / "System" / "Library" / "PrivateFrameworks" / "UIKit.framework" / "Headers" / "UIKitSPI.h")
+        self.cache_root = self.root / "cache"
+
+    def open(self) -> sdk_inventory.SDKInventory:
+        sdk_inventory._inventories.clear()
+        return sdk_inventory.open_inventory(self.sdk, self.cache_root)
+
+    def test_inventory_matches_glob_discovery(self) -> None:
+        inventory = self.open()
+
+        self.assertEqual(inventory.modules(), ["SwiftUI", "SwiftUICore", "UIKit"])
+        for module in ("SwiftUI", "SwiftUICore", "UIKit", "Missing"):
+            self.assertEqual([path for path, _ in inventory.sources(module)], globbed_sources(self.sdk, module))
+        umbrella = self.sdk / "System/Library/Frameworks/UIKit.framework/Headers/UIKit.h"
+        self.assertEqual(dict(inventory.sources("UIKit"))[umbrella], umbrella.stat().st_size)
+
+    def test_inventory_is_reused_across_processes(self) -> None:
+        self.open().sources("UIKit")
+        path = sdk_inventory.inventory_path(self.cache_root, self.sdk)
+        self.assertEqual(json.loads(path.read_text())["sdk"], str(self.sdk))
+
+        with mock.patch.object(sdk_inventory, "scan_sources", side_effect=AssertionError("rescanned")):
+            files = [path for path, _ in self.open().sources("UIKit")]
+        self.assertEqual(files, globbed_sources(self.sdk, "UIKit"))
+
+    def test_inventory_validates_once_per_query(self) -> None:
+        inventory = self.open()
+        inventory.sources("SwiftUI")
+        with mock.patch.object(sdk_inventory, "dirs_current", side_effect=AssertionError("stat again")):
+            inventory.sources("SwiftUI")
+        inventory.begin_query()
+        with mock.patch.object(sdk_inventory, "dirs_current", return_value=True) as validated:
+            inventory.sources("SwiftUI")
+        validated.assert_called_once()
+
+    def test_changed_directories_trigger_a_rescan(self) -> None:
+        inventory = self.open()
+        inventory.modules()
+        inventory.sources("UIKit")
+
+        deep = self.sdk / "System/Library/Frameworks/UIKit.framework/Headers/Deep"
+        touch(deep / "UIViewNew.h")
+        bump_mtime(deep)
+        touch(self.sdk / "System/Library/Frameworks/AppIntents.framework/Modules/AppIntents.swiftmodule" / f"{TARGET}.swiftinterface")
+        bump_mtime(self.sdk / "System/Library/Frameworks")
+
+        inventory = self.open()
+        self.assertIn("AppIntents", inventory.modules())
+        self.assertIn(deep / "UIViewNew.h", [path for path, _ in inventory.sources("UIKit")])
+        self.assertEqual([path for path, _ in inventory.sources("UIKit")], globbed_sources(self.sdk, "UIKit"))
+
+    def test_inventory_for_an_unopened_sdk_stays_in_memory(self) -> None:
+        sdk_inventory._inventories.clear()
+        self.assertEqual(sdk_inventory.inventory_for(self.sdk).modules(), ["SwiftUI", "SwiftUICore", "UIKit"])
+        self.assertFalse(self.cache_root.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""Checks for search_symbols.py ranking helpers and --batch mode."""
+
+from __future__ import annotations
+
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from synthetic_sdk import TARGET, introduced, make_sdk, make_symbol, write_module_cache
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+SEARCH = SKILL_DIR / "scripts" / "search_symbols.py"
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import search_engine  # noqa: E402
+from symbol_index import SymbolRecord  # noqa: E402
+
+
+def sorted_selection(results: list, limit: int, dedupe: bool) -> list:
+    """The full sort-then-dedupe selection that select_results() must reproduce."""
+    selected = []
+    seen = set()
+    for score, symbol in sorted(results, key=lambda item: (-item[0], item[1].title, item[1].path)):
+        if dedupe:
+            key = (symbol.title, symbol.declaration, symbol.availability, symbol.doc)
+            if key in seen:
+                continue
+            seen.add(key)
+        selected.append((score, symbol))
+        if len(selected) >= limit:
+            break
+    return selected
+
+
+class SelectResultsTests(unittest.TestCase):
+    def test_selection_matches_a_full_sort(self) -> None:
+        rng = random.Random(7)
+        for _ in range(200):
+            results = [
+                (
+                    rng.choice((120, 150, 520)),
+                    SymbolRecord(
+                        graph_module=rng.choice(("SwiftUI", "SwiftUI@SwiftUICore")),
+                        title=rng.choice(("Button", "View", "glassEffect(_:in:)")),
+                        path=rng.choice(("View", "Button", "View.glassEffect(_:in:)")),
+                        declaration=rng.choice(("struct Button", "func glassEffect()")),
+                        doc=rng.choice(("", "A view.")),
+                    ),
+                )
+                for _ in range(rng.randrange(0, 60))
+            ]
+            for limit in (0, 1, 3, 10, 100):
+                for dedupe in (True, False):
+                    expected = sorted_selection(results, limit, dedupe)
+                    actual = search_engine.select_results(results, limit, dedupe=dedupe)
+                    self.assertEqual([id(symbol) for _, symbol in actual], [id(symbol) for _, symbol in expected])
+
+    def test_duplicates_widen_the_window(self) -> None:
+        duplicate = [(500, SymbolRecord(title="View", path="View")) for _ in range(10)]
+        distinct = [(100 - i, SymbolRecord(title=f"View{i}", path=f"View{i}")) for i in range(5)]
+
+        selected = search_engine.select_results(duplicate + distinct, 4, dedupe=True)
+
+        self.assertEqual([symbol.title for _, symbol in selected], ["View", "View0", "View1", "View2"])
+        self.assertIs(selected[0][1], duplicate[0][1])
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.root = Path(self.tmp.name)
+        self.sdk = make_sdk(
+            self.root,
+            {"SwiftUI": "public struct GlassButtonStyle {\n}\npublic struct ToolbarSpacer {\n}\n"},
+        )
+        self.cache_root = self.root / "cache"
+        write_module_cache(
+            self.cache_root,
+            self.sdk,
+            "SwiftUI",
+            {
+                "SwiftUI": [
+                    make_symbol("GlassButtonStyle", availability=[introduced("macOS", 26)]),
+                    make_symbol("ToolbarSpacer", availability=[introduced("macOS", 26)]),
+                    make_symbol("Button", declaration="struct Button<Label> where Label : View"),
+                    make_symbol("buttonStyle(_:)", path=["View", "buttonStyle(_:)"], kind="Instance Method"),
+                ]
+            },
+        )
+
+    def search(self, *args: str, stdin: str | None = None, env: dict | None = None) -> subprocess.CompletedProcess[str]:
+        return subprocess.run(
+            [
+                sys.executable,
+                str(SEARCH),
+                *args,
+                "--sdk-path",
+                str(self.sdk),
+                "--cache-dir",
+                str(self.cache_root),
+                "--target",
+                TARGET,
+                "--module",
+                "SwiftUI",
+                "--no-daemon",
+            ],
+            input=stdin,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            env=env,
+        )
+
+    def test_batch_lines_match_single_queries(self) -> None:
+        specs = [
+            {"id": "glass", "query": "glass button"},
+            {"query": ["button"], "kind": "method", "limit": 1},
+            {"query": "toolbar", "macos26": True, "verifyInterfaces": True, "sourceContextLines": 0},
+        ]
+        single_args = [
+            ["glass", "button"],
+            ["button", "--kind", "method", "--limit", "1"],
+            ["toolbar", "--macos26", "--verify-interfaces", "--source-context-lines", "0"],
+        ]
+        batch = self.search("--batch", "-", stdin="".join(json.dumps(spec) + "\n" for spec in specs))
+
+        self.assertEqual(batch.returncode, 0, batch.stderr)
+        lines = [json.loads(line) for line in batch.stdout.splitlines()]
+        self.assertEqual([line["id"] for line in lines], ["glass", 2, 3])
+        self.assertEqual([line["query"] for line in lines], [["glass", "button"], ["button"], ["toolbar"]])
+        for line, args in zip(lines, single_args):
+            single = json.loads(self.search(*args, "--json").stdout)
+            self.assertEqual({key: line[key] for key in single}, single)
+        self.assertEqual(lines[1]["rawMatches"], 1)
+        self.assertTrue(lines[2]["results"][0]["sourceDiagnostics"]["found"])
+
+    def test_batch_reports_invalid_specs_and_keeps_going(self) -> None:
+        batch_file = self.root / "queries.ndjson"
+        batch_file.write_text(
+            "\n".join(
+                [
+                    "not json",
+                    json.dumps({"id": "bad-limit", "query": "glass", "limit": "2"}),
+                    json.dumps({"query": "glass", "colour": "red"}),
+                    "",
+                    json.dumps({"query": "glass", "introduced": "iOS"}),
+                    json.dumps({"id": "ok", "query": "glass"}),
+                ]
+            )
+        )
+
+        batch = self.search("--batch", str(batch_file))
+
+        self.assertEqual(batch.returncode, 1)
+        lines = [json.loads(line) for line in batch.stdout.splitlines()]
+        self.assertEqual([line["id"] for line in lines], [1, "bad-limit", 3, 5, "ok"])
+        self.assertEqual([("error" in line) for line in lines], [True, True, True, True, False])
+        self.assertEqual([result["title"] for result in lines[-1]["results"]], ["GlassButtonStyle"])
+
+    def test_batch_reports_failed_queries_and_keeps_going(self) -> None:
+        # An xcrun that locates no SDK, so a spec that also searches the other platform fails.
+        bin_dir = self.root / "bin"
+        bin_dir.mkdir()
+        xcrun = bin_dir / "xcrun"
+        xcrun.write_text("#!/bin/sh\necho 'xcrun: error: SDK cannot be located' >&2\nexit 1\n")
+        xcrun.chmod(0o755)
+        env = {**os.environ, "PATH": f"{bin_dir}{os.pathsep}{os.environ.get('PATH', '')}"}
+        specs = [
+            {"id": "every-platform", "query": "glass", "platforms": sorted(search_engine.PLATFORMS)},
+            {"id": "ok", "query": "glass"},
+        ]
+
+        batch = self.search("--batch", "-", stdin="".join(json.dumps(spec) + "\n" for spec in specs), env=env)
+
+        self.assertEqual(batch.returncode, 1)
+        lines = [json.loads(line) for line in batch.stdout.splitlines()]
+        self.assertEqual([line["id"] for line in lines], ["every-platform", "ok"])
+        self.assertIn("xcrun", lines[0]["error"])
+        self.assertEqual([result["title"] for result in lines[1]["results"]], ["GlassButtonStyle"])
+        self.assertIn("SDK cannot be located", batch.stderr)
+
+    def test_batch_rejects_command_line_queries(self) -> None:
+        result = self.search("glass", "--batch", "-", stdin="")
+        self.assertEqual(result.returncode, 2)
+        self.assertIn("--batch", result.stderr)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""Checks for the line-indexed interface source store used by --verify-interfaces."""
+
+from __future__ import annotations
+
+import os
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+from synthetic_sdk import make_sdk
+
+
+SKILL_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(SKILL_DIR / "scripts"))
+
+import search_engine  # noqa: E402
+import source_store  # noqa: E402
+from symbol_index import SymbolRecord  # noqa: E402
+
+
+INTERFACE = """\
+import SwiftUI
+@available(macOS 26.0, *)
+public struct GlassEffectContainer<Content> : SwiftUI.View where Content : SwiftUI.View {
+  public init(spacing: CoreFoundation.CGFloat? = nil, @SwiftUI.ViewBuilder content: () -> Content)
+}
+extension SwiftUI.View {
+  public func glassEffect(_ glass: SwiftUI.Glass = .regular, in shape: some Shape) -> some SwiftUI.View
+  public func glassEffectID(_ id: some Hashable, in namespace: SwiftUI.Namespace.ID) -> some SwiftUI.View
+}
+public struct ZoomNavigationTransition : SwiftUI.NavigationTransition {
+}
+// ſwift-style folding and a trailing line without newline
+public struct Résumé {}"""
+
+
+def scan_matches(lines: list[str], patterns: list[re.Pattern[str]]) -> list[int]:
+    return [index for index, line in enumerate(lines, start=1) if any(p.search(line) for p in patterns)]
+
+
+class SourceStoreTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.sdk = make_sdk(Path(self.tmp.name), {"SwiftUI": INTERFACE})
+        self.interface = search_engine.module_source_files(self.sdk, "SwiftUI")[0]
+
+    def test_pattern_anchor_picks_a_mandatory_word(self) -> None:
+        anchor = source_store.pattern_anchor
+        self.assertEqual(anchor(search_engine.title_regex("glassEffect(_:in:)")), "glasseffect")
+        self.assertEqual(anchor(re.compile(r"glass.*effect\.id", re.IGNORECASE)), "effect")
+        self.assertEqual(anchor(re.compile(r"\x41bc")), "bc")
+        self.assertIsNone(anchor(re.compile(r"glass|zoom")))
+        self.assertIsNone(anchor(re.compile(r"glasse?")))
+        self.assertIsNone(anchor(re.compile(r"(glass)+")))
+        self.assertIsNone(anchor(re.compile(r"\(\)")))
+
+    def test_candidate_lines_cover_every_regex_match(self) -> None:
+        store = source_store.load_source(self.interface)
+        queries = [
+            search_engine.source_patterns(
+                SymbolRecord(title="glassEffect(_:in:)", declaration="func glassEffect", path_tail="glassEffect(_:in:)")
+            ),
+            search_engine.query_source_patterns(["glass", "effect"]),
+            search_engine.query_source_patterns(["navigation", "transition"]),
+            search_engine.query_source_patterns(["swift"]),
+            search_engine.query_source_patterns(["résumé"]),
+            [re.compile("some|none")],
+        ]
+        for patterns in queries:
+            expected = scan_matches(store.lines, patterns)
+            candidates = store.candidate_lines(patterns)
+            self.assertEqual([index for index in candidates if index in expected], expected)
+            self.assertEqual(list(candidates), sorted(set(candidates)))
+
+    def test_find_matches_match_a_line_by_line_scan(self) -> None:
+        patterns = search_engine.query_source_patterns(["glass", "effect"])
+        matches = search_engine.find_matches_in_modules(patterns, self.sdk, ["SwiftUI"], limit=10, context_lines=1)
+
+        self.assertEqual([match["line"] for match in matches], [3, 7, 8])
+        self.assertEqual(matches[0]["contextStart"], 2)
+        self.assertEqual([line["line"] for line in matches[1]["context"]], [6, 7, 8])
+        self.assertEqual(matches[1]["text"], INTERFACE.splitlines()[6].strip())
+
+        limited = search_engine.find_matches_in_modules(patterns, self.sdk, ["SwiftUI"], limit=2, context_lines=0)
+        self.assertEqual([match["line"] for match in limited], [3, 7])
+
+    def test_store_reloads_a_changed_file(self) -> None:
+        first = source_store.load_source(self.interface)
+        self.assertIs(source_store.load_source(self.interface), first)
+        self.assertEqual(first.anchor_lines("zoomnavigationtransition"), [10])
+
+        self.interface.write_text("public struct ZoomNavigationTransition {}\n")
+        stat = self.interface.stat()
+        os.utime(self.interface, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+        reloaded = source_store.load_source(self.interface)
+        self.assertIsNot(reloaded, first)
+        self.assertEqual(reloaded.anchor_lines("zoomnavigationtransition"), [1])
+
+
+if __name__ == "__main__":
+    unittest.main()